@@ -0,0 +1,26 @@
+"""added court to group matches
+
+Revision ID: 3c9e71d04b58
+Revises: fa4ad5700a9d
+Create Date: 2026-10-18 15:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e71d04b58'
+down_revision: Union[str, None] = 'fa4ad5700a9d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('group_matches', sa.Column('court', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('group_matches', 'court')
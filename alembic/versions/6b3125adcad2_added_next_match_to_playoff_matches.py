@@ -0,0 +1,53 @@
+"""added next match to playoff matches
+
+Revision ID: 6b3125adcad2
+Revises: e41b9bbf4b9d
+Create Date: 2026-10-18 11:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b3125adcad2'
+down_revision: Union[str, None] = 'e41b9bbf4b9d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('playoff_matches', sa.Column('next_match_id', sa.Integer(), nullable=True))
+    op.add_column('playoff_matches', sa.Column('next_slot', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'playoff_matches_next_match_id_fkey', 'playoff_matches', 'playoff_matches',
+        ['next_match_id'], ['id'], ondelete='SET NULL'
+    )
+    # Существующие сетки: матч i раунда N кормит матч i // 2 раунда N + 1
+    op.execute(
+        """
+        WITH ordered AS (
+            SELECT m.id, r.bracket_id, r.number,
+                   ROW_NUMBER() OVER (PARTITION BY m.round_id ORDER BY m.id) - 1 AS idx
+            FROM playoff_matches m
+            JOIN playoff_rounds r ON r.id = m.round_id
+        )
+        UPDATE playoff_matches AS pm
+        SET next_match_id = nxt.id,
+            next_slot = 1 + cur.idx % 2
+        FROM ordered cur
+        JOIN ordered nxt
+          ON nxt.bracket_id = cur.bracket_id
+         AND nxt.number = cur.number + 1
+         AND nxt.idx = cur.idx / 2
+        WHERE pm.id = cur.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('playoff_matches_next_match_id_fkey', 'playoff_matches', type_='foreignkey')
+    op.drop_column('playoff_matches', 'next_slot')
+    op.drop_column('playoff_matches', 'next_match_id')
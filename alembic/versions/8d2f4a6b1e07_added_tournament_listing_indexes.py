@@ -0,0 +1,35 @@
+"""added tournament listing indexes
+
+Revision ID: 8d2f4a6b1e07
+Revises: 3c9e71d04b58
+Create Date: 2026-10-18 17:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4a6b1e07'
+down_revision: Union[str, None] = '3c9e71d04b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Тот же ключ сортировки, что и в списках турниров: NULL-даты как самые ранние
+DATE_KEY = sa.text("coalesce(date, '0001-01-01'::date)")
+
+
+def upgrade() -> None:
+    op.create_index('ix_tournaments_date_id', 'tournaments', [DATE_KEY, 'id'])
+    op.create_index(
+        'ix_tournaments_filters_date_id', 'tournaments',
+        ['region_id', 'category_id', 'sex_id', 'type', DATE_KEY, 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tournaments_filters_date_id', table_name='tournaments')
+    op.drop_index('ix_tournaments_date_id', table_name='tournaments')
@@ -0,0 +1,36 @@
+"""added users fio trigram index
+
+Revision ID: b47e0c93d5a1
+Revises: 8d2f4a6b1e07
+Create Date: 2026-10-18 19:25:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b47e0c93d5a1'
+down_revision: Union[str, None] = '8d2f4a6b1e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Должно совпадать с USER_FIO в backend/app/crud/user.py
+USER_FIO = (
+    "(coalesce(surname, '') || ' ' || coalesce(name, '') || ' ' || coalesce(patronymic, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_users_fio_trgm', 'users', [sa.text(f'{USER_FIO} gin_trgm_ops')],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_fio_trgm', table_name='users')
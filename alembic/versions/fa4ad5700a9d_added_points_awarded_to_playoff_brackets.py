@@ -0,0 +1,50 @@
+"""added points awarded to playoff brackets
+
+Revision ID: fa4ad5700a9d
+Revises: 6b3125adcad2
+Create Date: 2026-10-18 13:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fa4ad5700a9d'
+down_revision: Union[str, None] = '6b3125adcad2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'playoff_brackets',
+        sa.Column('points_awarded', sa.Boolean(), nullable=False, server_default=sa.text('false'))
+    )
+    # Раньше очки начислялись по всем сеткам стадии после любого сыгранного финала
+    op.execute(
+        """
+        WITH finals AS (
+            SELECT bracket_id, MAX(number) AS number
+            FROM playoff_rounds
+            GROUP BY bracket_id
+        ),
+        awarded_stages AS (
+            SELECT DISTINCT b.stage_id
+            FROM finals f
+            JOIN playoff_rounds r ON r.bracket_id = f.bracket_id AND r.number = f.number
+            JOIN playoff_matches m ON m.round_id = r.id
+            JOIN playoff_brackets b ON b.id = f.bracket_id
+            WHERE m.played
+        )
+        UPDATE playoff_brackets
+        SET points_awarded = true
+        WHERE stage_id IN (SELECT stage_id FROM awarded_stages)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('playoff_brackets', 'points_awarded')
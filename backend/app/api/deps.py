@@ -11,7 +11,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.app.core import security
 from backend.app.core.config import settings
-from common.db.database import async_engine
+from backend.app.utils import principal_cache
+from backend.app.utils.principal_cache import Principal
+from common.db.database import Session
 from common.db.models import TokenPayload, User
 
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -20,12 +22,12 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 
 async def get_db():
-    async with AsyncSession(async_engine) as session:
+    async with Session() as session:
         yield session
         
 @asynccontextmanager
 async def get_db_session():
-    session = AsyncSession(async_engine)
+    session = Session()
     try:
         yield session
     finally:
@@ -36,7 +38,7 @@ SessionDep = Annotated[AsyncSession, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-async def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def _user_id_from_token(token: str) -> int:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -47,7 +49,11 @@ async def get_current_user(session: SessionDep, token: TokenDep) -> User:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = await session.get(User, int(token_data.sub))
+    return int(token_data.sub)
+
+
+async def get_current_user(session: SessionDep, token: TokenDep) -> User:
+    user = await session.get(User, _user_id_from_token(token))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -56,23 +62,43 @@ async def get_current_user(session: SessionDep, token: TokenDep) -> User:
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
-async def get_current_organizer_or_admin(current_user: CurrentUser) -> User:
-    if not current_user.organizer and not current_user.admin:
+async def get_current_principal(session: SessionDep, token: TokenDep) -> Principal:
+    """
+    Права пользователя из токена. Берутся из кэша (principal_cache), в базу
+    идём только при промахе; сессия без запросов соединение не занимает.
+    """
+    user_id = _user_id_from_token(token)
+    principal = await principal_cache.get(user_id)
+    if principal is None:
+        user = await session.get(User, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal = Principal.from_user(user)
+        await principal_cache.store(principal)
+    return principal
+
+
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+
+
+async def get_current_organizer_or_admin(principal: CurrentPrincipal) -> Principal:
+    if not principal.organizer and not principal.admin:
         raise HTTPException(
             status_code=403, detail="The user need to be organizer or admin"
         )
+    return principal
 
 
-async def get_current_admin(current_user: CurrentUser) -> User:
-    if not current_user.admin:
+async def get_current_admin(principal: CurrentPrincipal) -> Principal:
+    if not principal.admin:
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
         )
-    return current_user
+    return principal
 
-async def get_current_subscriber(current_user: CurrentUser) -> User:
-    if not current_user.subscriber and not current_user.admin and not current_user.organizer:
+async def get_current_subscriber(principal: CurrentPrincipal) -> Principal:
+    if not principal.subscriber and not principal.admin and not principal.organizer:
         raise HTTPException(
             status_code=403, detail="The user need to be subscribed"
         )
-    return current_user
+    return principal
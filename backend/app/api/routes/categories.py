@@ -8,6 +8,12 @@ from backend.app.api.deps import (
     SessionDep,
     get_current_admin,
 )
+from backend.app.utils import reference_cache
+from backend.app.utils.response_cache import (
+    CATALOG_TTL_SECONDS,
+    cache_response,
+    invalidate_tags,
+)
 from common.db.models.base import Message
 from common.db.models.category import CategoriesPublic, Category, CategoryCreate, CategoryPublic, CategoryUpdate
 
@@ -20,6 +26,7 @@ router = APIRouter()
     # dependencies=[Depends(get_current_user)],
     response_model=CategoriesPublic,
 )
+@cache_response(CategoriesPublic, ttl=CATALOG_TTL_SECONDS, tags=("categories",))
 async def read_categories(
     session: SessionDep,
     skip: int = 0,
@@ -42,6 +49,7 @@ async def read_categories(
     # dependencies=[Depends(get_current_user)],
     response_model=CategoryPublic,
 )
+@cache_response(CategoryPublic, ttl=CATALOG_TTL_SECONDS, tags=("categories",))
 async def read_category(
     session: SessionDep,
     category_id: int,
@@ -73,7 +81,8 @@ async def create_category(
     category = Category.model_validate(category_in)
     session.add(category)
     await session.commit()
-    await session.refresh(category)
+    reference_cache.categories.invalidate()
+    await invalidate_tags("categories")
     return category
 
 
@@ -101,7 +110,8 @@ async def update_category(
     category.sqlmodel_update(update_dict)
     session.add(category)
     await session.commit()
-    await session.refresh(category)
+    reference_cache.categories.invalidate()
+    await invalidate_tags("categories")
     return category
 
 
@@ -126,4 +136,6 @@ async def delete_category(
 
     await session.delete(category)
     await session.commit()
+    reference_cache.categories.invalidate()
+    await invalidate_tags("categories")
     return Message(message="Category deleted successfully")
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import Any, List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Annotated, List
 
 from common.db.models.group import (
     GroupMatch,
@@ -9,18 +9,22 @@ from common.db.models.group import (
     GroupStagePublic,
     GroupMatchCreate,
     GroupMatchPublic,
+    GroupMatchScore,
     GroupParticipantCreate,
     GroupParticipantPublic,
     GroupPreviewRequest,
     GroupParticipant,
+    GroupScheduleParams,
+    GroupStandingsPublic,
 )
 from common.db.models.tournament import Tournament
-from common.db.models.participant import TournamentParticipant
 
 from backend.app.crud import group_stage as crud_group_stage
 from backend.app.crud import group_participant as crud_group_participant
 from backend.app.crud import group_match as crud_group_match
-from backend.app.crud import tournament as crud_tournament
+from backend.app.crud import participant as crud_participant
+from backend.app.utils import group_standings
+from backend.app.utils.group_seeding import SeedEntry, seed_groups
 
 from backend.app.api.deps import (
     CurrentUser,
@@ -52,6 +56,21 @@ async def read_groups(
     return [GroupStagePublic(**g.model_dump()) for g in groups]
 
 
+@router.get(
+    "/tournament/{tournament_id}/standings",
+    response_model=List[GroupStandingsPublic],
+)
+async def read_group_standings(
+    tournament_id: int,
+    session: SessionDep,
+):
+    tournament = await session.get(Tournament, tournament_id)
+    if not tournament:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+
+    return await group_standings.get_standings(tournament_id, session)
+
+
 @router.delete(
     "/tournament/{tournament_id}",
     dependencies=[Depends(get_current_organizer_or_admin)],
@@ -65,6 +84,7 @@ async def delete_groups(
         raise HTTPException(status_code=404, detail="Tournament not found")
 
     await crud_group_stage.delete_groups_by_tournament(tournament_id, session)
+    await group_standings.invalidate_standings(tournament_id)
     return {"message": "Groups deleted successfully"}
 
 
@@ -87,6 +107,7 @@ async def create_groups(
     for gdata in groups_in:
         group = await crud_group_stage.create_group(gdata, session, tournament_id)
         created.append(group)
+    await group_standings.invalidate_standings(tournament_id)
     return [GroupStagePublic(**g.model_dump()) for g in created]
 
 
@@ -101,7 +122,9 @@ async def delete_group(
     group = await session.get(GroupStage, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
+    tournament_id = group.tournament_id
     await crud_group_stage.delete_group(group, session)
+    await group_standings.invalidate_standings(tournament_id)
     return {"message": "Group deleted successfully"}
 
 
@@ -129,7 +152,12 @@ async def create_group_participant(
     current_user: CurrentUser,
 ):
     participant_in.group_id = group_id
+    group = await session.get(GroupStage, group_id)
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+    tournament_id = group.tournament_id
     participant = await crud_group_participant.add_participant(participant_in, session)
+    await group_standings.invalidate_standings(tournament_id)
     return GroupParticipantPublic(**participant.model_dump())
 
 
@@ -145,8 +173,11 @@ async def delete_group_participant(
     if not participant:
         raise HTTPException(
             status_code=404, detail="Group participant not found")
+    group = await session.get(GroupStage, participant.group_id)
+    tournament_id = group.tournament_id
     await session.delete(participant)
     await session.commit()
+    await group_standings.invalidate_standings(tournament_id)
     return {"message": "Group participant deleted successfully"}
 
 
@@ -178,7 +209,12 @@ async def create_group_match(
     current_user: CurrentUser,
 ):
     match_in.group_id = group_id
+    group = await session.get(GroupStage, group_id)
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+    tournament_id = group.tournament_id
     match = await crud_group_match.create_match(match_in, session)
+    await group_standings.invalidate_standings(tournament_id)
     return GroupMatchPublic(**match.model_dump())
 
 
@@ -196,86 +232,59 @@ async def update_group_match(
     match = await session.get(GroupMatch, match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Group match not found")
+    group = await session.get(GroupStage, match.group_id)
+    tournament_id = group.tournament_id
 
     updated_match = await crud_group_match.update_match(
         session=session,
         match=match,
         match_in=match_in,
     )
+    await group_standings.invalidate_standings(tournament_id)
     return GroupMatchPublic(**updated_match.model_dump())
 
 
-def generate_groups_with_unassigned(
-    participants: List[TournamentParticipant],
-    group_size: int,
-    tournament_id: int,
-) -> dict[str, Any]:
-    """
-    Формирование групп по принципу "змеиного" распределения:
-    - Сортировка по убыванию очков
-    - Деление на 4 равные подгруппы (по силе)
-    - Каждая итоговая группа — по одному игроку из каждой подгруппы
-    - Остаток → unassigned
-    """
-    def participant_score(p: TournamentParticipant) -> int:
-        user_score = getattr(p.user, "score", 0)
-        partner_score = getattr(p.partner, "score", 0) if p.partner else 0
-        return user_score + partner_score
-
-    # 1. Сортируем по убыванию очков
-    participants_sorted = sorted(participants, key=participant_score, reverse=True)
-    total = len(participants_sorted)
-
-    if total == 0:
-        return {"groups": [], "unassigned": []}
-
-    # 2. Определяем размер подгруппы (чанки по group_size)
-    # group_size = 4 → 4 подгруппы по 4 игрока
-    subgroup_size = total // group_size
-    remainder = total % group_size
-
-    # Если не хватает на полные подгруппы — всё в unassigned
-    if subgroup_size == 0:
-        return {
-            "groups": [],
-            "unassigned": [p.id for p in participants_sorted]
-        }
-
-    # 3. Делим на подгруппы (по силе)
-    subgroups = []
-    index = 0
-    for _ in range(group_size):
-        subgroup = participants_sorted[index:index + subgroup_size]
-        subgroups.append(subgroup)
-        index += subgroup_size
-
-    # 4. Формируем итоговые группы: по одному из каждой подгруппы
-    groups: List[GroupStageCreate] = []
-    for i in range(subgroup_size):
-        group_participants = []
-        for subgroup in subgroups:
-            if i < len(subgroup):
-                group_participants.append(subgroup[i])
-        
-        groups.append(
-            GroupStageCreate(
-                name=f"Group {i + 1}",
-                number=i + 1,
-                tournament_id=tournament_id,
-                participants_ids=[p.id for p in group_participants]
-            )
+@router.put(
+    "/{group_id}/matches:batch",
+    response_model=GroupStandingsPublic,
+    dependencies=[Depends(get_current_organizer_or_admin)]
+)
+async def update_group_matches_batch(
+    group_id: int,
+    scores_in: List[GroupMatchScore],
+    session: SessionDep,
+):
+    """Результаты нескольких матчей группы одним запросом; возвращает таблицу группы."""
+    group = await session.get(GroupStage, group_id)
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+    if not scores_in:
+        raise HTTPException(status_code=400, detail="No match results provided")
+    match_ids = [score.match_id for score in scores_in]
+    if len(set(match_ids)) != len(match_ids):
+        raise HTTPException(status_code=400, detail="Duplicate match ids in batch")
+
+    matches = {
+        m.id: m for m in await crud_group_match.get_matches_by_group(group_id, session)
+    }
+    unknown = [match_id for match_id in match_ids if match_id not in matches]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Matches {unknown} do not belong to group {group_id}",
         )
 
-    # 5. Остаток (последние remainder игроков) → unassigned
-    unassigned = []
-    if remainder > 0:
-        # Берём остаток из конца отсортированного списка
-        unassigned = [p.id for p in participants_sorted[-remainder:]]
+    tournament_id = group.tournament_id
+    await crud_group_match.update_match_scores(scores_in, session)
+    await session.commit()
 
-    return {
-        "groups": groups,
-        "unassigned": unassigned
-    }
+    await group_standings.invalidate_standings(tournament_id)
+    standings = await group_standings.get_standings(tournament_id, session)
+    # Группу могли удалить или пересоздать параллельным запросом
+    table = next((table for table in standings if table.group_id == group_id), None)
+    if table is None:
+        raise HTTPException(status_code=404, detail="Group not found")
+    return table
 
 
 @router.post(
@@ -287,22 +296,36 @@ async def preview_groups(
     session: SessionDep,
     tournament_id: int,
 ):
-    # Получаем участников турнира
-    _, participants = await crud_tournament.get_participants_by_tournament_id(
-        session=session,
-        tournament_id=tournament_id,
-        skip=0,
-        limit=100
-    )
-    if not participants:
+    # Все участники турнира одним запросом (id, рейтинг, регионы)
+    seeds = await crud_participant.get_participant_seeds(session, tournament_id)
+    if not seeds:
         raise HTTPException(status_code=404, detail="No participants found")
-
-    result = generate_groups_with_unassigned(
-        participants=participants,
+    if len(seeds) < 2:
+        return {"groups": [], "unassigned": [row.id for row in seeds]}
+
+    seeded = seed_groups(
+        [
+            SeedEntry(
+                participant_id=row.id,
+                score=row.score,
+                regions=frozenset(
+                    r for r in (row.region_id, row.partner_region_id) if r is not None
+                ),
+            )
+            for row in seeds
+        ],
         group_size=group.group_size,
-        tournament_id=tournament_id,
+        separate_regions=group.separate_regions,
     )
-    return result
+    groups = [
+        GroupStageCreate(
+            name=f"Group {i + 1}",
+            number=i + 1,
+            participants_ids=participants_ids,
+        )
+        for i, participants_ids in enumerate(seeded)
+    ]
+    return {"groups": groups, "unassigned": []}
 
 
 @router.post(
@@ -313,33 +336,16 @@ async def confirm_groups(
     tournament_id: int,
     groups_in: List[GroupStageCreate],
     session: SessionDep,
+    schedule: Annotated[GroupScheduleParams, Query()],
 ) -> List[GroupStagePublic]:
     # Проверка турнира
     tournament = await session.get(Tournament, tournament_id)
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
 
-    created_groups = []
-    for gdata in groups_in:
-        group = await crud_group_stage.create_group(gdata, session, tournament_id)
-
-        for participant_id in gdata.participants_ids:
-            gp_in = GroupParticipantCreate(
-                group_id=group.id,
-                participant_id=participant_id,
-            )
-            await crud_group_participant.add_participant(gp_in, session)
-
-        # Генерация матчей round-robin
-        for i in range(len(gdata.participants_ids)):
-            for j in range(i + 1, len(gdata.participants_ids)):
-                match_in = GroupMatchCreate(
-                    group_id=group.id,
-                    participant1_id=gdata.participants_ids[i],
-                    participant2_id=gdata.participants_ids[j],
-                )
-                await crud_group_match.create_match(match_in, session)
-
-        created_groups.append(group)
+    created_groups = await crud_group_stage.create_groups_with_matches(
+        groups_in, session, tournament_id, schedule
+    )
 
+    await group_standings.invalidate_standings(tournament_id)
     return [GroupStagePublic(**g.model_dump()) for g in created_groups]
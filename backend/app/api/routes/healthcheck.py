@@ -3,6 +3,7 @@
 from fastapi import APIRouter, HTTPException
 
 from backend.app.utils.utils import check_postgres, check_rabbitmq, check_redis
+from common.db.database import async_engine, pool_stats
 
 
 router = APIRouter()
@@ -18,4 +19,13 @@ async def health_check():
     if all(results.values()):
         return {"status": "healthy", "details": results}
     
-    raise HTTPException(status_code=503, detail={"status": "unhealthy", "details": results})
\ No newline at end of file
+    raise HTTPException(status_code=503, detail={"status": "unhealthy", "details": results})
+
+
+@router.get("/health/db-pool")
+async def db_pool_stats():
+    """
+    Состояние пула соединений этого воркера: занятые, overflow, время ожидания.
+    Растущее wait_seconds_max при checked_out == size + max_overflow — пул мал.
+    """
+    return pool_stats(async_engine)
@@ -1,6 +1,5 @@
 from typing import Any
 
-from common.db.models.category import Category
 from common.db.models.participant import (
     TournamentParticipant,
     TournamentParticipantCreate,
@@ -14,6 +13,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 
 from backend.app.crud import participant as participant_crud
+from backend.app.utils import reference_cache
 from backend.app.api.deps import (
     CurrentUser,
     SessionDep,
@@ -109,7 +109,7 @@ async def create_tournament_participant(
     return participant
 
 async def validate_users_age_in_category(participant_in: TournamentParticipant, session, tournament: Tournament):
-    category = await session.get(Category, tournament.category_id)
+    category = await reference_cache.categories.get(session, tournament.category_id)
     user = await session.get(User, participant_in.user_id)
     partner = await session.get(User, participant_in.partner_id) if participant_in.partner_id else None
     user_age = (tournament.date - user.birth_date).days // 365
@@ -1,12 +1,17 @@
+import logging
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
 from typing import Optional
 
 from backend.app.api.deps import SessionDep
-from backend.app.crud.group_participant import get_participants_by_group
 from backend.app.crud.group_stage import get_groups_by_tournament
-from sqlalchemy import select
+from backend.app.crud.group_standing import get_standings_by_tournament
+from backend.app.crud.playoff import award_stage_points, get_stage_tree, reserve_ids, revoke_bracket_points
+from backend.app.utils import leaderboard
+from backend.app.utils.bracket import build_bracket_layout
+from sqlalchemy import insert, select, update
 from common.db.models import (
     PlayoffStage,
     PlayoffBracket,
@@ -14,10 +19,8 @@ from common.db.models import (
     PlayoffMatch,
     BracketType,
     Tournament,
-    TournamentParticipant,
     User,
 )
-from common.db.models.category import Category
 from common.schemas import (
     PlayoffStageSchema,
     PlayoffBracketSchema,
@@ -33,6 +36,7 @@ class MatchResultInput(BaseModel):
 
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 # Utility: round names by number of participants
@@ -60,106 +64,109 @@ def get_round_name(n):
     return f"{n}-player round"
 
 
-# Удалено использование bracketool.knockout, строим сетку вручную
-async def generate_bracket(session, participants, bracket_type, stage_id):
+def build_stage_schema(stage: PlayoffStage) -> PlayoffStageSchema:
     """
-    Generate bracket, rounds, and matches for given participants (без bracketool).
-    В первом раунде назначаются реальные участники, в остальных — participant_id = None.
+    Собирает PlayoffStageSchema из дерева, загруженного get_stage_tree,
+    без дополнительных запросов к базе.
     """
-    import math
-
-    n = len(participants)
-    pow2 = 1 << (n - 1).bit_length()
-    byes = pow2 - n
-    ids = [p.id if hasattr(p, "id") else p for p in participants]
-    bracket = PlayoffBracket(type=bracket_type, stage_id=stage_id)
-    session.add(bracket)
-    await session.flush()
-    rounds = int(math.log2(pow2))
-    # Первый раунд: формируем пары и одиночные матчи (автовины)
-    pairs = []
-    singles = []
-    used = set()
-    # Сначала формируем пары
-    for i in range(0, n - byes, 2):
-        pairs.append((ids[i], ids[i + 1]))
-        used.add(ids[i])
-        used.add(ids[i + 1])
-    # Оставшиеся — одиночники (автовины)
-    for i in range(n - byes, n):
-        singles.append(ids[i])
-        used.add(ids[i])
-    current_participants = []
-    for r in range(rounds):
-        round_model = PlayoffRound(number=r + 1, bracket_id=bracket.id)
-        session.add(round_model)
-        await session.flush()
-        matches = []
-        next_round_participants = []
-        if r == 0:
-            # Первый раунд: пары и одиночники
-            for p1_id, p2_id in pairs:
-                match = PlayoffMatch(
-                    round_id=round_model.id, participant1_id=p1_id, participant2_id=p2_id
+    bracket_schemas = []
+    for bracket in stage.brackets:
+        round_schemas = []
+        for round_obj in bracket.rounds:
+            match_schemas = [
+                PlayoffMatchSchema(
+                    match_id=m.id,
+                    participant1_id=m.participant1_id,
+                    participant2_id=m.participant2_id,
+                    score1=m.score1,
+                    score2=m.score2,
+                    winner_id=m.winner_id,
+                    played=m.played,
+                    order=idx,
                 )
-                session.add(match)
-                matches.append(match)
-                # Победитель определится после матча, но для корректного формирования сетки — запоминаем пару (будет заполнено после ввода результата)
-                next_round_participants.append((p1_id, p2_id))
-            for p1_id in singles:
-                match = PlayoffMatch(
-                    round_id=round_model.id,
-                    participant1_id=p1_id,
-                    participant2_id=None,
-                    score1=0,
-                    score2=0,
-                    played=True,
-                    winner_id=p1_id,
+                for idx, m in enumerate(round_obj.matches)
+            ]
+            round_schemas.append(
+                PlayoffRoundSchema(
+                    round_id=round_obj.id,
+                    number=round_obj.number,
+                    name=get_round_name(len(match_schemas) * 2),
+                    matches=match_schemas,
                 )
-                session.add(match)
-                matches.append(match)
-                next_round_participants.append(p1_id)
-            # После первого раунда: формируем current_participants длиной pow2//2, заполняя пустыми None если нужно
-            total_matches = len(pairs) + len(singles)
-            next_len = total_matches
-            current_participants = []
-            for item in next_round_participants:
-                if isinstance(item, int):
-                    current_participants.append(item)
-                else:
-                    current_participants.append(None)
-            # Если вдруг не хватает до полной длины (например, 4 матча — 8 ячеек), дополняем None
-            while len(current_participants) < next_len:
-                current_participants.append(None)
-            continue
-        # Остальные раунды: стандартно, пары из current_participants
-        round_size = len(current_participants)
-        for i in range(0, round_size, 2):
-            p1_id = current_participants[i]
-            p2_id = current_participants[i + 1] if i + 1 < round_size else None
-            # Не пропускаем даже если оба None — чтобы ячейка была пустой
-            match = PlayoffMatch(
-                round_id=round_model.id,
-                participant1_id=p1_id,
-                participant2_id=p2_id,
             )
-            session.add(match)
-            matches.append(match)
-            if p1_id is not None and p2_id is None:
-                next_round_participants.append(p1_id)
-            elif p2_id is not None and p1_id is None:
-                next_round_participants.append(p2_id)
-            elif p1_id is not None and p2_id is not None:
-                next_round_participants.append(None)
-            else:
-                next_round_participants.append(None)
-        await session.flush()
-        # Для следующего раунда снова заполняем current_participants до нужной длины (половина предыдущего)
-        next_len = round_size // 2
-        while len(next_round_participants) < next_len:
-            next_round_participants.append(None)
-        current_participants = next_round_participants
-    return bracket
+        bracket_schemas.append(
+            PlayoffBracketSchema(
+                bracket_id=bracket.id,
+                type=bracket.type,
+                rounds=round_schemas,
+            )
+        )
+    return PlayoffStageSchema(stage_id=stage.id, brackets=bracket_schemas)
+
+
+# Удалено использование bracketool.knockout, строим сетку вручную
+async def generate_brackets(session, stage_id, brackets):
+    """
+    Generate brackets, rounds, and matches for the stage (без bracketool).
+    brackets — список (bracket_type, participants).
+    В первом раунде назначаются реальные участники, в остальных — participant_id = None.
+    Каждому матчу сразу проставляется next_match_id/next_slot.
+    id резервируются заранее, поэтому каждая таблица пишется одним INSERT.
+    """
+    layouts = [
+        (bracket_type, build_bracket_layout([p.id if hasattr(p, "id") else p for p in participants]))
+        for bracket_type, participants in brackets
+    ]
+    bracket_ids = await reserve_ids(session, PlayoffBracket, len(layouts))
+    round_ids = iter(
+        await reserve_ids(session, PlayoffRound, sum(len(layout) for _, layout in layouts))
+    )
+    match_ids = iter(
+        await reserve_ids(
+            session,
+            PlayoffMatch,
+            sum(len(round_layout) for _, layout in layouts for round_layout in layout),
+        )
+    )
+
+    bracket_rows, round_rows, match_rows = [], [], []
+    for bracket_id, (bracket_type, layout) in zip(bracket_ids, layouts):
+        bracket_rows.append({"id": bracket_id, "type": bracket_type, "stage_id": stage_id})
+        # Раунды и матчи нумеруются по порядку, чтобы сортировка по id совпадала с сеткой
+        layout_round_ids = [next(round_ids) for _ in layout]
+        layout_match_ids = [[next(match_ids) for _ in round_layout] for round_layout in layout]
+        for r, round_layout in enumerate(layout):
+            round_rows.append(
+                {"id": layout_round_ids[r], "number": r + 1, "bracket_id": bracket_id}
+            )
+            for item in round_layout:
+                match_rows.append(
+                    {
+                        "id": layout_match_ids[r][item.index],
+                        "round_id": layout_round_ids[r],
+                        "participant1_id": item.participant1_id,
+                        "participant2_id": item.participant2_id,
+                        # Одиночный матч — автовин
+                        "score1": 0 if item.is_bye else None,
+                        "score2": 0 if item.is_bye else None,
+                        "played": item.is_bye,
+                        "winner_id": item.winner_id,
+                        "next_match_id": (
+                            layout_match_ids[r + 1][item.next_index]
+                            if item.next_index is not None
+                            else None
+                        ),
+                        "next_slot": item.next_slot,
+                    }
+                )
+
+    if bracket_rows:
+        await session.execute(insert(PlayoffBracket).values(bracket_rows))
+    if round_rows:
+        await session.execute(insert(PlayoffRound).values(round_rows))
+    if match_rows:
+        await session.execute(insert(PlayoffMatch).values(match_rows))
+    return bracket_ids
 
 
 FOUR_GROUP_MAIN_SEEDING = [
@@ -234,53 +241,12 @@ async def create_playoff(
     if not groups:
         raise HTTPException(status_code=400, detail="No groups found for tournament")
     groups = sorted(groups, key=lambda group: group.number)
-    # Собираем участников по результатам групп
-    group_participants = []
-    for group in groups:
-        participants = await get_participants_by_group(group.id, session)
-        # Собираем статистику по каждому участнику
-        stats = []
-        for gp in participants:
-            p = gp.participant
-            # Матчи участника в этой группе
-            matches = [
-                m
-                for m in p.matches_as_p1 + p.matches_as_p2
-                if getattr(m, "group_id", None) == group.id and m.played
-            ]
-            points = 0
-            scored = 0
-            conceded = 0
-            for m in matches:
-                if m.participant1_id == p.id:
-                    scored += m.score1 or 0
-                    conceded += m.score2 or 0
-                    if m.score1 is not None and m.score2 is not None:
-                        if m.score1 > m.score2:
-                            points += 3
-                        elif m.score1 == m.score2:
-                            points += 1
-                elif m.participant2_id == p.id:
-                    scored += m.score2 or 0
-                    conceded += m.score1 or 0
-                    if m.score1 is not None and m.score2 is not None:
-                        if m.score2 > m.score1:
-                            points += 3
-                        elif m.score1 == m.score2:
-                            points += 1
-            scoreDiff = scored - conceded
-            stats.append({
-                "participant": p,
-                "points": points,
-                "scoreDiff": scoreDiff,
-                "scored": scored,
-                "id": p.id,
-            })
-        # Сортировка: очки → разница → забитые → id
-        sorted_stats = sorted(
-            stats, key=lambda x: (-x["points"], -x["scoreDiff"], -x["scored"], x["id"])
-        )
-        group_participants.append([x["participant"] for x in sorted_stats])
+    # Собираем участников по результатам групп (таблицы считаются в SQL)
+    standings = await get_standings_by_tournament(tournament_id, session)
+    group_participants = [
+        [row.participant_id for row in standings.get(group.id, [])]
+        for group in groups
+    ]
     # Формируем main и additional с чередованием из разных групп
     main_participants = []
     additional_participants = []
@@ -329,80 +295,15 @@ async def create_playoff(
     session.add(stage)
     await session.flush()
     stage_id = stage.id  # Extract id while session is open
+    brackets = []
     if main_participants:
-        await generate_bracket(session, main_participants, BracketType.MAIN, stage_id)
+        brackets.append((BracketType.MAIN, main_participants))
     if additional_participants:
-        await generate_bracket(session, additional_participants, BracketType.ADDITIONAL, stage_id)
+        brackets.append((BracketType.ADDITIONAL, additional_participants))
+    await generate_brackets(session, stage_id, brackets)
     await session.commit()
-    # Формируем PlayoffStageSchema для ответа
-    # Re-query stage_id and use it directly, do not access ORM object after session
-    brackets = await session.execute(
-        select(PlayoffBracket).where(PlayoffBracket.stage_id == stage_id)
-    )
-    brackets = brackets.scalars().all()
-    bracket_schemas = []
-    for bracket in brackets:
-        rounds = await session.execute(
-            select(PlayoffRound)
-            .where(PlayoffRound.bracket_id == bracket.id)
-            .order_by(PlayoffRound.number)
-        )
-        rounds = rounds.scalars().all()
-        round_schemas = []
-        for round_obj in rounds:
-            matches = await session.execute(
-                select(PlayoffMatch)
-                .where(PlayoffMatch.round_id == round_obj.id)
-                .order_by(PlayoffMatch.id)
-            )
-            matches = matches.scalars().all()
-            match_schemas = [
-                PlayoffMatchSchema(
-                    match_id=m.id,
-                    participant1_id=m.participant1_id,
-                    participant2_id=m.participant2_id,
-                    score1=m.score1,
-                    score2=m.score2,
-                    winner_id=m.winner_id,
-                    played=m.played,
-                    order=idx,
-                )
-                for idx, m in enumerate(matches)
-            ]
-            # Количество участников в начале этого раунда:
-            # Для первого раунда — это сумма участников, далее — предыдущий раунд победители
-            if round_obj.number == 1:
-                # Первый раунд: считаем всех участников (включая byes)
-                num_participants = sum(
-                    1
-                    for m in match_schemas
-                    for pid in [m.participant1_id, m.participant2_id]
-                    if pid is not None
-                )
-            else:
-                # Для остальных — просто len(match_schemas) * 2, но если есть byes, их меньше
-                num_participants = sum(
-                    1
-                    for m in match_schemas
-                    for pid in [m.participant1_id, m.participant2_id]
-                    if pid is not None
-                )
-            round_schemas.append(
-                PlayoffRoundSchema(
-                    round_id=round_obj.id,
-                    number=round_obj.number,
-                    name=get_round_name(num_participants),
-                    matches=match_schemas,
-                )
-            )
-        bracket_schemas.append(
-            PlayoffBracketSchema(
-                bracket_id=bracket.id,
-                type=bracket.type,
-                rounds=round_schemas,
-            )
-        )
-    return PlayoffStageSchema(stage_id=stage_id, brackets=bracket_schemas)
+    stage = await get_stage_tree(session, stage_id=stage_id)
+    return build_stage_schema(stage)
 
 
 # 2. Enter match results and auto-advance
@@ -415,6 +316,23 @@ async def enter_match_result(
     match = await session.get(PlayoffMatch, match_id)
     if not match:
         raise HTTPException(status_code=404, detail="Match not found")
+    bracket_id, stage_id, points_awarded = (
+        await session.execute(
+            select(PlayoffBracket.id, PlayoffBracket.stage_id, PlayoffBracket.points_awarded)
+            .join(PlayoffRound, PlayoffRound.bracket_id == PlayoffBracket.id)
+            .where(PlayoffRound.id == match.round_id)
+        )
+    ).one()
+    # Очки по сетке уже начислены: исправление финала переначисляет их,
+    # а более ранние раунды менять нельзя — финал сыгран по их итогам
+    revoked = {}
+    if points_awarded:
+        if match.next_match_id is not None:
+            raise HTTPException(
+                status_code=409,
+                detail="Points for this bracket are already awarded; only the final can be corrected",
+            )
+        revoked = await revoke_bracket_points(session, stage_id, bracket_id)
     match.score1 = result.score1
     match.score2 = result.score2
     match.played = True
@@ -425,133 +343,33 @@ async def enter_match_result(
         match.winner_id = match.participant2_id
     else:
         match.winner_id = None  # Draw or error
-    round_id = match.round_id
     winner_id = match.winner_id
-    await session.commit()
-
-    # Auto-advance winner to next round
-    round_obj = await session.get(PlayoffRound, round_id)
-    bracket = await session.get(PlayoffBracket, round_obj.bracket_id)
-    next_round_number = round_obj.number + 1
-    next_round = await session.execute(
-        select(PlayoffRound).where(
-            PlayoffRound.bracket_id == bracket.id, PlayoffRound.number == next_round_number
+    next_match_id = match.next_match_id
+
+    # Auto-advance winner: матч и слот следующего раунда известны заранее
+    if next_match_id and winner_id:
+        next_column = (
+            PlayoffMatch.participant1_id
+            if match.next_slot == 1
+            else PlayoffMatch.participant2_id
         )
-    )
-    next_round = next_round.scalars().first()
-    if next_round and winner_id:
-        next_matches = await session.execute(
-            select(PlayoffMatch)
-            .where(PlayoffMatch.round_id == next_round.id)
-            .order_by(PlayoffMatch.id)
+        await session.execute(
+            update(PlayoffMatch)
+            .where(PlayoffMatch.id == next_match_id)
+            .values({next_column: winner_id})
         )
-        next_matches = next_matches.scalars().all()
-        prev_matches = await session.execute(
-            select(PlayoffMatch).where(PlayoffMatch.round_id == round_id).order_by(PlayoffMatch.id)
-        )
-        prev_matches = prev_matches.scalars().all()
-        match_index = None
-        for idx, m in enumerate(prev_matches):
-            if m.id == match.id:
-                match_index = idx
-                break
-        if match_index is not None:
-            target_match_idx = match_index // 2
-            if target_match_idx < len(next_matches):
-                nm = next_matches[target_match_idx]
-                if match_index % 2 == 0:
-                    nm.participant1_id = winner_id
-                else:
-                    nm.participant2_id = winner_id
-                session.add(nm)
-                await session.commit()
 
     # === НАЧИСЛЕНИЕ ОЧКОВ ПОСЛЕ ФИНАЛА ===
-    # Если это финал (нет следующего раунда)
-    if not next_round:
-        print("POINTS BLOCK REACHED")
-        from backend.app.core.config import tournament_categories_map
-
-        stage_id = bracket.stage_id
-        print(f"bracket.stage_id={stage_id}")
-        playoff_stage = await session.get(PlayoffStage, stage_id)
-        tournament_id = playoff_stage.tournament_id
-        print(f"tournament_id={tournament_id}")
-        tournament_obj = await session.get(Tournament, tournament_id)
-        category_id = tournament_obj.category_id
-        print(f"category_id={category_id}")
-        category_obj = await session.get(Category, category_id)
-        category_name = category_obj.name
-        print(f"category_name={category_name}")
-        points_map = tournament_categories_map.get(category_name)
-        print(f"points_map={points_map}")
-        if points_map:
-            brackets_result = await session.execute(
-                select(PlayoffBracket).where(PlayoffBracket.stage_id == stage_id)
-            )
-            brackets = brackets_result.scalars().all()
-            bracket_id_type = [(b.id, b.type) for b in brackets]
-            for bracket_id, bracket_type in bracket_id_type:
-                rounds_result = await session.execute(
-                    select(PlayoffRound)
-                    .where(PlayoffRound.bracket_id == bracket_id)
-                    .order_by(PlayoffRound.number)
-                )
-                rounds = rounds_result.scalars().all()
-                if not rounds:
-                    continue
-                final_round = rounds[-1]
-                matches_result = await session.execute(
-                    select(PlayoffMatch).where(PlayoffMatch.round_id == final_round.id)
-                )
-                matches = matches_result.scalars().all()
-                # Собираем всех участников по местам: победитель, финалист, полуфиналисты и т.д.
-                places = []
-                # 1. Победитель и финалист(ы)
-                for m in matches:
-                    if m.winner_id:
-                        places.append(m.winner_id)
-                    if m.participant1_id and m.participant1_id != m.winner_id:
-                        places.append(m.participant1_id)
-                    if m.participant2_id and m.participant2_id != m.winner_id:
-                        places.append(m.participant2_id)
-                # 2. Добавляем проигравших в предыдущем раунде (например, полуфиналистов, если нет матча за 3 место)
-                prev_rounds = rounds[:-1]
-                for prev_round in reversed(prev_rounds):
-                    prev_matches_result = await session.execute(
-                        select(PlayoffMatch).where(PlayoffMatch.round_id == prev_round.id)
-                    )
-                    prev_matches = prev_matches_result.scalars().all()
-                    for m in prev_matches:
-                        # Если участник не попал в places, значит он проиграл в этом раунде и не прошёл дальше
-                        if m.participant1_id and m.participant1_id not in places:
-                            places.append(m.participant1_id)
-                        if m.participant2_id and m.participant2_id not in places:
-                            places.append(m.participant2_id)
-                # 3. Убираем дубликаты, сохраняем порядок
-                places = list(dict.fromkeys(places))
-                for idx, participant_id in enumerate(places):
-                    participant = await session.get(TournamentParticipant, participant_id)
-                    user = await session.get(User, participant.user_id)
-                    points = 0
-                    multiplier = 2 if getattr(tournament_obj, "is_grand", False) else 1
-                    if bracket_type == "main":
-                        for rng, pts in points_map.items():
-                            if isinstance(rng, range) and idx + 1 in rng:
-                                points = pts * multiplier
-                                break
-                        print(
-                            f"MAIN: место {idx + 1}, user_id={user.id}, participant_id={participant_id}, points={points}"
-                        )
-                    elif bracket_type == "additional":
-                        points = points_map.get("additional", 0)
-                        print(
-                            f"ADDITIONAL: user_id={user.id}, participant_id={participant_id}, points={points}"
-                        )
-                    if points:
-                        user.score = (user.score or 0) + points
-                        session.add(user)
-                await session.commit()
+    # Если это финал (нет следующего матча)
+    awards = {}
+    if next_match_id is None:
+        if revoked:
+            logger.info(f"Revoked playoff points for bracket {bracket_id}: {revoked}")
+        awards = await award_stage_points(session, stage_id)
+        if awards:
+            logger.info(f"Awarded playoff points for stage {stage_id}: {awards}")
+    await session.commit()
+    await leaderboard.update_scores(session, list({**revoked, **awards}))
 
     return {
         "status": "Result entered",
@@ -565,58 +383,10 @@ async def get_playoff_stage(
     stage_id: int,
     session: SessionDep,
 ):
-    stage = await session.get(PlayoffStage, stage_id)
+    stage = await get_stage_tree(session, stage_id=stage_id)
     if not stage:
         raise HTTPException(status_code=404, detail="Playoff stage not found")
-    brackets = await session.execute(
-        select(PlayoffBracket).where(PlayoffBracket.stage_id == stage_id)
-    )
-    brackets = brackets.scalars().all()
-    bracket_schemas = []
-    for bracket in brackets:
-        rounds = await session.execute(
-            select(PlayoffRound)
-            .where(PlayoffRound.bracket_id == bracket.id)
-            .order_by(PlayoffRound.number)
-        )
-        rounds = rounds.scalars().all()
-        round_schemas = []
-        for round_obj in rounds:
-            matches = await session.execute(
-                select(PlayoffMatch)
-                .where(PlayoffMatch.round_id == round_obj.id)
-                .order_by(PlayoffMatch.id)
-            )
-            matches = matches.scalars().all()
-            match_schemas = [
-                PlayoffMatchSchema(
-                    match_id=m.id,
-                    participant1_id=m.participant1_id,
-                    participant2_id=m.participant2_id,
-                    score1=m.score1,
-                    score2=m.score2,
-                    winner_id=m.winner_id,
-                    played=m.played,
-                    order=idx,
-                )
-                for idx, m in enumerate(matches)
-            ]
-            round_schemas.append(
-                PlayoffRoundSchema(
-                    round_id=round_obj.id,
-                    number=round_obj.number,
-                    name=get_round_name(len(match_schemas) * 2),
-                    matches=match_schemas,
-                )
-            )
-        bracket_schemas.append(
-            PlayoffBracketSchema(
-                bracket_id=bracket.id,
-                type=bracket.type,
-                rounds=round_schemas,
-            )
-        )
-    return PlayoffStageSchema(stage_id=stage.id, brackets=bracket_schemas)
+    return build_stage_schema(stage)
 
 
 @router.get("/tournament/{tournament_id}", response_model=PlayoffStageSchema)
@@ -624,61 +394,10 @@ async def get_playoff_stage_by_tournament(
     tournament_id: int,
     session: SessionDep,
 ):
-    stage = await session.execute(
-        select(PlayoffStage).where(PlayoffStage.tournament_id == tournament_id)
-    )
-    stage = stage.scalars().first()
+    stage = await get_stage_tree(session, tournament_id=tournament_id)
     if not stage:
         raise HTTPException(status_code=404, detail="Playoff stage not found")
-    brackets = await session.execute(
-        select(PlayoffBracket).where(PlayoffBracket.stage_id == stage.id)
-    )
-    brackets = brackets.scalars().all()
-    bracket_schemas = []
-    for bracket in brackets:
-        rounds = await session.execute(
-            select(PlayoffRound)
-            .where(PlayoffRound.bracket_id == bracket.id)
-            .order_by(PlayoffRound.number)
-        )
-        rounds = rounds.scalars().all()
-        round_schemas = []
-        for round_obj in rounds:
-            matches = await session.execute(
-                select(PlayoffMatch)
-                .where(PlayoffMatch.round_id == round_obj.id)
-                .order_by(PlayoffMatch.id)
-            )
-            matches = matches.scalars().all()
-            match_schemas = [
-                PlayoffMatchSchema(
-                    match_id=m.id,
-                    participant1_id=m.participant1_id,
-                    participant2_id=m.participant2_id,
-                    score1=m.score1,
-                    score2=m.score2,
-                    winner_id=m.winner_id,
-                    played=m.played,
-                    order=idx,
-                )
-                for idx, m in enumerate(matches)
-            ]
-            round_schemas.append(
-                PlayoffRoundSchema(
-                    round_id=round_obj.id,
-                    number=round_obj.number,
-                    name=get_round_name(len(match_schemas) * 2),
-                    matches=match_schemas,
-                )
-            )
-        bracket_schemas.append(
-            PlayoffBracketSchema(
-                bracket_id=bracket.id,
-                type=bracket.type,
-                rounds=round_schemas,
-            )
-        )
-    return PlayoffStageSchema(stage_id=stage.id, brackets=bracket_schemas)
+    return build_stage_schema(stage)
 
 
 from fastapi import Depends
@@ -8,6 +8,12 @@ from backend.app.api.deps import (
     SessionDep,
     get_current_admin,
 )
+from backend.app.utils import reference_cache
+from backend.app.utils.response_cache import (
+    CATALOG_TTL_SECONDS,
+    cache_response,
+    invalidate_tags,
+)
 from common.db.models.base import Message
 from common.db.models.region import Region, RegionCreate, RegionPublic, RegionsPublic
 
@@ -20,6 +26,7 @@ router = APIRouter()
     # dependencies=[Depends(get_current_user)],
     response_model=RegionsPublic,
 )
+@cache_response(RegionsPublic, ttl=CATALOG_TTL_SECONDS, tags=("regions",))
 async def read_regions(
     session: SessionDep,
     skip: int = 0,
@@ -42,6 +49,7 @@ async def read_regions(
     # dependencies=[Depends(get_current_user)],
     response_model=RegionPublic,
 )
+@cache_response(RegionPublic, ttl=CATALOG_TTL_SECONDS, tags=("regions",))
 async def read_region(
     session: SessionDep,
     region_id: int,
@@ -73,7 +81,8 @@ async def create_region(
     region = Region.model_validate(region_in)
     session.add(region)
     await session.commit()
-    await session.refresh(region)
+    reference_cache.regions.invalidate()
+    await invalidate_tags("regions")
     return region
 
 
@@ -94,4 +103,6 @@ async def delete_tournament(
         raise HTTPException(status_code=400, detail="Not enough permissions")
     await session.delete(region)
     await session.commit()
+    reference_cache.regions.invalidate()
+    await invalidate_tags("regions")
     return Message(message="Region deleted successfully")
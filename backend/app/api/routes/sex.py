@@ -10,6 +10,12 @@ from backend.app.api.deps import (
     get_current_admin,
     get_current_user,
 )
+from backend.app.utils import reference_cache
+from backend.app.utils.response_cache import (
+    CATALOG_TTL_SECONDS,
+    cache_response,
+    invalidate_tags,
+)
 from common.db.models.base import Message
 from common.db.models.sex import Sex, SexCreate, SexPublic, SexUpdate, SexesPublic
 
@@ -22,6 +28,7 @@ router = APIRouter()
     # dependencies=[Depends(get_current_user)],
     response_model=SexesPublic,
 )
+@cache_response(SexesPublic, ttl=CATALOG_TTL_SECONDS, tags=("sex",))
 async def read_sexes(
     session: SessionDep,
     skip: int = 0,
@@ -44,6 +51,7 @@ async def read_sexes(
     # dependencies=[Depends(get_current_user)],
     response_model=SexPublic,
 )
+@cache_response(SexPublic, ttl=CATALOG_TTL_SECONDS, tags=("sex",))
 async def read_sex(
     session: SessionDep,
     sex_id: int,
@@ -75,7 +83,8 @@ async def create_sex(
     sex = Sex.model_validate(sex_in)
     session.add(sex)
     await session.commit()
-    await session.refresh(sex)
+    reference_cache.sexes.invalidate()
+    await invalidate_tags("sex")
     return sex
 
 
@@ -99,7 +108,8 @@ async def update_sex(
     sex.sqlmodel_update(update_dict)
     session.add(sex)
     await session.commit()
-    await session.refresh(sex)
+    reference_cache.sexes.invalidate()
+    await invalidate_tags("sex")
     return sex
 
 
@@ -120,4 +130,6 @@ async def delete_sex(
         raise HTTPException(status_code=400, detail="Not enough permissions")
     await session.delete(sex)
     await session.commit()
+    reference_cache.sexes.invalidate()
+    await invalidate_tags("sex")
     return Message(message="Sex deleted successfully")
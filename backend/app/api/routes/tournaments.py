@@ -1,7 +1,7 @@
 from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import desc, or_, update, select
+from sqlalchemy import Date, cast, literal_column, or_, update, select
 from sqlalchemy.orm import joinedload
 from sqlmodel import col, delete, func
 
@@ -15,11 +15,15 @@ from backend.app.api.deps import (
     get_current_user,
 )
 from backend.app.messaging.producer import send_tournament_money_request_task
-from common.db.models.category import Category
+from backend.app.utils import reference_cache
+from backend.app.utils.pagination import fetch_keyset_page
+from backend.app.utils.response_cache import (
+    TOURNAMENTS_TTL_SECONDS,
+    cache_response,
+    invalidate_tags,
+)
 from common.db.models.enums import TournamentType, OrderEnum
 from common.db.models.participant import TournamentParticipant, TournamentParticipantsPublic
-from common.db.models.region import Region
-from common.db.models.sex import Sex
 from common.db.models.tournament import Tournament, TournamentCreate, TournamentPublic, TournamentUpdate, TournamentsPublic
 from common.db.models.base import Message
 from common.db.models.user import User
@@ -50,6 +54,12 @@ def build_tournament_query(
     return statement
 
 
+# NULL-даты сортируются как самые ранние; то же выражение стоит в индексах
+TOURNAMENT_DATE_KEY = func.coalesce(
+    Tournament.date, cast(literal_column("'0001-01-01'"), Date)
+)
+
+
 @router.get(
     "/",
     dependencies=[Depends(get_current_organizer_or_admin)],
@@ -60,6 +70,8 @@ async def read_user_tournaments(
     current_user: CurrentUser,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    with_count: bool = False,
     region_id: Optional[int] = None,
     category_id: Optional[int] = None,
     sex_id: Optional[int] = None,
@@ -70,27 +82,29 @@ async def read_user_tournaments(
     """
     Retrieve tournaments. If user is not an admin, only return tournaments owned by the user.
     Optional filters by region_id, category_id and type can be applied.
+    Pass next_cursor from the previous page as cursor; count only with with_count.
     """
-
-    if sort_by_id == OrderEnum.ASC:
-        base_statement = select(Tournament).order_by(Tournament.id)
-    elif sort_by_id == OrderEnum.DESC:
-        base_statement = select(Tournament).order_by(desc(Tournament.id))
-
-    count_statement = build_tournament_query(
-        select(func.count()).select_from(Tournament),
-        region_id, category_id, type, current_user,
-        sex_id, actual
-    )
-    count = (await session.execute(count_statement)).scalar_one_or_none()
+    count = None
+    if with_count:
+        count_statement = build_tournament_query(
+            select(func.count()).select_from(Tournament),
+            region_id, category_id, type, current_user,
+            sex_id, actual
+        )
+        count = (await session.execute(count_statement)).scalar_one_or_none()
 
     statement = build_tournament_query(
-        base_statement, region_id, category_id, type, current_user,
+        select(Tournament), region_id, category_id, type, current_user,
         sex_id, actual
-    ).offset(skip).limit(limit)
-    tournaments = (await session.execute(statement)).scalars().all()
+    )
+    tournaments, next_cursor = await fetch_keyset_page(
+        session, statement,
+        keys=[Tournament.id],
+        descending=sort_by_id == OrderEnum.DESC,
+        limit=limit, cursor=cursor, skip=skip,
+    )
 
-    return TournamentsPublic(data=tournaments, count=count)
+    return TournamentsPublic(data=tournaments, count=count, next_cursor=next_cursor)
 
 
 @router.get(
@@ -98,10 +112,13 @@ async def read_user_tournaments(
     # dependencies=[Depends(get_current_user)],
     response_model=TournamentsPublic,
 )
+@cache_response(TournamentsPublic, ttl=TOURNAMENTS_TTL_SECONDS, tags=("tournaments",))
 async def read_all_tournaments(
     session: SessionDep,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    with_count: bool = False,
     region_id: Optional[int] = None,
     category_id: Optional[int] = None,
     sex_id: Optional[int] = None,
@@ -110,31 +127,30 @@ async def read_all_tournaments(
     type: Optional[TournamentType] = None,  # Новый фильтр по типу
 ) -> Any:
     """
-    Retrieve all tournaments with optional filters by region_id, category_id and type
+    Retrieve all tournaments with optional filters by region_id, category_id and type.
+    Sorted by (date, id); pass next_cursor from the previous page as cursor.
     """
-    base_statement = build_tournament_query(
+    count = None
+    if with_count:
+        count_statement = build_tournament_query(
+            select(func.count()).select_from(Tournament),
+            region_id, category_id, type, None, sex_id, actual
+        )
+        count = (await session.execute(count_statement)).scalar_one_or_none()
+
+    statement = build_tournament_query(
         select(Tournament), region_id,
         category_id, type, None, sex_id,
         actual
     )
-    count_statement = build_tournament_query(
-        select(func.count()).select_from(Tournament),
-        region_id, category_id, type, None, sex_id, actual
+    tournaments, next_cursor = await fetch_keyset_page(
+        session, statement,
+        keys=[TOURNAMENT_DATE_KEY, Tournament.id],
+        descending=date_sort != OrderEnum.ASC,
+        limit=limit, cursor=cursor, skip=skip,
     )
 
-    count = (await session.execute(count_statement)).scalar_one_or_none()
-
-
-    statement = base_statement.offset(skip).limit(limit)
-    
-    if date_sort == OrderEnum.ASC:
-        statement = statement.order_by(Tournament.date)
-    elif date_sort == OrderEnum.DESC:
-        statement = statement.order_by(desc(Tournament.date))
-        
-    tournaments = (await session.execute(statement)).scalars().all()
-
-    return TournamentsPublic(data=tournaments, count=count)
+    return TournamentsPublic(data=tournaments, count=count, next_cursor=next_cursor)
 
 
 @router.post(
@@ -175,8 +191,6 @@ async def send_money_request(
 
     participants = (await session.execute(statement)).scalars().all()
 
-    await session.refresh(tournament)
-
     await send_tournament_money_request_task(tournament, participants)
 
     return Message(message="Money request sent successfully")
@@ -196,15 +210,16 @@ async def create_tournament(
     await validate_tournament_inputs(session, tournament_in)
 
     tournament = await tournament_crud.create_tournament(session, tournament_in)
+    await invalidate_tags("tournaments")
     return tournament
 
 
 async def validate_tournament_inputs(session, tournament_in):
-    if not await session.get(Sex, tournament_in.sex_id):
+    if not await reference_cache.sexes.get(session, tournament_in.sex_id):
         raise HTTPException(status_code=400, detail="Invalid sex_id")
-    elif not await session.get(Region, tournament_in.region_id):
+    elif not await reference_cache.regions.get(session, tournament_in.region_id):
         raise HTTPException(status_code=400, detail="Invalid region_id")
-    elif not await session.get(Category, tournament_in.category_id):
+    elif not await reference_cache.categories.get(session, tournament_in.category_id):
         raise HTTPException(status_code=400, detail="Invalid category_id")
 
 
@@ -213,6 +228,9 @@ async def validate_tournament_inputs(session, tournament_in):
     # dependencies=[Depends(get_current_user)],
     response_model=TournamentPublic,
 )
+@cache_response(
+    TournamentPublic, ttl=TOURNAMENTS_TTL_SECONDS, tags=("tournament:{tournament_id}",)
+)
 async def read_tournament(
     session: SessionDep,
     tournament_id: int,
@@ -267,6 +285,7 @@ async def update_tournament(
             status_code=403, detail="User not authorized to update this tournament")
 
     tournament = await tournament_crud.update_tournament(session, tournament_id, tournament_in)
+    await invalidate_tags("tournaments", f"tournament:{tournament_id}")
     return tournament
 
 
@@ -287,4 +306,5 @@ async def delete_tournament(
         raise HTTPException(status_code=400, detail="Not enough permissions")
     await session.delete(tournament)
     await session.commit()
+    await invalidate_tags("tournaments", f"tournament:{tournament_id}")
     return Message(message="Tournament deleted successfully")
@@ -11,6 +11,11 @@ from backend.app.api.deps import (
     get_current_admin,
     get_current_user,
 )
+from backend.app.utils.response_cache import (
+    CATALOG_TTL_SECONDS,
+    cache_response,
+    invalidate_tags,
+)
 from common.db.models import Message, Trainer, TrainerCreate, TrainerPublic, TrainerUpdate, TrainersPublic
 
 
@@ -22,6 +27,7 @@ router = APIRouter()
     # dependencies=[Depends(get_current_user)],
     response_model=TrainersPublic,
 )
+@cache_response(TrainersPublic, ttl=CATALOG_TTL_SECONDS, tags=("trainers",))
 async def read_trainers(
     session: SessionDep,
     skip: int = 0,
@@ -44,6 +50,7 @@ async def read_trainers(
     # dependencies=[Depends(get_current_user)],
     response_model=TrainerPublic,
 )
+@cache_response(TrainerPublic, ttl=CATALOG_TTL_SECONDS, tags=("trainers",))
 async def read_trainer(
     session: SessionDep,
     trainer_id: int,
@@ -70,6 +77,7 @@ async def create_trainer(
     Create new trainer
     """
     trainer = await trainer_crud.create_trainer(session=session, trainer_create=trainer_in)
+    await invalidate_tags("trainers")
     return trainer
 
 
@@ -90,6 +98,7 @@ async def update_trainer(
     if not db_trainer:
         raise HTTPException(status_code=404, detail="Trainer not found")
     db_trainer = await trainer_crud.update_trainer(session=session, db_trainer=db_trainer, trainer_in=trainer_in)
+    await invalidate_tags("trainers")
     return db_trainer
 
 
@@ -110,6 +119,7 @@ async def delete_trainer(
         raise HTTPException(status_code=404, detail="Trainer not found")
     await session.delete(db_trainer)
     await session.commit()
+    await invalidate_tags("trainers")
     return Message(
         message="Trainer deleted successfully"
     )
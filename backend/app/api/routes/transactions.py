@@ -13,6 +13,7 @@ from backend.app.api.deps import CurrentUser, SessionDep, get_current_user
 from backend.app.core.config import settings
 from backend.app.crud import transaction as transaction_crud
 from backend.app.payment import Payment
+from backend.app.utils import principal_cache
 from common.db.models import Transaction, TransactionCreate, TransactionPublic
 from common.db.models.transaction import WebhookPayload
 from common.db.models.user import User
@@ -82,7 +83,6 @@ async def read_transaction(
     session.add(transaction)
     
     await session.commit()
-    await session.refresh(transaction)
     
     return transaction
 
@@ -190,7 +190,6 @@ async def handle_webhook(request: Request, session: SessionDep) -> JSONResponse:
                     transaction.updated_at = datetime.datetime.now()
                     await execute_transaction(session, transaction.id)
                     await session.commit()
-                    await session.refresh(transaction)
         except Exception as e:
             logger.error(f"Error processing transaction: {str(e)}")
     
@@ -229,6 +228,7 @@ async def execute_transaction(
     await confirm_transaction(session, transaction)
     
     await session.commit()
-    await session.refresh(transaction)
+    # Подписка изменилась — права из кэша больше не актуальны
+    await principal_cache.invalidate(transaction.user_id)
     
     return transaction
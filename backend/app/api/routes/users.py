@@ -1,8 +1,7 @@
 import datetime
 import json
 import uuid
-from typing import Any, Optional
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -11,7 +10,7 @@ from sqlmodel import col, delete, func, select
 from dateutil.relativedelta import relativedelta
 
 from backend.app.crud import user as user_crud
-from backend.app.utils import max_registration
+from backend.app.utils import leaderboard, max_registration, principal_cache, reference_cache
 from backend.app.api.deps import (
     CurrentUser,
     SessionDep,
@@ -20,12 +19,9 @@ from backend.app.api.deps import (
 )
 from backend.app.core.config import settings
 from backend.app.core.security import get_password_hash, verify_password
-from common.db.models import Message, UpdatePassword, User, UserCreate, UserFio, UserPublic, UserRegister, UserUpdate, UserUpdateMe, UsersPublic
-from common.db.models.category import Category
+from common.db.models import Message, UpdatePassword, User, UserCreate, UserFio, UserFioSearchResult, UserPublic, UserRankPublic, UserRegister, UserUpdate, UserUpdateMe, UsersPublic
 from common.db.models.enums import OrderEnum
 from common.db.models.participant import TournamentParticipant
-from common.db.models.region import Region
-from common.db.models.sex import Sex
 from common.db.models.tournament import Tournament, TournamentCountResponse
 
 
@@ -54,59 +50,51 @@ async def read_users(
     """
     Retrieve users with filters and sorting options.
     """
-    count_statement = select(func.count()).select_from(User)
+    # Страница рейтинга: готовый порядок из leaderboard вместо сортировки users.
+    # Админы и организаторы в leaderboard не входят — это и есть фильтр
+    # is_admin=false&is_organizer=false, с которым рейтинг запрашивает фронтенд
+    if (
+        score_order == OrderEnum.DESC
+        and fio is None
+        and age_order is None
+        and is_organizer in (None, False)
+        and is_admin in (None, False)
+        and is_subscriber is None
+    ):
+        return await read_leaderboard(
+            session, skip=skip, limit=limit,
+            category_id=category_id, region_id=region_id, sex_id=sex_id,
+        )
 
-    statement = select(User)
+    filters = []
 
     if category_id is not None:
-        category_stmt = select(Category).where(Category.id == category_id)
-        category = (await session.execute(category_stmt)).scalars().first()
+        category = await reference_cache.categories.get(session, category_id)
         if category:
             today = datetime.datetime.now().date()
             max_birth_date = today - relativedelta(years=category.from_age)
             min_birth_date = today - relativedelta(years=category.to_age)
-            statement = statement.where(
-                User.birth_date.between(min_birth_date, max_birth_date)
-            )
-            count_statement = count_statement.where(
-                User.birth_date.between(min_birth_date, max_birth_date)
-            )
+            filters.append(User.birth_date.between(min_birth_date, max_birth_date))
 
     if region_id is not None:
-        statement = statement.where(User.region_id == region_id)
-        count_statement = count_statement.where(User.region_id == region_id)
+        filters.append(User.region_id == region_id)
 
     if is_organizer is not None:
-        statement = statement.where(User.organizer == is_organizer)
-        count_statement = count_statement.where(User.organizer == is_organizer)
+        filters.append(User.organizer == is_organizer)
 
     if is_admin is not None:
-        statement = statement.where(User.admin == is_admin)
-        count_statement = count_statement.where(User.admin == is_admin)
+        filters.append(User.admin == is_admin)
         
     if is_subscriber is not None:
-        now = datetime.datetime.now()
-        statement = statement.where(User.end_of_subscription > now)
-        count_statement = count_statement.where(User.end_of_subscription > now)
+        filters.append(User.end_of_subscription > datetime.datetime.now())
 
     if sex_id is not None:
-        statement = statement.where(User.sex_id == sex_id)
-        count_statement = count_statement.where(User.sex_id == sex_id)
+        filters.append(User.sex_id == sex_id)
 
     if fio is not None:
-        fio_parts = fio.strip().split()
-        
-        for part in fio_parts:
-            statement = statement.where(
-                (User.surname.ilike(f"%{part}%")) |
-                (User.name.ilike(f"%{part}%")) |
-                (User.patronymic.ilike(f"%{part}%"))
-            )
-            count_statement = count_statement.where(
-                (User.surname.ilike(f"%{part}%")) |
-                (User.name.ilike(f"%{part}%")) |
-                (User.patronymic.ilike(f"%{part}%"))
-            )
+        filters.extend(user_crud.fio_filters(fio))
+
+    statement = select(User).where(*filters)
 
     if score_order == OrderEnum.DESC:
         statement = statement.order_by(desc(User.score))
@@ -118,14 +106,65 @@ async def read_users(
     elif age_order == OrderEnum.DESC:
         statement = statement.order_by(User.birth_date.asc())
 
+    # Поиск по ФИО: лучшие совпадения выше (после явно заданных сортировок)
+    if fio is not None and fio.strip():
+        statement = statement.order_by(user_crud.fio_rank(fio).desc(), User.id)
+
     statement = statement.offset(skip).limit(limit)
 
+    count_statement = select(func.count()).select_from(User).where(*filters)
     count = (await session.execute(count_statement)).scalar_one_or_none()
     users = (await session.execute(statement)).scalars().all()
 
     return UsersPublic(data=users, count=count)
 
 
+@router.get(
+    "/search",
+    response_model=List[UserFioSearchResult],
+)
+async def search_users(
+    session: SessionDep,
+    q: str = Query(min_length=2, max_length=100),
+    limit: int = Query(default=10, ge=1, le=50),
+) -> Any:
+    """
+    Autocomplete by full name: only id and FIO, best matches first.
+    """
+    rows = await user_crud.search_users_by_fio(session, q, limit)
+    return [UserFioSearchResult(id=row.id, fio=row.fio) for row in rows]
+
+
+@router.get(
+    "/leaderboard",
+    response_model=UsersPublic,
+)
+async def read_leaderboard(
+    session: SessionDep,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=leaderboard.MAX_PAGE_SIZE),
+    category_id: Optional[int] = None,
+    region_id: Optional[int] = None,
+    sex_id: Optional[int] = None,
+) -> Any:
+    """
+    Users ranked by score within category/region/sex (without admins and organizers).
+    """
+    category = (
+        await reference_cache.categories.get(session, category_id)
+        if category_id is not None else None
+    )
+    page, count = await leaderboard.get_page(
+        session, category, region_id, sex_id, skip, limit
+    )
+    statement = select(User).where(User.id.in_([user_id for user_id, _ in page]))
+    users = {user.id: user for user in (await session.execute(statement)).scalars().all()}
+    return UsersPublic(
+        data=[users[user_id] for user_id, _ in page if user_id in users],
+        count=count,
+    )
+
+
 @router.get(
     "/create_super_user",
 )
@@ -142,6 +181,7 @@ async def create_super_user(
     )
     session.add(user)
     await session.commit()
+    await leaderboard.add_user(session, user)
     return 'Super user created'
 
 
@@ -164,6 +204,27 @@ async def read_user_fio(session: SessionDep, user_id: int) -> Any:
     return UserFio(name=user.name, surname=user.surname, patronymic=user.patronymic)
 
 
+@router.get('/{user_id}/rank', response_model=UserRankPublic)
+async def read_user_rank(
+    session: SessionDep,
+    user_id: int,
+    category_id: Optional[int] = None,
+    region_id: Optional[int] = None,
+    sex_id: Optional[int] = None,
+) -> Any:
+    """
+    User's position in the leaderboard for category/region/sex.
+    """
+    category = (
+        await reference_cache.categories.get(session, category_id)
+        if category_id is not None else None
+    )
+    rank = await leaderboard.get_rank(session, user_id, category, region_id, sex_id)
+    if rank is None:
+        raise HTTPException(status_code=404, detail="User is not ranked in this leaderboard")
+    return UserRankPublic(**rank)
+
+
 @router.delete("/me", response_model=Message)
 async def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
     """
@@ -175,6 +236,8 @@ async def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         )
     await session.delete(current_user)
     await session.commit()
+    await leaderboard.remove_user(session, current_user)
+    await principal_cache.invalidate(current_user.id)
     return Message(message="User deleted successfully")
 
 
@@ -189,10 +252,10 @@ async def register_user(session: SessionDep, user_in: UserRegister) -> Any:
             status_code=400,
             detail="The user with this email already exists in the system",
         )
-    region = await session.get(Region, user_in.region_id)
+    region = await reference_cache.regions.get(session, user_in.region_id)
     if not region:
         raise HTTPException(status_code=400, detail="Invalid region")
-    sex = await session.get(Sex, user_in.sex_id)
+    sex = await reference_cache.sexes.get(session, user_in.sex_id)
     if not sex:
         raise HTTPException(status_code=400, detail="Invalid sex")
 
@@ -208,6 +271,7 @@ async def register_user(session: SessionDep, user_in: UserRegister) -> Any:
         },
     )
     user = await user_crud.create_user(session=session, user_create=user_create)
+    await leaderboard.add_user(session, user)
     await max_registration.mark_registration_used(user_in.max_registration_token)
     return user
 
@@ -246,7 +310,10 @@ async def update_user_me(
                 status_code=409, detail="User with this email already exists"
             )
 
+    ranked_before = leaderboard.rank_fields(current_user)
     await user_crud.update_user(session=session, db_user=current_user, user_in=user_in)
+    await leaderboard.user_changed(session, ranked_before, current_user)
+    await principal_cache.invalidate(current_user.id)
     return current_user
 
 
@@ -268,6 +335,8 @@ async def delete_user_by_id(
     statement = delete(User).where(User.id == user_id)
     await session.execute(statement)
     await session.commit()
+    await leaderboard.remove_user(session, user_found)
+    await principal_cache.invalidate(user_id)
     return {"message": "User deleted successfully"}
 
 
@@ -287,7 +356,10 @@ async def update_user_by_id(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
+    ranked_before = leaderboard.rank_fields(db_user)
     user = await user_crud.update_user(session=session, db_user=db_user, user_in=user_in)
+    await leaderboard.user_changed(session, ranked_before, user)
+    await principal_cache.invalidate(user_id)
     return user
 
 
@@ -55,6 +55,20 @@ class Settings(BaseSettings):
     MAX_BOT_LINK: str = ""
     MAX_REGISTRATION_TTL_SECONDS: int = 2400
     MAXBOT_INTERNAL_TOKEN: str = ""
+
+    # Стоимость bcrypt; при изменении хэши пересчитываются при следующем входе
+    BCRYPT_ROUNDS: int = 12
+    # Потоки для хэширования паролей, 0 — по числу ядер
+    PASSWORD_HASH_WORKERS: int = 0
+
+    # Профилировщик SQL для разработки: медленные запросы и N+1 в логах
+    SQL_PROFILER: bool = False
+    SQL_SLOW_QUERY_MS: int = 200
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+
+    # Подтверждения оплаты применяются пачкой: до BATCH_SIZE сообщений или раз в FLUSH_SECONDS
+    CONFIRMATION_BATCH_SIZE: int = 100
+    CONFIRMATION_FLUSH_SECONDS: float = 0.5
     
     @computed_field
     @property
@@ -130,3 +144,19 @@ tournament_categories_map = {
         "additional": 6,
     },
 }
+
+
+def _build_points_table(points_map: dict) -> list[int]:
+    """Таблица очков по месту: table[place] вместо перебора диапазонов."""
+    ranges = [rng for rng in points_map if isinstance(rng, range)]
+    table = [0] * max((rng.stop for rng in ranges), default=1)
+    for rng in ranges:
+        for place in rng:
+            table[place] = points_map[rng]
+    return table
+
+
+tournament_points_table = {
+    category_name: _build_points_table(points_map)
+    for category_name, points_map in tournament_categories_map.items()
+}
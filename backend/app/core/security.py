@@ -1,3 +1,6 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
@@ -6,7 +9,21 @@ from passlib.context import CryptContext
 
 from backend.app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Хэши с другой стоимостью считаются устаревшими и пересчитываются при входе
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_desired_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_desired_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt отпускает GIL, поэтому хэширование в потоках не блокирует event loop
+# и масштабируется по ядрам; размер пула ограничивает одновременные хэши
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    thread_name_prefix="password-hash",
+)
 
 
 ALGORITHM = "HS256"
@@ -19,9 +36,22 @@ async def create_access_token(subject: str | Any, expires_delta: timedelta) -> s
     return encoded_jwt
 
 
+async def _run_in_hash_pool(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+
+
 async def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return await _run_in_hash_pool(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Проверяет пароль; вторым значением — новый хэш, если текущий устарел."""
+    return await _run_in_hash_pool(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
 
 
 async def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+    return await _run_in_hash_pool(pwd_context.hash, password)
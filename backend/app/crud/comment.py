@@ -14,7 +14,6 @@ async def create_comment(*, session: AsyncSession, comment_create: CommentCreate
     )
     session.add(db_obj)
     await session.commit()
-    await session.refresh(db_obj)
     return db_obj
 
 
@@ -26,5 +25,4 @@ async def update_comment(*, session: AsyncSession, db_comment: Comment, comment_
     db_comment.sqlmodel_update(comment_data, update=extra_data)
     session.add(db_comment)
     await session.commit()
-    await session.refresh(db_comment)
     return db_comment
\ No newline at end of file
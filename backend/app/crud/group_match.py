@@ -1,10 +1,12 @@
 from typing import List
+from sqlalchemy import Boolean, Integer, column, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from common.db.models.group import (
     GroupMatch,
     GroupMatchCreate,
+    GroupMatchScore,
     GroupMatchUpdate
 )
 
@@ -16,7 +18,6 @@ async def create_match(
     match = GroupMatch(**data.model_dump())
     session.add(match)
     await session.commit()
-    await session.refresh(match)
     return match
 
 
@@ -32,10 +33,33 @@ async def update_match(
             setattr(match, field, update_data[field])
     session.add(match)
     await session.commit()
-    await session.refresh(match)
     return match
 
 
+async def update_match_scores(
+    scores: List[GroupMatchScore],
+    session: AsyncSession,
+) -> None:
+    """Один UPDATE ... FROM (VALUES ...) на все матчи; commit делает вызывающий."""
+    scores_values = values(
+        column("match_id", Integer),
+        column("score1", Integer),
+        column("score2", Integer),
+        column("played", Boolean),
+        name="scores",
+    ).data([(s.match_id, s.score1, s.score2, s.played) for s in scores])
+    await session.execute(
+        update(GroupMatch)
+        .where(GroupMatch.id == scores_values.c.match_id)
+        .values(
+            score1=scores_values.c.score1,
+            score2=scores_values.c.score2,
+            played=scores_values.c.played,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
 async def get_matches_by_group(
     group_id: int,
     session: AsyncSession,
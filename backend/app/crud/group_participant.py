@@ -1,9 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from sqlalchemy.orm import selectinload
 
 from common.db.models.group import GroupParticipant, GroupParticipantCreate
-from common.db.models.participant import TournamentParticipant
 
 
 async def add_participant(
@@ -13,7 +11,6 @@ async def add_participant(
     participant = GroupParticipant(**data.model_dump())
     session.add(participant)
     await session.commit()
-    await session.refresh(participant)
     return participant
 
 
@@ -29,18 +26,7 @@ async def get_participants_by_group(
     group_id: int,
     session: AsyncSession,
 ) -> list[GroupParticipant]:
-    query = (
-        select(GroupParticipant)
-        .where(GroupParticipant.group_id == group_id)
-        .options(
-            selectinload(GroupParticipant.participant).selectinload(
-                TournamentParticipant.matches_as_p1
-            ),
-            selectinload(GroupParticipant.participant).selectinload(
-                TournamentParticipant.matches_as_p2
-            ),
-        )
-    )
+    query = select(GroupParticipant).where(GroupParticipant.group_id == group_id)
     result = await session.execute(query)
     return result.scalars().all()
 
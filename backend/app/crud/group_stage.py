@@ -1,8 +1,17 @@
+import datetime
 from typing import List
 from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from common.db.models.group import GroupStage, GroupStageCreate, GroupStageUpdate
+from common.db.models.group import (
+    GroupMatch,
+    GroupParticipant,
+    GroupScheduleParams,
+    GroupStage,
+    GroupStageCreate,
+    GroupStageUpdate,
+)
+from backend.app.utils.group_schedule import schedule_group_matches
 
 
 async def get_groups_by_tournament(
@@ -41,11 +50,62 @@ async def create_group(
     )
     session.add(group)
     await session.commit()
-    await session.refresh(group)
     created_group: GroupStage | None = await session.get(GroupStage, group.id)
     return GroupStage(**created_group.model_dump()) if created_group else None
 
 
+async def create_groups_with_matches(
+    groups_in: List[GroupStageCreate],
+    session: AsyncSession,
+    tournament_id: int,
+    schedule: GroupScheduleParams | None = None,
+) -> List[GroupStage]:
+    """
+    Создаёт группы с участниками и матчами круговой системы одной транзакцией:
+    один flush (по INSERT на таблицу) и один commit. При ошибке не остаётся
+    недостроенных групп. Если задан schedule.start_at, матчи сразу получают
+    время и корт из расписания.
+    """
+    schedule = schedule or GroupScheduleParams()
+    groups = []
+    for data in groups_in:
+        group = GroupStage(
+            **data.model_dump(exclude={"participants_ids"}),
+            tournament_id=tournament_id,
+        )
+        group.participants = [
+            GroupParticipant(participant_id=participant_id)
+            for participant_id in data.participants_ids or []
+        ]
+        groups.append(group)
+
+    matches = schedule_group_matches(
+        [data.participants_ids or [] for data in groups_in],
+        courts=schedule.courts,
+        rest_slots=schedule.rest_slots,
+    )
+    start_at = schedule.start_at
+    if start_at is not None and start_at.tzinfo is not None:
+        # scheduled_at — naive-колонка с временем в UTC, как и остальные даты
+        start_at = start_at.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    slot_length = datetime.timedelta(minutes=schedule.slot_minutes)
+    for match in matches:
+        groups[match.group_index].matches.append(
+            GroupMatch(
+                participant1_id=match.participant1_id,
+                participant2_id=match.participant2_id,
+                scheduled_at=start_at + slot_length * match.slot if start_at else None,
+                court=match.court if start_at else None,
+            )
+        )
+
+    session.add_all(groups)
+    await session.flush()
+    created = [GroupStage(**group.model_dump()) for group in groups]
+    await session.commit()
+    return created
+
+
 async def get_group_by_id(
     group_id: int,
     session: AsyncSession,
@@ -65,7 +125,6 @@ async def update_group(
         setattr(group, field, value)
     session.add(group)
     await session.commit()
-    await session.refresh(group)
     return group
 
 
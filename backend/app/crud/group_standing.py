@@ -0,0 +1,92 @@
+from sqlalchemy import and_, case, func, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from common.db.models.group import (
+    GroupMatch,
+    GroupParticipant,
+    GroupStage,
+    GroupStandingPublic,
+)
+
+
+def _match_sides(tournament_id: int):
+    """Каждый сыгранный матч турнира — две строки: с точки зрения обоих участников."""
+    sides = []
+    for participant_id, scored, conceded in (
+        (GroupMatch.participant1_id, GroupMatch.score1, GroupMatch.score2),
+        (GroupMatch.participant2_id, GroupMatch.score2, GroupMatch.score1),
+    ):
+        sides.append(
+            select(
+                GroupMatch.group_id,
+                participant_id.label("participant_id"),
+                scored.label("scored"),
+                conceded.label("conceded"),
+            )
+            .join(GroupStage, GroupStage.id == GroupMatch.group_id)
+            .where(GroupStage.tournament_id == tournament_id, GroupMatch.played)
+        )
+    return union_all(*sides).subquery("sides")
+
+
+async def get_standings_by_tournament(
+    tournament_id: int,
+    session: AsyncSession,
+) -> dict[int, list[GroupStandingPublic]]:
+    """
+    Турнирные таблицы всех групп турнира одним агрегирующим запросом.
+    Победа — 3 очка, ничья — 1. Сортировка: очки → разница → забитые → id.
+    Возвращает {group_id: [строки таблицы по местам]}.
+    """
+    sides = _match_sides(tournament_id)
+    wins = func.coalesce(func.sum(case((sides.c.scored > sides.c.conceded, 1), else_=0)), 0)
+    draws = func.coalesce(func.sum(case((sides.c.scored == sides.c.conceded, 1), else_=0)), 0)
+    losses = func.coalesce(func.sum(case((sides.c.scored < sides.c.conceded, 1), else_=0)), 0)
+    scored = func.coalesce(func.sum(func.coalesce(sides.c.scored, 0)), 0)
+    conceded = func.coalesce(func.sum(func.coalesce(sides.c.conceded, 0)), 0)
+    points = wins * 3 + draws
+
+    query = (
+        select(
+            GroupParticipant.group_id,
+            GroupParticipant.participant_id,
+            func.count(sides.c.participant_id).label("played"),
+            wins.label("wins"),
+            draws.label("draws"),
+            losses.label("losses"),
+            scored.label("scored"),
+            conceded.label("conceded"),
+            (scored - conceded).label("score_diff"),
+            points.label("points"),
+        )
+        .join(GroupStage, GroupStage.id == GroupParticipant.group_id)
+        .outerjoin(
+            sides,
+            and_(
+                sides.c.group_id == GroupParticipant.group_id,
+                sides.c.participant_id == GroupParticipant.participant_id,
+            ),
+        )
+        .where(GroupStage.tournament_id == tournament_id)
+        .group_by(GroupParticipant.group_id, GroupParticipant.participant_id)
+        .order_by(
+            GroupParticipant.group_id,
+            points.desc(),
+            (scored - conceded).desc(),
+            scored.desc(),
+            GroupParticipant.participant_id,
+        )
+    )
+    result = await session.execute(query)
+
+    standings: dict[int, list[GroupStandingPublic]] = {}
+    for row in result.mappings():
+        table = standings.setdefault(row["group_id"], [])
+        table.append(
+            GroupStandingPublic(
+                place=len(table) + 1,
+                **{key: value for key, value in row.items() if key != "group_id"},
+            )
+        )
+    return standings
@@ -18,7 +18,6 @@ async def create_news(*, session: AsyncSession, news_create: NewsCreate) -> News
         
     session.add(db_obj)
     await session.commit()
-    await session.refresh(db_obj)
     
     await attach_photos_to_news(
         session=session,
@@ -27,7 +26,6 @@ async def create_news(*, session: AsyncSession, news_create: NewsCreate) -> News
     )
         
     await session.commit()
-    await session.refresh(db_obj)
         
     return db_obj
 
@@ -61,5 +59,4 @@ async def update_news(*, session: AsyncSession, news: News, news_update: News) -
     news.sqlmodel_update(news_data, update=extra_data)
     session.add(news)
     await session.commit()
-    await session.refresh(news)
     return news
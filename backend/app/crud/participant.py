@@ -1,5 +1,6 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from sqlmodel import func
 
 from common.db.models.participant import (
@@ -7,13 +8,13 @@ from common.db.models.participant import (
     TournamentParticipantCreate,
     TournamentParticipantPublic
 )
+from common.db.models.user import User
 
 
 async def create_tournament_participant(session: AsyncSession, tournament_participant_in: TournamentParticipantCreate) -> TournamentParticipantPublic:
     db_obj = TournamentParticipant.model_validate(tournament_participant_in)
     session.add(db_obj)
     await session.commit()
-    await session.refresh(db_obj)
     return db_obj
 
 
@@ -28,7 +29,6 @@ async def update_tournament_participant(
     db_tournament_participant.sqlmodel_update(tournament_participant_data)
     session.add(db_tournament_participant)
     await session.commit()
-    await session.refresh(db_tournament_participant)
     return db_tournament_participant
 
 
@@ -43,3 +43,22 @@ async def get_all_tournament_participants(
     statement = select(TournamentParticipant).offset(skip).limit(limit)
     participants = (await session.execute(statement)).scalars().all()
     return count,participants
+
+
+async def get_participant_seeds(session: AsyncSession, tournament_id: int):
+    """
+    Все участники турнира одним запросом без ORM-объектов:
+    (id, суммарный рейтинг пары, регион игрока, регион партнёра).
+    """
+    partner = aliased(User)
+    statement = select(
+        TournamentParticipant.id,
+        (func.coalesce(User.score, 0) + func.coalesce(partner.score, 0)).label("score"),
+        User.region_id,
+        partner.region_id.label("partner_region_id"),
+    ).join(
+        User, User.id == TournamentParticipant.user_id
+    ).outerjoin(
+        partner, partner.id == TournamentParticipant.partner_id
+    ).where(TournamentParticipant.tournament_id == tournament_id)
+    return (await session.execute(statement)).all()
@@ -0,0 +1,187 @@
+from sqlalchemy import Integer, column, func, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+
+from backend.app.core.config import tournament_categories_map, tournament_points_table
+from backend.app.utils.bracket import compute_places
+from common.db.models.category import Category
+from common.db.models.participant import TournamentParticipant
+from common.db.models.playoff import BracketType, PlayoffBracket, PlayoffRound, PlayoffStage
+from common.db.models.tournament import Tournament
+from common.db.models.user import User
+
+
+async def get_stage_tree(
+    session: AsyncSession,
+    stage_id: int | None = None,
+    tournament_id: int | None = None,
+) -> PlayoffStage | None:
+    """
+    Загружает стадию плей-офф вместе с сетками, раундами и матчами
+    за постоянное число запросов (стадия + по одному selectin на уровень).
+    Коллекции сортируются в памяти: сетки и матчи по id, раунды по номеру.
+    """
+    query = select(PlayoffStage).options(
+        selectinload(PlayoffStage.brackets)
+        .selectinload(PlayoffBracket.rounds)
+        .selectinload(PlayoffRound.matches)
+    ).execution_options(populate_existing=True)
+    if stage_id is not None:
+        query = query.where(PlayoffStage.id == stage_id)
+    if tournament_id is not None:
+        query = query.where(PlayoffStage.tournament_id == tournament_id)
+
+    result = await session.execute(query)
+    stage = result.scalars().first()
+    if not stage:
+        return None
+
+    stage.brackets.sort(key=lambda b: b.id)
+    for bracket in stage.brackets:
+        bracket.rounds.sort(key=lambda r: r.number)
+        for round_obj in bracket.rounds:
+            round_obj.matches.sort(key=lambda m: m.id)
+    return stage
+
+
+async def reserve_ids(session: AsyncSession, model, count: int) -> list[int]:
+    """
+    Резервирует count id из sequence таблицы одним запросом,
+    чтобы связанные строки можно было вставить без flush ради автоинкремента.
+    """
+    if count <= 0:
+        return []
+    sequence = f"{model.__tablename__}_id_seq"
+    result = await session.execute(
+        select(func.nextval(sequence)).select_from(func.generate_series(1, count))
+    )
+    return sorted(result.scalars().all())
+
+
+async def _points_rules(session: AsyncSession, tournament_id: int) -> tuple[list[int], int, int] | None:
+    """Таблица очков за места, множитель и очки дополнительной сетки; None — категория без очков."""
+    tournament = (
+        await session.execute(
+            select(Tournament.is_grand, Category.name)
+            .join(Category, Category.id == Tournament.category_id)
+            .where(Tournament.id == tournament_id)
+        )
+    ).first()
+    points_table = tournament_points_table.get(tournament.name) if tournament else None
+    if not points_table:
+        return None
+    multiplier = 2 if tournament.is_grand else 1
+    additional_points = tournament_categories_map[tournament.name].get("additional", 0)
+    return points_table, multiplier, additional_points
+
+
+def _bracket_awards(bracket: PlayoffBracket, rules: tuple[list[int], int, int], awards: dict[int, int]) -> None:
+    """Добавляет в awards очки за места по сетке (по загруженному дереву)."""
+    points_table, multiplier, additional_points = rules
+    for place, participant_id in enumerate(compute_places(bracket.rounds), start=1):
+        if bracket.type == BracketType.MAIN:
+            points = points_table[place] * multiplier if place < len(points_table) else 0
+        else:
+            points = additional_points
+        if points:
+            awards[participant_id] = awards.get(participant_id, 0) + points
+
+
+async def _claim_brackets(session: AsyncSession, bracket_ids: list[int], awarded: bool) -> set[int]:
+    """
+    Переключает points_awarded условным UPDATE и возвращает id сеток, которые
+    переключил именно этот запрос: параллельный запрос не начислит (или не
+    отменит) очки по той же сетке второй раз.
+    """
+    return set(
+        (
+            await session.execute(
+                update(PlayoffBracket)
+                .where(
+                    PlayoffBracket.id.in_(bracket_ids),
+                    PlayoffBracket.points_awarded.is_(not awarded),
+                )
+                .values(points_awarded=awarded)
+                .returning(PlayoffBracket.id)
+            )
+        ).scalars().all()
+    )
+
+
+async def _add_scores(session: AsyncSession, awards: dict[int, int], sign: int) -> None:
+    """Прибавляет (sign=1) или вычитает (sign=-1) очки пользователям участников одним UPDATE."""
+    if not awards:
+        return
+    awards_values = values(
+        column("participant_id", Integer),
+        column("points", Integer),
+        name="awards",
+    ).data([(participant_id, sign * points) for participant_id, points in awards.items()])
+    user_points = (
+        select(TournamentParticipant.user_id, func.sum(awards_values.c.points).label("points"))
+        .join(awards_values, awards_values.c.participant_id == TournamentParticipant.id)
+        .group_by(TournamentParticipant.user_id)
+        .subquery()
+    )
+    await session.execute(
+        update(User)
+        .where(User.id == user_points.c.user_id)
+        .values(score=func.coalesce(User.score, 0) + user_points.c.points)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def award_stage_points(session: AsyncSession, stage_id: int) -> dict[int, int]:
+    """
+    Начисляет очки за места по сеткам стадии, в которых сыгран финал.
+    Сетка помечается points_awarded условным UPDATE до начисления, поэтому
+    повторный ввод результата финала не начисляет очки второй раз.
+    Все User.score обновляются одним UPDATE ... FROM (VALUES ...).
+    Возвращает {participant_id: points}; commit остаётся за вызывающим.
+    """
+    stage = await get_stage_tree(session, stage_id=stage_id)
+    if not stage:
+        return {}
+    ready_ids = [
+        bracket.id
+        for bracket in stage.brackets
+        if not bracket.points_awarded
+        and bracket.rounds
+        and all(m.played for m in bracket.rounds[-1].matches)
+    ]
+    if not ready_ids:
+        return {}
+
+    rules = await _points_rules(session, stage.tournament_id)
+    if not rules:
+        return {}
+
+    claimed_ids = await _claim_brackets(session, ready_ids, awarded=True)
+    awards: dict[int, int] = {}
+    for bracket in stage.brackets:
+        if bracket.id in claimed_ids:
+            _bracket_awards(bracket, rules, awards)
+    await _add_scores(session, awards, sign=1)
+    return awards
+
+
+async def revoke_bracket_points(session: AsyncSession, stage_id: int, bracket_id: int) -> dict[int, int]:
+    """
+    Отменяет начисление по сетке перед исправлением результата её финала:
+    очки за места по текущему (ещё не исправленному) дереву вычитаются,
+    points_awarded снимается, и award_stage_points начислит их заново.
+    Вызывается до изменения матча: get_stage_tree перечитывает дерево из базы.
+    Возвращает {participant_id: points} снятых очков; commit остаётся за вызывающим.
+    """
+    stage = await get_stage_tree(session, stage_id=stage_id)
+    bracket = next((b for b in stage.brackets if b.id == bracket_id), None) if stage else None
+    if bracket is None or not bracket.points_awarded:
+        return {}
+    rules = await _points_rules(session, stage.tournament_id)
+    if not rules or not await _claim_brackets(session, [bracket_id], awarded=False):
+        return {}
+    revoked: dict[int, int] = {}
+    _bracket_awards(bracket, rules, revoked)
+    await _add_scores(session, revoked, sign=-1)
+    return revoked
@@ -28,7 +28,6 @@ async def create_tournament(session: AsyncSession, tournament_in: TournamentCrea
     )
     session.add(tournament)
     await session.commit()
-    await session.refresh(tournament)
     
     return tournament
 
@@ -40,7 +39,6 @@ async def update_tournament(session: AsyncSession, tournament_id: int, tournamen
     tournament.sqlmodel_update(update_dict)
     session.add(tournament)
     await session.commit()
-    await session.refresh(tournament)
     return tournament
 
 
@@ -6,7 +6,6 @@ async def create_trainer(*, session: AsyncSession, trainer_create: TrainerCreate
     db_obj = Trainer.model_validate(trainer_create)
     session.add(db_obj)
     await session.commit()
-    await session.refresh(db_obj)
     return db_obj
 
 async def update_trainer(*, session: AsyncSession, db_trainer: Trainer, trainer_in: TrainerCreate) -> TrainerPublic:
@@ -14,5 +13,4 @@ async def update_trainer(*, session: AsyncSession, db_trainer: Trainer, trainer_
     db_trainer.sqlmodel_update(trainer_data)
     session.add(db_trainer)
     await session.commit()
-    await session.refresh(db_trainer)
     return db_trainer
\ No newline at end of file
@@ -17,7 +17,6 @@ async def create_transaction(session: AsyncSession, transaction_in: TransactionC
     )
     session.add(db_obj)
     await session.commit()
-    await session.refresh(db_obj)
     return db_obj
 
 async def get_by_operation_id(session: AsyncSession, operation_id: str) -> Any:
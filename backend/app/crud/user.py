@@ -1,11 +1,44 @@
 from typing import Any
-from sqlalchemy import select
+from sqlalchemy import func, literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.app.core.security import get_password_hash, verify_password
+from backend.app.core.security import get_password_hash, verify_and_update_password
 from common.db.models.user import User, UserCreate
 
 
+def _fio_part(column):
+    return func.coalesce(column, literal_column("''"))
+
+
+# ФИО одной строкой. Выражение совпадает с индексом ix_users_fio_trgm
+# (константы не параметризуются), менять только вместе с миграцией.
+USER_FIO = (
+    _fio_part(User.surname) + literal_column("' '")
+    + _fio_part(User.name) + literal_column("' '")
+    + _fio_part(User.patronymic)
+)
+
+
+def fio_filters(fio: str) -> list:
+    """Каждое слово запроса должно встречаться в ФИО (ILIKE по trigram-индексу)."""
+    return [USER_FIO.ilike(f"%{part}%") for part in fio.split()]
+
+
+def fio_rank(fio: str):
+    return func.word_similarity(fio.strip(), USER_FIO)
+
+
+async def search_users_by_fio(session: AsyncSession, fio: str, limit: int = 10):
+    """Автодополнение: только id и ФИО, лучшие совпадения первыми."""
+    statement = (
+        select(User.id, USER_FIO.label("fio"))
+        .where(*fio_filters(fio))
+        .order_by(fio_rank(fio).desc(), User.id)
+        .limit(limit)
+    )
+    return (await session.execute(statement)).all()
+
+
 async def create_user(*, session: AsyncSession, user_create: UserCreate) -> User:
     db_obj = User.model_validate(
         user_create,
@@ -17,7 +50,6 @@ async def create_user(*, session: AsyncSession, user_create: UserCreate) -> User
     )
     session.add(db_obj)
     await session.commit()
-    await session.refresh(db_obj)
     return db_obj
 
 async def get_user_by_email(session: AsyncSession, email: str) -> User | None:
@@ -30,8 +62,14 @@ async def authenticate(session: AsyncSession, email: str, password: str) -> User
 
     if not db_user:
         return None
-    if not await verify_password(password, db_user.hashed_password):
+    verified, new_hash = await verify_and_update_password(password, db_user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        # Стоимость bcrypt изменилась — сохраняем пересчитанный хэш
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        await session.commit()
     return db_user
 
 async def get_user_by_telegram_id(session: AsyncSession, user_telegram_id: int) -> User | None:
@@ -56,5 +94,4 @@ async def update_user(session: AsyncSession, user_in: User, db_user: User) -> An
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
     await session.commit()
-    await session.refresh(db_user)
     return db_user
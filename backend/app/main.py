@@ -1,10 +1,13 @@
 from contextlib import asynccontextmanager
 from backend.app.messaging.consumer import start_consumer, stop_consumer
-from fastapi import FastAPI
+from backend.app.messaging.publisher import publisher
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from backend.app.api.main import api_router
 from backend.app.core.config import settings
+from backend.app.utils import metrics, reference_cache, sql_profiler
+from common.db.database import async_engine
 import logging
 
 
@@ -15,12 +18,21 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     logger.info("Starting FastAPI application and RabbitMQ consumer...")
     app.state.rabbitmq_connection = await start_consumer()
+    await publisher.start()
+    await reference_cache.preload()
     yield
     logger.info("Shutting down FastAPI application...")
+    await publisher.close()
     await stop_consumer(app.state.rabbitmq_connection)
     
 app = FastAPI(lifespan=lifespan)
 
+metrics.instrument_engine(async_engine)
+metrics.register_pool_collector(async_engine)
+if settings.SQL_PROFILER:
+    sql_profiler.install(async_engine)
+    app.add_middleware(sql_profiler.SqlProfilerMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Разреши все источники (или настрой конкретные)
@@ -29,5 +41,13 @@ app.add_middleware(
     allow_headers=["*"],  # Разреши все заголовки
 )
 
+# Снаружи CORS: в метрики попадают и preflight-запросы
+app.add_middleware(metrics.PrometheusMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    body, content_type = await metrics.render()
+    return Response(content=body, media_type=content_type)
@@ -2,52 +2,184 @@ import aio_pika
 import asyncio
 import json
 import logging
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from aio_pika.exceptions import ChannelInvalidStateError
+from sqlalchemy import Integer, any_, bindparam, update
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from backend.app.api.deps import get_db_session
 from backend.app.core.config import settings
+from backend.app.utils import metrics
 from backend.app.utils.rabbitmq import _connect_to_rabbitmq
 from common.db.models.participant import TournamentParticipant
-from common.db.models.user import User
 
 logger = logging.getLogger(__name__)
 
-async def process_confirmation(message: aio_pika.IncomingMessage):
-    
-    async with get_db_session() as session:
-        async with message.process():
-            body = message.body.decode()
-            data = json.loads(body)
-            participant_id = data["participant_id"]
-            tournament_id = data["tournament_id"]
-            
-            logger.info(f"Received confirmation for participant {participant_id} in tournament {tournament_id}")
-            
-            statement = (
-                update(TournamentParticipant)
-                .where(TournamentParticipant.id == participant_id)
-                .values(confirmed=True)
+RETRY_DELAY_SECONDS = 1
+MAX_RETRY_DELAY_SECONDS = 30
+
+# Один параметр-массив: у выражения один текст при любом размере пачки,
+# и prepared statement asyncpg переиспользуется
+CONFIRM_PARTICIPANTS = (
+    update(TournamentParticipant)
+    .where(TournamentParticipant.id == any_(bindparam("ids", type_=ARRAY(Integer))))
+    .values(confirmed=True)
+)
+
+
+class ConfirmationBatcher:
+    """
+    Копит подтверждения участников и применяет их одним UPDATE.
+    Пачка сбрасывается, когда набралось batch_size сообщений или прошло
+    flush_seconds с первого сообщения в ней. После коммита сообщения
+    подтверждаются одним ack (multiple=True) на каждый канал, через который
+    они пришли. Если запись не удалась, пачка возвращается в очередь после
+    паузы, которая растёт с каждой неудачей подряд (до max_retry_delay).
+    Подтверждение идемпотентно, повтор безопасен.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_seconds: float,
+        retry_delay: float = RETRY_DELAY_SECONDS,
+        max_retry_delay: float = MAX_RETRY_DELAY_SECONDS,
+    ):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._failures = 0
+        self._pending: list[aio_pika.abc.AbstractIncomingMessage] = []
+        self._timer: asyncio.Task | None = None
+        # Пачки пишутся по очереди: ack с multiple=True не должен обогнать
+        # коммит предыдущей пачки
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, message: aio_pika.abc.AbstractIncomingMessage) -> None:
+        self._pending.append(message)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_seconds)
+        try:
+            await self.flush()
+        except Exception:
+            # Неподтверждённые сообщения брокер вернёт в очередь
+            logger.exception("Failed to flush confirmation batch")
+
+    async def flush(self) -> None:
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if batch:
+                await self._apply(batch)
+
+    async def _apply(self, batch: list[aio_pika.abc.AbstractIncomingMessage]) -> None:
+        accepted = []
+        participant_ids = set()
+        for message in batch:
+            try:
+                data = json.loads(message.body)
+                participant_ids.add(int(data["participant_id"]))
+            except (ValueError, KeyError, TypeError):
+                logger.error(f"Malformed confirmation message: {message.body!r}")
+                await self._settle([message], reject=True)
+                continue
+            accepted.append(message)
+        if not accepted:
+            return
+
+        try:
+            async with get_db_session() as session:
+                await session.execute(CONFIRM_PARTICIPANTS, {"ids": sorted(participant_ids)})
+                await session.commit()
+        except Exception:
+            delay = self._next_retry_delay()
+            logger.exception(
+                f"Failed to confirm participants {sorted(participant_ids)}, requeueing in {delay:.0f}s"
             )
-            await session.execute(statement)
-            await session.commit()
-            logger.info(f"Participant {participant_id} confirmed for tournament {tournament_id}")
+            # Пока держим lock, новые пачки не пишутся, а prefetch не пускает
+            # новые сообщения — без паузы очередь крутилась бы в цикле
+            await asyncio.sleep(delay)
+            await self._settle(accepted, requeue=True)
+            return
+
+        self._failures = 0
+        await self._settle(accepted)
+        logger.info(f"Confirmed {len(participant_ids)} participants from {len(accepted)} messages")
+
+    def _next_retry_delay(self) -> float:
+        self._failures += 1
+        return min(self.retry_delay * 2 ** (self._failures - 1), self.max_retry_delay)
+
+    async def _settle(
+        self,
+        messages: list[aio_pika.abc.AbstractIncomingMessage],
+        requeue: bool = False,
+        reject: bool = False,
+    ) -> None:
+        """
+        ack (или nack с requeue, или reject) сообщений: multiple=True по сообщению
+        с наибольшим delivery tag в каждом канале — после переподключения
+        tag'и нового канала начинаются заново, а старый канал уже закрыт.
+        """
+        last_by_channel = {}
+        stale = 0
+        for message in messages:
+            try:
+                channel = message.channel
+            except ChannelInvalidStateError:
+                stale += 1
+                continue
+            last = last_by_channel.get(channel)
+            if last is None or message.delivery_tag > last.delivery_tag:
+                last_by_channel[channel] = message
+        if stale:
+            logger.warning(f"{stale} confirmation messages arrived on a closed channel, broker will redeliver them")
+
+        for last in last_by_channel.values():
+            try:
+                if reject:
+                    await last.reject(requeue=False)
+                elif requeue:
+                    await last.nack(multiple=True, requeue=True)
+                else:
+                    await last.ack(multiple=True)
+            except Exception:
+                logger.exception(f"Failed to settle confirmation messages up to tag {last.delivery_tag}")
+
+    async def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        await self.flush()
+
+
+batcher = ConfirmationBatcher(
+    batch_size=settings.CONFIRMATION_BATCH_SIZE,
+    flush_seconds=settings.CONFIRMATION_FLUSH_SECONDS,
+)
 
 async def start_consumer():
     """Запускает consumer для RabbitMQ и возвращает соединение."""
     connection = await _connect_to_rabbitmq()
     channel = await connection.channel()
+    # Окно не меньше пачки, иначе она не наберётся раньше таймера
+    await channel.set_qos(prefetch_count=settings.CONFIRMATION_BATCH_SIZE)
     exchange = await channel.declare_exchange("confirmation", aio_pika.ExchangeType.DIRECT)
     queue = await channel.declare_queue("confirmation_queue", durable=True)
     await queue.bind(exchange, routing_key="confirm_tournament_participant")
     
-    await queue.consume(process_confirmation)
+    await queue.consume(batcher)
+    metrics.watch_queue(queue)
     logger.info("Backend consumer started, waiting for confirmations...")
     
     return connection
 
 async def stop_consumer(connection: aio_pika.RobustConnection):
     """Останавливает consumer и закрывает соединение с RabbitMQ."""
+    await batcher.close()
     if connection and not connection.is_closed:
         await connection.close()
-        logger.info("Backend consumer stopped and connection closed")
\ No newline at end of file
+        logger.info("Backend consumer stopped and connection closed")
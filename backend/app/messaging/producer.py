@@ -1,10 +1,11 @@
 # backend/app/messaging/producer.py
 import aio_pika
+import asyncio
 import json
 import logging
 from typing import List
-from aio_pika import Message, ExchangeType
-from backend.app.utils.rabbitmq import _connect_to_rabbitmq
+from aio_pika import Message
+from backend.app.messaging.publisher import MONEY_NOTIFY_ROUTING_KEY, TOURNAMENT_EXCHANGE, publisher
 from backend.app.utils.utils import redis
 from backend.app.core.config import settings
 
@@ -13,24 +14,51 @@ from common.db.models.tournament import Tournament
 
 logger = logging.getLogger(__name__)
 
+# Ключ читает бот (bot/utils/utils.py)
+MONEY_REQUEST_PREFIX = "money_request:"
+MONEY_REQUEST_TTL_SECONDS = 7 * 24 * 60 * 60
+
 async def send_tournament_money_request_task(tournament: Tournament, participants: List[TournamentParticipant]) -> None:
-    """Отправляет запрос на оплату турнира в RabbitMQ."""
-    connection = await _connect_to_rabbitmq()
-    
-    
-    redis_key = f"tournament:{tournament.id}"
-    redis_data = _generate_tournament_payload(tournament, participants)
-    redis_data = json.dumps(redis_data)
-    await redis.set(redis_key, redis_data, ex=604800)
-    for participant in participants:
-        await redis.set(f"participant:{participant.id}", tournament.id, ex=604800)
-    
-    async with connection:
-        channel = await connection.channel()
-        exchange = await _setup_exchange(channel)
-        await _setup_queue(channel, exchange)
-        await _publish_message(exchange, redis_data)
-        logger.info(f"Money request sent for tournament {tournament.id}")
+    """
+    Отправляет запрос на оплату турнира в RabbitMQ: по сообщению на участника,
+    чтобы бот рассылал их параллельно, а ошибка одного получателя не задевала остальных.
+    """
+    payload = _generate_tournament_payload(tournament, participants)
+    await _store_money_request(tournament.id, payload)
+
+    # Публикации расходятся по каналам пула publisher'а
+    await asyncio.gather(*(
+        _publish_message(
+            {
+                "tournament": payload["tournament"],
+                "organizer": payload["organizer"],
+                "participant": participant,
+            },
+            message_id=f"money_request:{tournament.id}:{participant['id']}",
+        )
+        for participant in payload["participants"]
+    ))
+    logger.info(f"Money request sent for tournament {tournament.id} to {len(participants)} participants")
+
+async def _store_money_request(tournament_id: int, payload: dict) -> None:
+    """
+    Состояние запроса на оплату для бота — один hash на турнир:
+    "meta" (турнир и организатор) и "participant:{id}" на каждого участника,
+    всё в JSON. Пишется одной транзакцией (MULTI) вместе с TTL.
+    """
+    key = f"{MONEY_REQUEST_PREFIX}{tournament_id}"
+    fields = {
+        "meta": json.dumps({"tournament": payload["tournament"], "organizer": payload["organizer"]}),
+        **{
+            f"participant:{participant['id']}": json.dumps(participant)
+            for participant in payload["participants"]
+        },
+    }
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.delete(key)
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, MONEY_REQUEST_TTL_SECONDS)
+        await pipe.execute()
 
 def _generate_tournament_payload(tournament: Tournament, participants: List[TournamentParticipant]) -> dict:
     return {
@@ -58,24 +86,12 @@ def _generate_tournament_payload(tournament: Tournament, participants: List[Tour
         ]
     }
 
-async def _setup_exchange(channel: aio_pika.Channel) -> aio_pika.Exchange:
-    """Настраивает exchange для отправки сообщений."""
-    exchange = await channel.declare_exchange("tournament", ExchangeType.DIRECT)
-    logger.info("Exchange 'tournament' set up")
-    return exchange
-
-async def _setup_queue(channel: aio_pika.Channel, exchange: aio_pika.Exchange) -> None:
-    """Настраивает очередь и привязывает ее к exchange."""
-    queue = await channel.declare_queue("tournament_money_queue", durable=True)
-    await queue.bind(exchange, "tournament_money_request")
-    logger.info("Queue 'tournament_money_queue' set up and bound")
-
-async def _publish_message(exchange: aio_pika.Exchange, message_data: dict) -> None:
+async def _publish_message(message_data: dict, message_id: str) -> None:
     """Публикует сообщение в exchange."""
     message = Message(
         body=json.dumps(message_data).encode(),
         content_type="application/json",
-        delivery_mode=aio_pika.DeliveryMode.PERSISTENT
+        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+        message_id=message_id,
     )
-    await exchange.publish(message, routing_key="tournament_money_request")
-    logger.info("Message published to 'tournament' exchange")
\ No newline at end of file
+    await publisher.publish(TOURNAMENT_EXCHANGE, MONEY_NOTIFY_ROUTING_KEY, message)
@@ -0,0 +1,90 @@
+import logging
+from dataclasses import dataclass, field
+
+import aio_pika
+from aio_pika import ExchangeType
+from aio_pika.pool import Pool
+
+from backend.app.utils.rabbitmq import _connect_to_rabbitmq
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_POOL_SIZE = 8
+PUBLISH_TIMEOUT_SECONDS = 5
+
+TOURNAMENT_EXCHANGE = "tournament"
+DEAD_LETTER_EXCHANGE = "tournament.dlx"
+# Одно сообщение на участника; очередь и DLQ объявляет и бот — параметры должны совпадать
+MONEY_NOTIFY_ROUTING_KEY = "tournament_money_notify"
+MONEY_NOTIFY_QUEUE = "tournament_money_notify_queue"
+MONEY_NOTIFY_DLQ = "tournament_money_notify_dlq"
+
+
+@dataclass(frozen=True)
+class Binding:
+    exchange: str
+    queue: str
+    routing_key: str
+    arguments: dict = field(default_factory=dict)
+
+
+# Объявляется один раз при старте, а не перед каждой публикацией
+TOPOLOGY = (
+    Binding(DEAD_LETTER_EXCHANGE, MONEY_NOTIFY_DLQ, MONEY_NOTIFY_ROUTING_KEY),
+    Binding(
+        TOURNAMENT_EXCHANGE,
+        MONEY_NOTIFY_QUEUE,
+        MONEY_NOTIFY_ROUTING_KEY,
+        {"x-dead-letter-exchange": DEAD_LETTER_EXCHANGE},
+    ),
+)
+
+
+class Publisher:
+    """
+    Долгоживущее соединение для публикации с пулом каналов.
+    Каналы открыты с publisher confirms: publish() возвращается после
+    подтверждения брокера. Запускается и закрывается в lifespan приложения.
+    """
+
+    def __init__(self, pool_size: int = CHANNEL_POOL_SIZE):
+        self.pool_size = pool_size
+        self._connection: aio_pika.abc.AbstractRobustConnection | None = None
+        self._channels: Pool[aio_pika.abc.AbstractChannel] | None = None
+
+    async def _open_channel(self) -> aio_pika.abc.AbstractChannel:
+        return await self._connection.channel(publisher_confirms=True)
+
+    async def start(self) -> None:
+        self._connection = await _connect_to_rabbitmq()
+        self._channels = Pool(self._open_channel, max_size=self.pool_size)
+        async with self._channels.acquire() as channel:
+            for binding in TOPOLOGY:
+                exchange = await channel.declare_exchange(binding.exchange, ExchangeType.DIRECT)
+                queue = await channel.declare_queue(
+                    binding.queue, durable=True, arguments=binding.arguments
+                )
+                await queue.bind(exchange, binding.routing_key)
+        logger.info("RabbitMQ publisher started")
+
+    async def publish(self, exchange_name: str, routing_key: str, message: aio_pika.Message) -> None:
+        if self._channels is None:
+            raise RuntimeError("RabbitMQ publisher is not started")
+        async with self._channels.acquire() as channel:
+            if channel.is_closed:
+                # Канал закрывается брокером после ошибки на нём
+                await channel.reopen()
+            exchange = await channel.get_exchange(exchange_name, ensure=False)
+            await exchange.publish(message, routing_key=routing_key, timeout=PUBLISH_TIMEOUT_SECONDS)
+
+    async def close(self) -> None:
+        if self._channels is not None:
+            await self._channels.close()
+            self._channels = None
+        if self._connection is not None and not self._connection.is_closed:
+            await self._connection.close()
+        self._connection = None
+        logger.info("RabbitMQ publisher stopped")
+
+
+publisher = Publisher()
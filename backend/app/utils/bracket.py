@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class MatchLayout:
+    round_number: int
+    index: int
+    participant1_id: int | None = None
+    participant2_id: int | None = None
+    winner_id: int | None = None
+    next_index: int | None = None
+    next_slot: int | None = None
+
+    @property
+    def is_bye(self) -> bool:
+        return self.winner_id is not None
+
+
+def next_position(index: int) -> tuple[int, int]:
+    """
+    Позиция победителя матча в следующем раунде: (индекс матча, слот 1/2).
+    Сетка хранится как массив-дерево: матч i кормит матч i // 2.
+    """
+    return index // 2, 1 + index % 2
+
+
+def build_bracket_layout(participant_ids: list[int]) -> list[list[MatchLayout]]:
+    """
+    Строит раскладку олимпийской сетки без обращения к базе.
+    Первый раунд: пары по порядку, затем одиночные матчи (автовины) для byes.
+    Победители автовинов сразу выставляются в слоты второго раунда,
+    остальные раунды создаются пустыми.
+    """
+    n = len(participant_ids)
+    if n < 2:
+        return []
+    pow2 = 1 << (n - 1).bit_length()
+    byes = pow2 - n
+
+    rounds: list[list[MatchLayout]] = []
+    first_round = []
+    for i in range(0, n - byes, 2):
+        first_round.append(
+            MatchLayout(
+                round_number=1,
+                index=len(first_round),
+                participant1_id=participant_ids[i],
+                participant2_id=participant_ids[i + 1],
+            )
+        )
+    for pid in participant_ids[n - byes:]:
+        first_round.append(
+            MatchLayout(
+                round_number=1,
+                index=len(first_round),
+                participant1_id=pid,
+                winner_id=pid,
+            )
+        )
+    rounds.append(first_round)
+
+    size = len(first_round) // 2
+    while size:
+        rounds.append(
+            [MatchLayout(round_number=len(rounds) + 1, index=i) for i in range(size)]
+        )
+        size //= 2
+
+    for current, following in zip(rounds, rounds[1:]):
+        for match in current:
+            match.next_index, match.next_slot = next_position(match.index)
+            if match.is_bye:
+                target = following[match.next_index]
+                if match.next_slot == 1:
+                    target.participant1_id = match.winner_id
+                else:
+                    target.participant2_id = match.winner_id
+    return rounds
+
+
+def compute_places(rounds) -> list[int]:
+    """
+    Места участников сетки по загруженному дереву (раунды по номеру, матчи по id):
+    победитель и финалист, затем проигравшие в предыдущих раундах от позднего к раннему.
+    """
+    if not rounds:
+        return []
+    places = []
+    for match in rounds[-1].matches:
+        if match.winner_id:
+            places.append(match.winner_id)
+        for pid in (match.participant1_id, match.participant2_id):
+            if pid and pid != match.winner_id:
+                places.append(pid)
+    for round_obj in reversed(rounds[:-1]):
+        for match in round_obj.matches:
+            for pid in (match.participant1_id, match.participant2_id):
+                if pid:
+                    places.append(pid)
+    return list(dict.fromkeys(places))
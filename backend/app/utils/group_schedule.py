@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ScheduledMatch:
+    group_index: int
+    round_number: int
+    participant1_id: int
+    participant2_id: int
+    slot: int | None = None
+    court: int | None = None
+
+
+def circle_rounds(participant_ids: list[int]) -> list[list[tuple[int, int]]]:
+    """
+    Круговая система методом окружности: первый участник фиксирован,
+    остальные сдвигаются по кругу. При нечётном числе один отдыхает в каждом туре.
+    Каждый участник играет не больше одного матча за тур.
+    """
+    players: list[int | None] = list(participant_ids)
+    if len(players) < 2:
+        return []
+    if len(players) % 2:
+        players.append(None)
+    n = len(players)
+
+    rounds = []
+    for _ in range(n - 1):
+        pairs = [
+            (players[i], players[n - 1 - i])
+            for i in range(n // 2)
+            if players[i] is not None and players[n - 1 - i] is not None
+        ]
+        rounds.append(pairs)
+        players = [players[0], players[-1], *players[1:-1]]
+    return rounds
+
+
+def schedule_group_matches(
+    groups: list[list[int]],
+    courts: int = 1,
+    rest_slots: int = 1,
+) -> list[ScheduledMatch]:
+    """
+    Раскладывает матчи всех групп по кортам и временным слотам.
+    Матчи берутся по турам (внутри тура — группы по очереди), в каждый слот
+    ставится не больше courts матчей, а между матчами участника
+    должно пройти не меньше rest_slots свободных слотов.
+    """
+    pending: list[ScheduledMatch] = []
+    group_rounds = [circle_rounds(ids) for ids in groups]
+    for round_index in range(max((len(r) for r in group_rounds), default=0)):
+        for group_index, rounds in enumerate(group_rounds):
+            if round_index < len(rounds):
+                pending.extend(
+                    ScheduledMatch(group_index, round_index + 1, p1, p2)
+                    for p1, p2 in rounds[round_index]
+                )
+
+    scheduled: list[ScheduledMatch] = []
+    last_slot: dict[int, int] = {}
+    slot = 0
+    while pending:
+        placed: list[ScheduledMatch] = []
+        remaining = []
+        for position, match in enumerate(pending):
+            if len(placed) == courts:
+                remaining.extend(pending[position:])
+                break
+            players = (match.participant1_id, match.participant2_id)
+            if all(slot - last_slot.get(p, -rest_slots - 1) > rest_slots for p in players):
+                match.slot = slot
+                match.court = len(placed) + 1
+                for p in players:
+                    last_slot[p] = slot
+                placed.append(match)
+            else:
+                remaining.append(match)
+        scheduled.extend(placed)
+        pending = remaining
+        slot += 1
+    return scheduled
@@ -0,0 +1,74 @@
+import heapq
+import math
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class SeedEntry:
+    participant_id: int
+    score: int
+    regions: frozenset[int] = field(default_factory=frozenset)
+
+
+class _RegionPot:
+    """
+    Корзина для посева с разведением регионов. Участники разложены по очередям
+    с одинаковым набором регионов, головы очередей — в куче по силе: выбор
+    пропускает только наборы, пересекающиеся с регионами группы, а не всех
+    участников корзины подряд.
+    """
+
+    def __init__(self, entries: list[SeedEntry]):
+        self._queues: dict[frozenset[int], deque[tuple[int, SeedEntry]]] = {}
+        for rank, entry in enumerate(entries):
+            self._queues.setdefault(entry.regions, deque()).append((rank, entry))
+        self._heads = [(queue[0][0], regions) for regions, queue in self._queues.items()]
+        heapq.heapify(self._heads)
+
+    def take(self, avoid: set[int]) -> SeedEntry:
+        """Самый сильный без регионов из avoid; если такого нет — самый сильный."""
+        skipped = []
+        while self._heads and self._heads[0][1] & avoid:
+            skipped.append(heapq.heappop(self._heads))
+        _, regions = heapq.heappop(self._heads) if self._heads else skipped.pop(0)
+        for head in skipped:
+            heapq.heappush(self._heads, head)
+        queue = self._queues[regions]
+        _, entry = queue.popleft()
+        if queue:
+            heapq.heappush(self._heads, (queue[0][0], regions))
+        return entry
+
+
+def seed_groups(
+    entries: list[SeedEntry],
+    group_size: int,
+    separate_regions: bool = False,
+) -> list[list[int]]:
+    """
+    Посев по корзинам "змейкой": участники сортируются по убыванию очков,
+    количество групп — ceil(N / group_size), каждая корзина из k сильнейших
+    оставшихся раскладывается по группам то слева направо, то справа налево.
+    Никто не теряется: размеры групп отличаются не больше чем на одного.
+
+    При separate_regions для очередной группы из корзины берётся самый сильный
+    участник без общих регионов с уже попавшими в группу; если такого нет,
+    просто самый сильный (ограничение мягкое).
+    """
+    if not entries:
+        return []
+    ranked = sorted(entries, key=lambda e: (-e.score, e.participant_id))
+    groups_count = math.ceil(len(ranked) / group_size)
+    groups: list[list[int]] = [[] for _ in range(groups_count)]
+    group_regions: list[set[int]] = [set() for _ in range(groups_count)]
+
+    for pot_index, start in enumerate(range(0, len(ranked), groups_count)):
+        pot = ranked[start:start + groups_count]
+        targets = range(groups_count) if pot_index % 2 == 0 else reversed(range(groups_count))
+        region_pot = _RegionPot(pot) if separate_regions else None
+        for position, target in enumerate(list(targets)[:len(pot)]):
+            entry = region_pot.take(group_regions[target]) if region_pot else pot[position]
+            groups[target].append(entry.participant_id)
+            group_regions[target] |= entry.regions
+    return groups
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError, WatchError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.crud import group_stage as crud_group_stage
+from backend.app.crud import group_standing as crud_group_standing
+from backend.app.utils.utils import redis
+from common.db.models.group import GroupStandingsPublic
+
+
+logger = logging.getLogger(__name__)
+
+STANDINGS_PREFIX = "group_standings:"
+STANDINGS_TTL_SECONDS = 6 * 60 * 60
+# Пересчёт таблиц турнира выполняет один запрос, остальные ждут его результат
+REBUILD_LOCK_SECONDS = 10
+REBUILD_WAIT_SECONDS = 2
+REBUILD_POLL_SECONDS = 0.05
+
+_tables_adapter = TypeAdapter(list[GroupStandingsPublic])
+
+
+def _tables_key(tournament_id: int) -> str:
+    return f"{STANDINGS_PREFIX}{tournament_id}:tables"
+
+
+def _lock_key(tournament_id: int) -> str:
+    return f"{STANDINGS_PREFIX}{tournament_id}:lock"
+
+
+def _version_key(tournament_id: int) -> str:
+    return f"{STANDINGS_PREFIX}{tournament_id}:version"
+
+
+async def _load(tournament_id: int, session: AsyncSession) -> list[GroupStandingsPublic]:
+    """Таблицы групп турнира из базы (по номеру группы)."""
+    groups = await crud_group_stage.get_groups_by_tournament(tournament_id, session)
+    standings = await crud_group_standing.get_standings_by_tournament(tournament_id, session)
+    return [
+        GroupStandingsPublic(
+            group_id=group.id,
+            name=group.name,
+            number=group.number,
+            standings=standings.get(group.id, []),
+        )
+        for group in sorted(groups, key=lambda group: group.number)
+    ]
+
+
+async def get_standings(tournament_id: int, session: AsyncSession) -> list[GroupStandingsPublic]:
+    """Таблицы групп турнира из Redis; при промахе — пересчёт в SQL и прогрев кэша."""
+    try:
+        raw = await redis.get(_tables_key(tournament_id))
+    except RedisError:
+        logger.warning("Standings cache is unavailable, reading tournament %s from SQL", tournament_id)
+        return await _load(tournament_id, session)
+    if raw is not None:
+        return _tables_adapter.validate_json(raw)
+    return await refresh_standings(tournament_id, session)
+
+
+async def _wait_for_rebuild(tournament_id: int) -> list[GroupStandingsPublic] | None:
+    """Ждёт таблицы от пересчёта другого запроса; None, если он не сохранил их."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + REBUILD_WAIT_SECONDS
+    while loop.time() < deadline:
+        await asyncio.sleep(REBUILD_POLL_SECONDS)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.get(_tables_key(tournament_id))
+            pipe.exists(_lock_key(tournament_id))
+            raw, locked = await pipe.execute()
+        if raw is not None:
+            return _tables_adapter.validate_json(raw)
+        if not locked:
+            break
+    return None
+
+
+async def _store(tournament_id: int, tables: list[GroupStandingsPublic], version: str | None) -> None:
+    async with redis.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(_version_key(tournament_id))
+            if await pipe.get(_version_key(tournament_id)) != version:
+                return
+            pipe.multi()
+            pipe.set(
+                _tables_key(tournament_id),
+                _tables_adapter.dump_json(tables),
+                ex=STANDINGS_TTL_SECONDS,
+            )
+            await pipe.execute()
+        except WatchError:
+            pass
+
+
+async def refresh_standings(tournament_id: int, session: AsyncSession) -> list[GroupStandingsPublic]:
+    """
+    Пересчитывает таблицы в SQL и кладёт в кэш. Пересчёт выполняет держатель
+    блокировки; остальные ждут его результат, а если он не сохранён — читают
+    базу сами, не кэшируя. Версия читается до запроса: если за это время
+    результаты изменились (invalidate_standings увеличил версию), таблица
+    возвращается, но не кэшируется — иначе устаревший снимок перезаписал бы
+    кэш на весь TTL.
+    """
+    try:
+        if not await redis.set(_lock_key(tournament_id), 1, nx=True, ex=REBUILD_LOCK_SECONDS):
+            tables = await _wait_for_rebuild(tournament_id)
+            return tables if tables is not None else await _load(tournament_id, session)
+        version = await redis.get(_version_key(tournament_id))
+    except RedisError:
+        logger.warning("Standings cache is unavailable, reading tournament %s from SQL", tournament_id)
+        return await _load(tournament_id, session)
+
+    try:
+        tables = await _load(tournament_id, session)
+        await _store(tournament_id, tables, version)
+    except RedisError:
+        logger.warning("Failed to cache standings of tournament %s", tournament_id)
+    finally:
+        try:
+            await redis.delete(_lock_key(tournament_id))
+        except RedisError:
+            # Блокировка истечёт сама через REBUILD_LOCK_SECONDS
+            pass
+    return tables
+
+
+async def invalidate_standings(tournament_id: int) -> None:
+    """
+    Сбрасывает таблицы турнира после изменения групп или результатов (после commit).
+    Новая версия не даёт сохраниться пересчёту, начатому до изменения.
+    Ошибка Redis не прерывает запрос: изменение в базе уже записано.
+    """
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.incr(_version_key(tournament_id))
+            pipe.expire(_version_key(tournament_id), STANDINGS_TTL_SECONDS)
+            pipe.delete(_tables_key(tournament_id))
+            await pipe.execute()
+    except RedisError:
+        logger.exception("Failed to invalidate standings of tournament %s", tournament_id)
@@ -0,0 +1,306 @@
+import datetime
+from typing import Any
+
+from dateutil.relativedelta import relativedelta
+from redis.exceptions import WatchError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import func, select
+
+from backend.app.utils import reference_cache
+from backend.app.utils.utils import redis
+from common.db.models.category import Category
+from common.db.models.participant import TournamentParticipant
+from common.db.models.user import User
+
+
+LEADERBOARD_PREFIX = "leaderboard:"
+# Растёт при каждом точечном обновлении: перестроение, прочитавшее базу
+# до обновления, не сохранится поверх него
+LEADERBOARD_VERSION = f"{LEADERBOARD_PREFIX}version"
+# Рейтинг без участников: Redis не хранит пустой sorted set
+EMPTY_SUFFIX = ":empty"
+UPDATE_ATTEMPTS = 3
+# Если перестроение всё время обгоняют обновления, рейтинг кэшируется ненадолго
+CONTENDED_TTL_SECONDS = 60
+MAX_PAGE_SIZE = 500
+ANY = "*"
+
+
+def _key(category_id: int | None, region_id: int | None, sex_id: int | None) -> str:
+    parts = (ANY if value is None else value for value in (category_id, region_id, sex_id))
+    return LEADERBOARD_PREFIX + ":".join(map(str, parts))
+
+
+def _empty_key(key: str) -> str:
+    return key + EMPTY_SUFFIX
+
+
+def _seconds_until_midnight() -> int:
+    # Возрастные окна категорий сдвигаются каждый день
+    now = datetime.datetime.now()
+    midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+    return max(int((midnight - now).total_seconds()), 60)
+
+
+def birth_date_window(category: Category, today: datetime.date) -> tuple[datetime.date, datetime.date]:
+    """Диапазон дат рождения категории (как в фильтре read_users)."""
+    return (
+        today - relativedelta(years=category.to_age),
+        today - relativedelta(years=category.from_age),
+    )
+
+
+def _ranked(admin: bool | None, organizer: bool | None) -> bool:
+    """В публичный рейтинг не входят админы и организаторы (как в фильтре страницы рейтинга)."""
+    return not admin and organizer is False
+
+
+async def _load_scores(
+    session: AsyncSession,
+    category: Category | None,
+    region_id: int | None,
+    sex_id: int | None,
+) -> dict[str, int]:
+    statement = select(User.id, func.coalesce(User.score, 0)).where(
+        User.admin.is_(False),
+        User.organizer.is_(False),
+    )
+    if category is not None:
+        statement = statement.where(
+            User.birth_date.between(*birth_date_window(category, datetime.date.today()))
+        )
+    if region_id is not None:
+        statement = statement.where(User.region_id == region_id)
+    if sex_id is not None:
+        statement = statement.where(User.sex_id == sex_id)
+    return {str(user_id): score for user_id, score in (await session.execute(statement)).all()}
+
+
+async def _store(key: str, scores: dict[str, int], version: str | None, ttl: int) -> bool:
+    """Сохраняет рейтинг, если версия не менялась с чтения базы (version=None — без проверки)."""
+    async with redis.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(LEADERBOARD_VERSION)
+            if version is not None and (await pipe.get(LEADERBOARD_VERSION) or "") != version:
+                return False
+            pipe.multi()
+            pipe.delete(key, _empty_key(key))
+            if scores:
+                pipe.zadd(key, scores)
+                pipe.expire(key, ttl)
+            else:
+                pipe.set(_empty_key(key), 1, ex=ttl)
+            await pipe.execute()
+            return True
+        except WatchError:
+            return False
+
+
+async def _ensure(
+    session: AsyncSession,
+    category: Category | None,
+    region_id: int | None,
+    sex_id: int | None,
+) -> str:
+    """Возвращает ключ рейтинга; при отсутствии строит его одним запросом."""
+    key = _key(category.id if category else None, region_id, sex_id)
+    if await redis.exists(key, _empty_key(key)):
+        return key
+
+    for _ in range(UPDATE_ATTEMPTS):
+        # Пустая строка вместо None: отсутствие версии тоже проверяется
+        version = await redis.get(LEADERBOARD_VERSION) or ""
+        scores = await _load_scores(session, category, region_id, sex_id)
+        if await _store(key, scores, version, _seconds_until_midnight()):
+            return key
+    await _store(key, scores, None, CONTENDED_TTL_SECONDS)
+    return key
+
+
+async def get_page(
+    session: AsyncSession,
+    category: Category | None = None,
+    region_id: int | None = None,
+    sex_id: int | None = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> tuple[list[tuple[int, int]], int]:
+    """
+    Страница рейтинга: [(user_id, score)] по убыванию очков и общее число.
+    Страница не больше MAX_PAGE_SIZE: при limit <= 0 ZREVRANGE с концом -1
+    вернул бы весь рейтинг.
+    """
+    key = await _ensure(session, category, region_id, sex_id)
+    skip = max(skip, 0)
+    limit = min(limit, MAX_PAGE_SIZE)
+    if limit < 1:
+        return [], await redis.zcard(key)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.zrevrange(key, skip, skip + limit - 1, withscores=True)
+        pipe.zcard(key)
+        page, count = await pipe.execute()
+    return [(int(user_id), int(score)) for user_id, score in page], count
+
+
+async def get_rank(
+    session: AsyncSession,
+    user_id: int,
+    category: Category | None = None,
+    region_id: int | None = None,
+    sex_id: int | None = None,
+) -> dict[str, Any] | None:
+    """Место пользователя (с 1), его очки и размер рейтинга; None, если его там нет."""
+    key = await _ensure(session, category, region_id, sex_id)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.zrevrank(key, str(user_id))
+        pipe.zscore(key, str(user_id))
+        pipe.zcard(key)
+        rank, score, total = await pipe.execute()
+    if rank is None:
+        return None
+    return {"user_id": user_id, "rank": rank + 1, "score": int(score), "total": total}
+
+
+async def _category_windows(session: AsyncSession) -> dict[int, tuple[datetime.date, datetime.date]]:
+    today = datetime.date.today()
+    return {
+        c.id: birth_date_window(c, today)
+        for c in await reference_cache.categories.all(session)
+    }
+
+
+def _user_keys(
+    windows: dict[int, tuple[datetime.date, datetime.date]],
+    birth_date: datetime.date | None,
+    region_id: int | None,
+    sex_id: int | None,
+    admin: bool | None = False,
+    organizer: bool | None = False,
+) -> list[str]:
+    """Все рейтинги, в которые входит пользователь с такими данными."""
+    if not _ranked(admin, organizer):
+        return []
+    category_ids = [None] + [
+        category_id for category_id, (oldest, youngest) in windows.items()
+        if birth_date is not None and oldest <= birth_date <= youngest
+    ]
+    return [
+        _key(category_id, r, s)
+        for category_id in category_ids
+        for r in dict.fromkeys((None, region_id))
+        for s in dict.fromkeys((None, sex_id))
+    ]
+
+
+async def update_scores(session: AsyncSession, participant_ids: list[int]) -> None:
+    """
+    Переносит текущие очки пользователей участников (после commit начисления)
+    во все уже построенные рейтинги, куда они входят. Очки пишутся абсолютным
+    значением, поэтому повтор безопасен, а новая версия не даёт перестроению
+    со снимком до начисления сохраниться поверх.
+    Очки получает user_id участника — как в award_stage_points.
+    """
+    if not participant_ids:
+        return
+    rows = (
+        await session.execute(
+            select(
+                User.id,
+                func.coalesce(User.score, 0),
+                User.birth_date,
+                User.region_id,
+                User.sex_id,
+            )
+            .join(TournamentParticipant, TournamentParticipant.user_id == User.id)
+            .where(
+                TournamentParticipant.id.in_(participant_ids),
+                User.admin.is_(False),
+                User.organizer.is_(False),
+            )
+            .distinct()
+        )
+    ).all()
+    windows = await _category_windows(session)
+
+    # XX: ключи и участники не создаются — отсутствующий рейтинг соберётся
+    # из базы при чтении, а новые пользователи добавляются через add_user
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.incr(LEADERBOARD_VERSION)
+        for user_id, score, birth_date, region_id, sex_id in rows:
+            for key in _user_keys(windows, birth_date, region_id, sex_id):
+                pipe.zadd(key, {str(user_id): score}, xx=True)
+        await pipe.execute()
+
+
+async def _update_member(user_id: int, score: int, remove_from: list[str], add_to: list[str]) -> None:
+    """
+    Убирает пользователя из remove_from и ставит с score в add_to — только в уже
+    построенные рейтинги (или помеченные пустыми), чтобы не создать неполный.
+    Проверка и запись идут под WATCH; если не вышло, затронутые рейтинги
+    сбрасываются и соберутся из базы.
+    """
+    member = str(user_id)
+    for _ in range(UPDATE_ATTEMPTS):
+        async with redis.pipeline(transaction=True) as pipe:
+            try:
+                built = []
+                if add_to:
+                    await pipe.watch(*add_to, *map(_empty_key, add_to))
+                    async with redis.pipeline(transaction=False) as check:
+                        for key in add_to:
+                            check.exists(key, _empty_key(key))
+                        built = await check.execute()
+                pipe.multi()
+                pipe.incr(LEADERBOARD_VERSION)
+                for key in remove_from:
+                    pipe.zrem(key, member)
+                for key, exists in zip(add_to, built):
+                    if exists:
+                        pipe.delete(_empty_key(key))
+                        pipe.zadd(key, {member: score})
+                        pipe.expire(key, _seconds_until_midnight())
+                await pipe.execute()
+                return
+            except WatchError:
+                continue
+    keys = remove_from + add_to
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.incr(LEADERBOARD_VERSION)
+        pipe.delete(*keys, *map(_empty_key, keys))
+        await pipe.execute()
+
+
+def rank_fields(user: User) -> tuple:
+    """Данные пользователя, от которых зависят рейтинги."""
+    return (user.score or 0, user.birth_date, user.region_id, user.sex_id, user.admin, user.organizer)
+
+
+async def add_user(session: AsyncSession, user: User) -> None:
+    """Новый пользователь — во все построенные рейтинги, куда он входит."""
+    windows = await _category_windows(session)
+    await _update_member(user.id, user.score or 0, [], _user_keys(windows, *rank_fields(user)[1:]))
+
+
+async def remove_user(session: AsyncSession, user: User) -> None:
+    """Удалённый пользователь — из всех рейтингов."""
+    windows = await _category_windows(session)
+    await _update_member(user.id, 0, _user_keys(windows, *rank_fields(user)[1:]), [])
+
+
+async def user_changed(session: AsyncSession, before: tuple, user: User) -> None:
+    """
+    После правки профиля: если изменились очки, регион, пол, дата рождения
+    или роли (before — rank_fields до правки), переносит пользователя между
+    рейтингами; ставший админом или организатором из них уходит.
+    """
+    if rank_fields(user) == before:
+        return
+    windows = await _category_windows(session)
+    old_keys = _user_keys(windows, *before[1:])
+    new_keys = _user_keys(windows, *rank_fields(user)[1:])
+    await _update_member(
+        user.id,
+        user.score or 0,
+        [key for key in old_keys if key not in new_keys],
+        new_keys,
+    )
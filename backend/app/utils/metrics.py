@@ -0,0 +1,175 @@
+import logging
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import aio_pika
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from common.db.database import pool_stats
+
+
+logger = logging.getLogger(__name__)
+
+# Маршрут для запросов, не попавших ни в один роут (404 сканеров и т.п.)
+UNMATCHED_ROUTE = "unmatched"
+QUEUE_LAG_TIMEOUT_SECONDS = 2
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RESPONSES = Counter(
+    "http_responses_total",
+    "Ответы по маршруту и статусу",
+    ["method", "route", "status"],
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Запросы в обработке",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+REQUEST_STATEMENTS = Histogram(
+    "http_request_sql_statements",
+    "Количество SQL-запросов за HTTP-запрос",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+QUEUE_LAG = Gauge(
+    "rabbitmq_queue_messages_ready",
+    "Сообщения, ожидающие consumer'а (лаг очереди)",
+    ["queue"],
+    multiprocess_mode="max",
+)
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+
+
+# Статистика текущего HTTP-запроса; None вне запроса (consumer, lifespan)
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+_watched_queues: dict[str, aio_pika.abc.AbstractQueue] = {}
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    if stats is not None:
+        stats.statements += 1
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Считает SQL-запросы движка в статистику текущего HTTP-запроса."""
+    if not event.contains(engine.sync_engine, "before_cursor_execute", _count_statement):
+        event.listen(engine.sync_engine, "before_cursor_execute", _count_statement)
+
+
+def watch_queue(queue: aio_pika.abc.AbstractQueue) -> None:
+    """Добавляет очередь, чей лаг отдаётся в /metrics."""
+    _watched_queues[queue.name] = queue
+
+
+async def _update_queue_lag() -> None:
+    for name, queue in _watched_queues.items():
+        try:
+            # Повторное объявление с теми же параметрами возвращает message_count
+            result = await queue.declare(timeout=QUEUE_LAG_TIMEOUT_SECONDS)
+            QUEUE_LAG.labels(name).set(result.message_count)
+        except Exception:
+            logger.warning("Failed to read message count of queue %s", name)
+
+
+class DatabasePoolCollector:
+    """Состояние пула соединений процесса в момент сбора метрик."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+
+    def collect(self):
+        stats = pool_stats(self.engine)
+        for name in ("size", "checked_out", "overflow"):
+            yield GaugeMetricFamily(f"db_pool_{name}", f"Пул соединений: {name}", value=stats[name])
+        if "wait_seconds_total" in stats:
+            yield GaugeMetricFamily(
+                "db_pool_wait_seconds_total",
+                "Суммарное ожидание свободного соединения",
+                value=stats["wait_seconds_total"],
+            )
+
+
+def register_pool_collector(engine: AsyncEngine) -> None:
+    REGISTRY.register(DatabasePoolCollector(engine))
+
+
+async def render() -> tuple[bytes, str]:
+    """
+    Текст метрик для Prometheus. При нескольких воркерах uvicorn задайте
+    PROMETHEUS_MULTIPROC_DIR — метрики запросов сложатся по всем процессам
+    (метрики пула в этом режиме смотрите в /health/db-pool).
+    """
+    await _update_queue_lag()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class PrometheusMiddleware:
+    """
+    ASGI-middleware: время ответа, статусы, запросы в обработке и число
+    SQL-запросов на HTTP-запрос. Маршрут берётся шаблоном ("/users/{user_id}"),
+    чтобы число рядов метрик не росло от id в пути.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_PROGRESS.labels(method).inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_PROGRESS.labels(method).dec()
+            current_request.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            REQUEST_LATENCY.labels(method, route_path).observe(elapsed)
+            RESPONSES.labels(method, route_path, status).inc()
+            REQUEST_STATEMENTS.labels(method, route_path).observe(stats.statements)
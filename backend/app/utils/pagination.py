@@ -0,0 +1,70 @@
+import base64
+import datetime
+import json
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(values: list[Any]) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime.date) else v for v in values]
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, keys: list) -> list[Any]:
+    """Значения ключей сортировки из курсора с приведением к типам колонок."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if len(values) != len(keys):
+            raise ValueError
+        return [
+            datetime.date.fromisoformat(value)
+            if key.type.python_type is datetime.date else key.type.python_type(value)
+            for value, key in zip(values, keys)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def fetch_keyset_page(
+    session: AsyncSession,
+    statement,
+    keys: list,
+    descending: bool,
+    limit: int,
+    cursor: str | None = None,
+    skip: int = 0,
+) -> tuple[list, str | None]:
+    """
+    Страница по ключу (keyset): WHERE (keys) < / > (значения из курсора)
+    ORDER BY keys LIMIT limit + 1. Глубокие страницы стоят столько же, сколько первая.
+    Без курсора работает старый skip (offset) для совместимости.
+    Возвращает строки и курсор следующей страницы (None, если её нет).
+    """
+    if cursor is not None:
+        bound = tuple_(
+            *(literal(value, key.type) for value, key in zip(decode_cursor(cursor, keys), keys))
+        )
+        statement = statement.where(
+            tuple_(*keys) < bound if descending else tuple_(*keys) > bound
+        )
+    elif skip:
+        statement = statement.offset(skip)
+
+    labels = [f"_key{i}" for i in range(len(keys))]
+    statement = statement.add_columns(
+        *(key.label(label) for key, label in zip(keys, labels))
+    ).order_by(
+        *(key.desc() if descending else key.asc() for key in keys)
+    ).limit(limit + 1)
+    rows = (await session.execute(statement)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], label) for label in labels])
+    return [row[0] for row in rows], next_cursor
@@ -0,0 +1,88 @@
+import datetime
+import json
+import logging
+from dataclasses import dataclass
+
+from redis.exceptions import RedisError
+
+from backend.app.utils.utils import redis
+from common.db.models.user import User
+
+
+logger = logging.getLogger(__name__)
+
+PRINCIPAL_PREFIX = "principal:"
+PRINCIPAL_TTL_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Права аутентифицированного пользователя без загрузки строки User."""
+
+    id: int
+    admin: bool
+    organizer: bool
+    end_of_subscription: datetime.datetime | None
+
+    @property
+    def subscriber(self) -> bool:
+        # Как User.subscriber: считается на момент проверки, а не кэширования
+        if self.end_of_subscription is None:
+            return False
+        return (
+            self.end_of_subscription.replace(tzinfo=datetime.timezone.utc)
+            > datetime.datetime.now(datetime.timezone.utc)
+        )
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            admin=bool(user.admin),
+            organizer=bool(user.organizer),
+            end_of_subscription=user.end_of_subscription,
+        )
+
+
+def _key(user_id: int) -> str:
+    return f"{PRINCIPAL_PREFIX}{user_id}"
+
+
+async def get(user_id: int) -> Principal | None:
+    try:
+        raw = await redis.get(_key(user_id))
+    except RedisError:
+        logger.warning("Principal cache is unavailable")
+        return None
+    if raw is None:
+        return None
+    data = json.loads(raw)
+    end = data["end_of_subscription"]
+    return Principal(
+        id=data["id"],
+        admin=data["admin"],
+        organizer=data["organizer"],
+        end_of_subscription=datetime.datetime.fromisoformat(end) if end else None,
+    )
+
+
+async def store(principal: Principal) -> None:
+    end = principal.end_of_subscription
+    raw = json.dumps({
+        "id": principal.id,
+        "admin": principal.admin,
+        "organizer": principal.organizer,
+        "end_of_subscription": end.isoformat() if end else None,
+    })
+    try:
+        await redis.set(_key(principal.id), raw, ex=PRINCIPAL_TTL_SECONDS)
+    except RedisError:
+        logger.warning("Failed to cache principal %s", principal.id)
+
+
+async def invalidate(user_id: int) -> None:
+    """Сбрасывает права пользователя после смены роли, подписки или удаления."""
+    try:
+        await redis.delete(_key(user_id))
+    except RedisError:
+        logger.exception("Failed to invalidate principal %s", user_id)
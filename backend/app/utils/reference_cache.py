@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import time
+from typing import Generic, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import SQLModel, select
+
+from common.db.database import Session
+from common.db.models.category import Category
+from common.db.models.region import Region
+from common.db.models.sex import Sex
+
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_TTL_SECONDS = 5 * 60
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+
+class ReferenceCache(Generic[ModelT]):
+    """
+    Кэш небольшой справочной таблицы в памяти процесса: {id: отвязанная копия строки}.
+    Таблица перечитывается целиком по истечении TTL или после invalidate().
+    invalidate() действует только на текущий процесс, поэтому id, которого нет
+    в кэше, дочитывается по первичному ключу: строку, созданную через другой
+    воркер, видно сразу. Изменения и удаления там видны не позже чем через TTL.
+    """
+
+    def __init__(self, model: type[ModelT], ttl: int = REFERENCE_TTL_SECONDS):
+        self.model = model
+        self.ttl = ttl
+        self._rows: dict[int, ModelT] = {}
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def _expired(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    async def load(self, session: AsyncSession) -> None:
+        rows = (await session.execute(select(self.model))).scalars().all()
+        self._rows = {row.id: self.model(**row.model_dump()) for row in rows}
+        self._loaded_at = time.monotonic()
+
+    async def get(self, session: AsyncSession, row_id: int | None) -> ModelT | None:
+        if self._expired():
+            async with self._lock:
+                if self._expired():
+                    await self.load(session)
+        if row_id is None or row_id in self._rows:
+            return self._rows.get(row_id)
+
+        row = await session.get(self.model, row_id)
+        if row is None:
+            return None
+        self._rows[row_id] = self.model(**row.model_dump())
+        return self._rows[row_id]
+
+    async def all(self, session: AsyncSession) -> list[ModelT]:
+        await self.get(session, None)
+        return list(self._rows.values())
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+
+sexes: ReferenceCache[Sex] = ReferenceCache(Sex)
+regions: ReferenceCache[Region] = ReferenceCache(Region)
+categories: ReferenceCache[Category] = ReferenceCache(Category)
+
+
+async def preload() -> None:
+    async with Session() as session:
+        for cache in (sexes, regions, categories):
+            await cache.load(session)
+    logger.info("Reference tables loaded into memory")
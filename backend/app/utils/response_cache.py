@@ -0,0 +1,115 @@
+import functools
+import hashlib
+import inspect
+import logging
+from typing import Any, Callable, Iterable
+
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+from redis.exceptions import RedisError
+
+from backend.app.utils.utils import redis
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "response_cache:"
+CATALOG_TTL_SECONDS = 60 * 60
+TOURNAMENTS_TTL_SECONDS = 5 * 60
+
+# Имя параметра, который декоратор добавляет в сигнатуру эндпоинта
+_REQUEST_PARAM = "cache_request"
+
+
+def _cache_key(request: Request) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{CACHE_PREFIX}{request.url.path}?{query}"
+
+
+def _tag_key(tag: str) -> str:
+    return f"{CACHE_PREFIX}tag:{tag}"
+
+
+def _respond(request: Request, body: str, etag: str) -> Response:
+    # TTL действует только для записи в Redis: клиент каждый раз сверяет ETag,
+    # поэтому invalidate_tags сразу виден и в браузерах, и за прокси
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cache_response(
+    response_model: Any,
+    ttl: int,
+    tags: Iterable[str] = (),
+) -> Callable:
+    """
+    Кэширует JSON-ответ GET-эндпоинта в Redis.
+    Ключ — путь и отсортированные query-параметры. tags — шаблоны тегов,
+    подставляются из параметров эндпоинта ("tournament:{tournament_id}");
+    invalidate_tags сбрасывает все ответы с тегом. Отдаёт ETag с
+    Cache-Control: no-cache и 304 на If-None-Match; ttl — срок записи в Redis.
+    Если Redis недоступен, ответ строится как обычно.
+    Ошибки (HTTPException) не кэшируются.
+    """
+    adapter = TypeAdapter(response_model)
+
+    def decorator(endpoint: Callable) -> Callable:
+        signature = inspect.signature(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs.pop(_REQUEST_PARAM)
+            key = _cache_key(request)
+            try:
+                cached = await redis.hgetall(key)
+            except RedisError:
+                logger.warning("Response cache is unavailable, serving %s uncached", key)
+                cached = None
+            if cached:
+                return _respond(request, cached["body"], cached["etag"])
+
+            result = await endpoint(*args, **kwargs)
+            content = result.model_dump() if isinstance(result, BaseModel) else result
+            body = adapter.dump_json(adapter.validate_python(content)).decode()
+            etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+
+            try:
+                async with redis.pipeline(transaction=True) as pipe:
+                    pipe.hset(key, mapping={"body": body, "etag": etag})
+                    pipe.expire(key, ttl)
+                    for tag in tags:
+                        tag_key = _tag_key(tag.format(**kwargs))
+                        pipe.sadd(tag_key, key)
+                        pipe.expire(tag_key, ttl)
+                    await pipe.execute()
+            except RedisError:
+                logger.warning("Failed to store %s in response cache", key)
+            return _respond(request, body, etag)
+
+        wrapper.__signature__ = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    _REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                ),
+            ]
+        )
+        return wrapper
+
+    return decorator
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """Удаляет все закэшированные ответы с указанными тегами."""
+    try:
+        tag_keys = [_tag_key(tag) for tag in tags]
+        async with redis.pipeline(transaction=False) as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+        keys = set().union(*members)
+        await redis.delete(*keys, *tag_keys)
+    except RedisError:
+        logger.exception("Failed to invalidate response cache tags %s", tags)
@@ -0,0 +1,172 @@
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from greenlet import getcurrent
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Call site ищется среди кадров приложения, а не SQLAlchemy/asyncio
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SELF = os.path.abspath(__file__)
+
+
+@dataclass
+class QueryRecord:
+    statement: str
+    parameters: str
+    duration_ms: float
+    call_site: str
+
+
+@dataclass
+class QueryLog:
+    """Все SQL-запросы одного запроса/теста."""
+
+    label: str
+    queries: list[QueryRecord] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def repeated(self, threshold: int) -> list[tuple[str, list[QueryRecord]]]:
+        """Одинаковые выражения, выполненные threshold и больше раз — кандидаты в N+1."""
+        groups: dict[str, list[QueryRecord]] = defaultdict(list)
+        for query in self.queries:
+            groups[query.statement].append(query)
+        return [
+            (statement, records)
+            for statement, records in groups.items()
+            if len(records) >= threshold
+        ]
+
+    def report(self, threshold: int | None = None) -> str:
+        threshold = threshold or settings.SQL_N_PLUS_ONE_THRESHOLD
+        total_ms = sum(q.duration_ms for q in self.queries)
+        lines = [f"{self.label}: {len(self.queries)} queries, {total_ms:.1f} ms"]
+        for statement, records in self.repeated(threshold):
+            distinct = len({r.parameters for r in records})
+            sites = sorted({r.call_site for r in records})
+            lines.append(
+                f"  N+1: {len(records)}x ({distinct} distinct params) at {', '.join(sites)}: "
+                f"{_shorten(statement)}"
+            )
+        return "\n".join(lines)
+
+
+_current_log: ContextVar[QueryLog | None] = ContextVar("sql_profiler_log", default=None)
+
+
+def _shorten(statement: str, limit: int = 200) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def _frames():
+    # Async-драйвер выполняет события в дочернем greenlet, поэтому
+    # после его кадров идём в кадры родителя — там корутина, которая ждёт запрос
+    frame = sys._getframe()
+    current = getcurrent()
+    while current is not None:
+        while frame is not None:
+            yield frame
+            frame = frame.f_back
+        current = current.parent
+        frame = current.gr_frame if current is not None else None
+
+
+def _call_site() -> str:
+    for frame in _frames():
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_ROOT) and filename != _SELF:
+            return f"{os.path.relpath(filename, _APP_ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+    return "unknown"
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sql_profiler_started", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["sql_profiler_started"].pop()
+    duration_ms = (time.perf_counter() - started) * 1000
+    query_log = _current_log.get()
+    slow = duration_ms >= settings.SQL_SLOW_QUERY_MS
+    if query_log is None and not slow:
+        return
+
+    call_site = _call_site()
+    if slow:
+        logger.warning(
+            "Slow query %.1f ms at %s: %s", duration_ms, call_site, _shorten(statement)
+        )
+    if query_log is not None:
+        query_log.queries.append(
+            QueryRecord(statement, repr(parameters), duration_ms, call_site)
+        )
+
+
+def install(engine: AsyncEngine) -> None:
+    """Подключает профилировщик к движку. Включать только в разработке и тестах."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_execute)
+
+
+@contextmanager
+def profile(label: str) -> Iterator[QueryLog]:
+    """Собирает запросы внутри блока в QueryLog (для запроса, теста, скрипта)."""
+    query_log = QueryLog(label)
+    token = _current_log.set(query_log)
+    try:
+        yield query_log
+    finally:
+        _current_log.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int, label: str = "block") -> Iterator[QueryLog]:
+    """
+    Падает с AssertionError, если блок выполнил больше max_queries запросов.
+    Основа для фикстуры тестов:
+
+        with query_budget(5, "GET /playoffs/{id}"):
+            await client.get(...)
+    """
+    with profile(label) as query_log:
+        yield query_log
+    if len(query_log) > max_queries:
+        raise AssertionError(
+            f"Query budget exceeded: {len(query_log)} > {max_queries}\n{query_log.report()}"
+        )
+
+
+class SqlProfilerMiddleware:
+    """Пишет в лог сводку SQL по каждому HTTP-запросу, если найден N+1."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with profile(f"{scope['method']} {scope['path']}") as query_log:
+            await self.app(scope, receive, send)
+        if query_log.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+            logger.warning(query_log.report())
+        else:
+            logger.debug(query_log.report())
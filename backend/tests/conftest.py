@@ -0,0 +1,161 @@
+import datetime
+import os
+
+# Settings читаются при импорте backend.app.*: значения для тестов без .env
+for name, value in {
+    "API_V1_STR": "/api/v1",
+    "GATEWAY_TOKEN": "test",
+    "JWT_TOKEN": "test",
+    "CUSTOMER_CODE": "test",
+    "MERCHANT_ID": "test",
+    "SECRET_KEY": "test",
+    "CLIENT_ID": "test",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "EMAIL_RESET_TOKEN_EXPIRE_HOURS": "1",
+    "EMAILS_FROM_EMAIL": "test@example.com",
+    "EMAILS_FROM_NAME": "test",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "25",
+    "SMTP_USER": "test",
+    "SMTP_PASSWORD": "test",
+    "SUPERUSER_EMAIL": "admin@example.com",
+    "SUPERUSER_PASSWORD": "test",
+    "PROJECT_NAME": "test",
+    "FRONTEND_HOST": "http://localhost",
+    "UPLOAD_DIR": "/tmp",
+    "RABBITMQ_HOST": "localhost",
+    "RABBITMQ_PORT": "5672",
+    "RABBITMQ_USER": "test",
+    "RABBITMQ_PASSWORD": "test",
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "REDIS_PASSWORD": "test",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_DB": "test",
+    "BCRYPT_ROUNDS": "4",
+}.items():
+    os.environ.setdefault(name, value)
+
+import sys
+
+import fakeredis
+import pytest
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.expression import Values
+from sqlmodel import SQLModel
+
+from backend.app.utils import sql_profiler
+from common.db.models import Category, Region, Sex, Tournament, TournamentParticipant, User
+
+
+@compiles(Values, "sqlite")
+def _values_as_union(element, compiler, **kw):
+    """SQLite не знает (VALUES ...) AS name (columns): те же строки через UNION ALL."""
+    rows = [row for data in element._data for row in data]
+    selects = [
+        select(*(literal(value, c.type).label(c.name) for value, c in zip(row, element.columns)))
+        for row in rows
+    ]
+    query = union_all(*selects) if len(selects) > 1 else selects[0]
+    # Для проверки декартова произведения FROM — сам VALUES, как в visit_values
+    from_linter = kw.pop("from_linter", None)
+    if from_linter:
+        from_linter.froms[element._de_clone()] = element.name
+    return compiler.process(query.subquery(element.name), **{**kw, "asfrom": True})
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def redis(monkeypatch):
+    """Подменяет общий клиент Redis во всех модулях, которые его импортировали."""
+    from backend.app.utils import utils
+
+    fake = fakeredis.FakeAsyncRedis(decode_responses=True)
+    shared = utils.redis
+    for module in list(sys.modules.values()):
+        if getattr(module, "redis", None) is shared:
+            monkeypatch.setattr(module, "redis", fake)
+    yield fake
+    await fake.aclose()
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def query_budget(engine):
+    """
+    sql_profiler.query_budget на тестовом движке:
+
+        with query_budget(4, "stage tree") as query_log:
+            ...
+    """
+    sql_profiler.install(engine)
+    return sql_profiler.query_budget
+
+
+@pytest.fixture
+async def session(engine):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture
+async def participants(session) -> list[TournamentParticipant]:
+    """Турнир id=1 с 16 участниками; у участника i рейтинг i."""
+    session.add_all([
+        Region(name="Region"),
+        Sex(name="Мужской", shortname="М"),
+        Category(name="Взрослые", from_age=0, to_age=100),
+    ])
+    await session.flush()
+    users = [
+        User(
+            name=f"Name{i}",
+            surname=f"Surname{i}",
+            patronymic="Patronymic",
+            email=f"user{i}@example.com",
+            score=i,
+            region_id=1,
+            sex_id=1,
+            birth_date=datetime.date(2000, 1, 1),
+        )
+        for i in range(16)
+    ]
+    session.add_all(users)
+    await session.flush()
+    session.add(Tournament(
+        name="Tournament",
+        type="solo",
+        region_id=1,
+        sex_id=1,
+        category_id=1,
+        owner_id=users[0].id,
+        photo_path="photo.png",
+        date=datetime.date(2026, 1, 1),
+    ))
+    await session.flush()
+    participants = [TournamentParticipant(tournament_id=1, user_id=user.id) for user in users]
+    session.add_all(participants)
+    await session.commit()
+    return participants
@@ -0,0 +1,127 @@
+import contextlib
+import json
+
+import pytest
+from aio_pika.exceptions import ChannelInvalidStateError
+
+from backend.app.messaging import consumer
+
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeChannel:
+    def __init__(self):
+        self.is_closed = False
+        self.settled = []
+
+
+class FakeMessage:
+    """Как IncomingMessage: settle идёт через канал, на закрытом канале — ошибка."""
+
+    def __init__(self, channel: FakeChannel, delivery_tag: int, body: bytes):
+        self._channel = channel
+        self.delivery_tag = delivery_tag
+        self.body = body
+
+    @property
+    def channel(self) -> FakeChannel:
+        if self._channel.is_closed:
+            raise ChannelInvalidStateError
+        return self._channel
+
+    async def ack(self, multiple=False):
+        self.channel.settled.append(("ack", self.delivery_tag, multiple))
+
+    async def nack(self, multiple=False, requeue=True):
+        self.channel.settled.append(("nack", self.delivery_tag, multiple))
+
+    async def reject(self, requeue=False):
+        self.channel.settled.append(("reject", self.delivery_tag, requeue))
+
+
+def confirmation(channel, tag, participant_id) -> FakeMessage:
+    body = json.dumps({"participant_id": participant_id, "tournament_id": 1}).encode()
+    return FakeMessage(channel, tag, body)
+
+
+@pytest.fixture
+def database(monkeypatch):
+    calls = []
+    failing = []
+
+    class Session:
+        async def execute(self, statement, parameters):
+            if failing:
+                raise ConnectionError("database is down")
+            calls.append(parameters["ids"])
+
+        async def commit(self):
+            pass
+
+    @contextlib.asynccontextmanager
+    async def get_db_session():
+        yield Session()
+
+    monkeypatch.setattr(consumer, "get_db_session", get_db_session)
+    return calls, failing
+
+
+async def test_batch_is_one_update_and_one_ack_per_channel(database):
+    calls, _ = database
+    batcher = consumer.ConfirmationBatcher(batch_size=10, flush_seconds=60)
+    old, new = FakeChannel(), FakeChannel()
+    # Переподключение посреди пачки: tag'и нового канала начинаются заново
+    for message in [
+        confirmation(old, 7, 1),
+        confirmation(old, 8, 2),
+        confirmation(new, 1, 2),
+        confirmation(new, 2, 3),
+        FakeMessage(new, 3, b"not json"),
+    ]:
+        await batcher(message)
+    await batcher.flush()
+
+    assert calls == [[1, 2, 3]]
+    assert old.settled == [("ack", 8, True)]
+    assert new.settled == [("reject", 3, False), ("ack", 2, True)]
+
+
+async def test_closed_channel_does_not_block_the_rest(database):
+    calls, _ = database
+    batcher = consumer.ConfirmationBatcher(batch_size=10, flush_seconds=60)
+    old, new = FakeChannel(), FakeChannel()
+    await batcher(confirmation(old, 5, 1))
+    await batcher(confirmation(new, 1, 2))
+    old.is_closed = True
+
+    await batcher.flush()
+
+    assert calls == [[1, 2]]
+    assert new.settled == [("ack", 1, True)]
+
+
+async def test_failed_write_requeues_after_delay(database):
+    _, failing = database
+    batcher = consumer.ConfirmationBatcher(batch_size=10, flush_seconds=60, retry_delay=0.001)
+    channel = FakeChannel()
+    failing.append(True)
+
+    for tag in (1, 2):
+        await batcher(confirmation(channel, tag, tag))
+        await batcher.flush()
+
+    assert channel.settled == [("nack", 1, True), ("nack", 2, True)]
+    assert batcher._failures == 2
+
+    failing.clear()
+    await batcher(confirmation(channel, 3, 3))
+    await batcher.flush()
+    assert channel.settled[-1] == ("ack", 3, True)
+    assert batcher._failures == 0
+
+
+def test_retry_delay_grows_up_to_limit():
+    batcher = consumer.ConfirmationBatcher(batch_size=10, flush_seconds=60, retry_delay=1, max_retry_delay=5)
+
+    assert [batcher._next_retry_delay() for _ in range(5)] == [1, 2, 4, 5, 5]
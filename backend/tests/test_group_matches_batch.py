@@ -0,0 +1,87 @@
+import pytest
+from fastapi import HTTPException
+from sqlmodel import select
+
+from backend.app.api.routes.groups import update_group_matches_batch
+from backend.app.crud.group_stage import create_groups_with_matches
+from backend.app.utils import group_standings
+from common.db.models.group import GroupMatch, GroupMatchScore, GroupStageCreate
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def groups(session, participants):
+    groups_in = [
+        GroupStageCreate(
+            name=name,
+            number=number,
+            participants_ids=[p.id for p in participants[start:start + 4]],
+        )
+        for name, number, start in (("A", 1, 0), ("B", 2, 4))
+    ]
+    return await create_groups_with_matches(groups_in, session, tournament_id=1)
+
+
+async def group_matches(session, group_id: int) -> list[GroupMatch]:
+    query = (
+        select(GroupMatch)
+        .where(GroupMatch.group_id == group_id)
+        .order_by(GroupMatch.id)
+        .execution_options(populate_existing=True)
+    )
+    return (await session.execute(query)).scalars().all()
+
+
+async def test_batch_is_one_update_and_returns_group_table(redis, session, groups, query_budget):
+    group = groups[0]
+    matches = await group_matches(session, group.id)
+    scores = [GroupMatchScore(match_id=m.id, score1=6, score2=i) for i, m in enumerate(matches[:3])]
+    await group_standings.get_standings(1, session)
+
+    with query_budget(10, "batch results") as query_log:
+        table = await update_group_matches_batch(group.id, scores, session)
+
+    updates = [q.statement for q in query_log.queries if q.statement.startswith("UPDATE")]
+    assert len(updates) == 1
+    assert "FROM" in updates[0]
+    assert table.group_id == group.id
+    wins = {row.participant_id: row.wins for row in table.standings}
+    for match in matches[:3]:
+        assert wins[match.participant1_id] >= 1
+    stored = {m.id: (m.score1, m.score2, m.played) for m in await group_matches(session, group.id)}
+    assert [stored[m.id] for m in matches[:3]] == [(6, 0, True), (6, 1, True), (6, 2, True)]
+    # Таблица пересчитана после записи, а не взята из старого кэша
+    assert table == next(t for t in await group_standings.get_standings(1, session) if t.group_id == group.id)
+
+
+async def test_batch_rejects_invalid_input(redis, session, groups):
+    group, other = groups
+    match = (await group_matches(session, group.id))[0]
+    foreign = (await group_matches(session, other.id))[0]
+
+    for scores in (
+        [],
+        [GroupMatchScore(match_id=match.id, score1=6, score2=0)] * 2,
+        [GroupMatchScore(match_id=foreign.id, score1=6, score2=0)],
+    ):
+        with pytest.raises(HTTPException) as error:
+            await update_group_matches_batch(group.id, scores, session)
+        assert error.value.status_code == 400
+
+    assert all(not m.played for m in await group_matches(session, other.id))
+
+
+async def test_batch_for_group_missing_from_table_is_404(redis, session, groups, monkeypatch):
+    group = groups[0]
+    match = (await group_matches(session, group.id))[0]
+
+    async def without_group(tournament_id, session):
+        return []
+
+    monkeypatch.setattr(group_standings, "get_standings", without_group)
+    scores = [GroupMatchScore(match_id=match.id, score1=6, score2=0)]
+    with pytest.raises(HTTPException) as error:
+        await update_group_matches_batch(group.id, scores, session)
+    assert error.value.status_code == 404
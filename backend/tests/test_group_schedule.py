@@ -0,0 +1,64 @@
+import time
+from collections import Counter, defaultdict
+
+import pytest
+
+from backend.app.utils.group_schedule import circle_rounds, schedule_group_matches
+
+
+FIELD = list(range(1, 257))
+# Запас на медленные CI-машины: на обычной машине расписание строится за единицы мс
+TIME_LIMIT_SECONDS = 0.5
+
+
+def best_time(func, *args, **kwargs):
+    timings = []
+    for _ in range(3):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.append(time.perf_counter() - started)
+    return result, min(timings)
+
+
+def test_circle_rounds_for_full_field():
+    rounds, elapsed = best_time(circle_rounds, FIELD)
+
+    assert len(rounds) == len(FIELD) - 1
+    pairs = [frozenset(pair) for pairs_in_round in rounds for pair in pairs_in_round]
+    assert len(pairs) == len(FIELD) * (len(FIELD) - 1) // 2
+    assert len(set(pairs)) == len(pairs)
+    for pairs_in_round in rounds:
+        players = [p for pair in pairs_in_round for p in pair]
+        assert len(players) == len(set(players)) == len(FIELD)
+    assert elapsed < TIME_LIMIT_SECONDS
+
+
+@pytest.mark.parametrize("group_size, courts, rest_slots", [(4, 16, 1), (8, 12, 1), (16, 8, 2)])
+def test_large_field_schedule(group_size, courts, rest_slots):
+    groups = [FIELD[i:i + group_size] for i in range(0, len(FIELD), group_size)]
+
+    matches, elapsed = best_time(schedule_group_matches, groups, courts=courts, rest_slots=rest_slots)
+
+    pairs = Counter(frozenset((m.participant1_id, m.participant2_id)) for m in matches)
+    assert len(pairs) == len(groups) * group_size * (group_size - 1) // 2
+    assert set(pairs.values()) == {1}
+    for match in matches:
+        group = groups[match.group_index]
+        assert match.participant1_id in group and match.participant2_id in group
+
+    by_slot = defaultdict(list)
+    for match in matches:
+        by_slot[match.slot].append(match)
+    slots_by_player = defaultdict(list)
+    for slot, slot_matches in by_slot.items():
+        assert sorted(m.court for m in slot_matches) == list(range(1, len(slot_matches) + 1))
+        assert len(slot_matches) <= courts
+        players = [p for m in slot_matches for p in (m.participant1_id, m.participant2_id)]
+        assert len(players) == len(set(players))
+        for p in players:
+            slots_by_player[p].append(slot)
+    for slots in slots_by_player.values():
+        slots.sort()
+        assert all(later - earlier > rest_slots for earlier, later in zip(slots, slots[1:]))
+
+    assert elapsed < TIME_LIMIT_SECONDS
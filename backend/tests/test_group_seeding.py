@@ -0,0 +1,112 @@
+import math
+import random
+import time
+
+import pytest
+
+from backend.app.utils.group_seeding import SeedEntry, seed_groups
+
+
+def test_snake_order_by_pots():
+    entries = [SeedEntry(participant_id=i, score=100 - i) for i in range(1, 9)]
+
+    assert seed_groups(entries, group_size=4) == [[1, 4, 5, 8], [2, 3, 6, 7]]
+
+
+def test_uneven_field_keeps_everyone_and_balances_sizes():
+    entries = [SeedEntry(participant_id=i, score=i % 7) for i in range(1, 24)]
+
+    groups = seed_groups(entries, group_size=4)
+
+    assert len(groups) == 6
+    assert sorted(p for group in groups for p in group) == list(range(1, 24))
+    assert max(map(len, groups)) - min(map(len, groups)) <= 1
+
+
+def test_equal_scores_are_ordered_by_participant_id():
+    entries = [SeedEntry(participant_id=i, score=0) for i in (4, 2, 3, 1)]
+
+    assert seed_groups(entries, group_size=2) == [[1, 4], [2, 3]]
+
+
+def test_separate_regions_is_soft():
+    entries = [
+        SeedEntry(participant_id=1, score=40, regions=frozenset({1})),
+        SeedEntry(participant_id=2, score=30, regions=frozenset({2})),
+        SeedEntry(participant_id=3, score=20, regions=frozenset({2})),
+        SeedEntry(participant_id=4, score=10, regions=frozenset({1})),
+    ]
+
+    # Без ограничения второй пот раскладывается змейкой: 3 ко второй группе, 4 к первой
+    assert seed_groups(entries, group_size=2) == [[1, 4], [2, 3]]
+    # С ограничением игроки одного региона расходятся по разным группам
+    assert seed_groups(entries, group_size=2, separate_regions=True) == [[1, 3], [2, 4]]
+
+    same_region = [SeedEntry(participant_id=i, score=10 - i, regions=frozenset({1})) for i in range(1, 5)]
+    assert seed_groups(same_region, group_size=2, separate_regions=True) == [[1, 4], [2, 3]]
+
+
+def test_empty_field():
+    assert seed_groups([], group_size=4) == []
+
+
+def reference_seed(entries: list[SeedEntry], group_size: int) -> list[list[int]]:
+    """Посев с разведением регионов прямым перебором корзины — эталон для сравнения."""
+    ranked = sorted(entries, key=lambda e: (-e.score, e.participant_id))
+    groups_count = math.ceil(len(ranked) / group_size)
+    groups = [[] for _ in range(groups_count)]
+    group_regions = [set() for _ in range(groups_count)]
+    for pot_index, start in enumerate(range(0, len(ranked), groups_count)):
+        pot = ranked[start:start + groups_count]
+        targets = range(groups_count) if pot_index % 2 == 0 else reversed(range(groups_count))
+        for target in list(targets)[:len(pot)]:
+            pick = next((i for i, e in enumerate(pot) if not e.regions & group_regions[target]), 0)
+            entry = pot.pop(pick)
+            groups[target].append(entry.participant_id)
+            group_regions[target] |= entry.regions
+    return groups
+
+
+def large_field(size: int, regions: int) -> list[SeedEntry]:
+    rng = random.Random(size)
+    return [
+        SeedEntry(participant_id=i, score=rng.randint(0, 500), regions=frozenset({rng.randint(1, regions)}))
+        for i in range(1, size + 1)
+    ]
+
+
+def test_large_field_snake_order():
+    entries = large_field(1003, regions=40)
+    ranked = [e.participant_id for e in sorted(entries, key=lambda e: (-e.score, e.participant_id))]
+
+    groups = seed_groups(entries, group_size=4)
+
+    assert len(groups) == 251
+    assert max(map(len, groups)) - min(map(len, groups)) <= 1
+    for pot_index, start in enumerate(range(0, len(ranked), len(groups))):
+        pot = ranked[start:start + len(groups)]
+        order = groups if pot_index % 2 == 0 else groups[::-1]
+        assert [group[pot_index] for group in order[:len(pot)]] == pot
+
+
+@pytest.mark.parametrize("regions", [3, 40])
+def test_large_field_region_separation_matches_reference(regions):
+    entries = large_field(1200, regions)
+
+    groups = seed_groups(entries, group_size=4, separate_regions=True)
+
+    assert groups == reference_seed(entries, group_size=4)
+    assert max(map(len, groups)) - min(map(len, groups)) <= 1
+
+
+def test_region_separation_is_not_quadratic():
+    # Мало регионов: почти вся корзина конфликтует с группой. Перебор корзины
+    # для каждой группы занимал здесь больше 0,5 с, очереди по регионам — сотые доли
+    entries = large_field(16_000, regions=3)
+
+    started = time.perf_counter()
+    groups = seed_groups(entries, group_size=4, separate_regions=True)
+    elapsed = time.perf_counter() - started
+
+    assert sum(map(len, groups)) == len(entries)
+    assert elapsed < 0.5
@@ -0,0 +1,93 @@
+import datetime
+from collections import Counter, defaultdict
+from itertools import groupby
+
+import pytest
+from sqlmodel import select
+
+from backend.app.crud.group_stage import create_groups_with_matches
+from common.db.models.group import GroupMatch, GroupParticipant, GroupScheduleParams, GroupStage, GroupStageCreate
+
+
+pytestmark = pytest.mark.anyio
+
+
+def groups_of_four(participants, count: int) -> list[GroupStageCreate]:
+    return [
+        GroupStageCreate(
+            name=f"Группа {index + 1}",
+            number=index + 1,
+            participants_ids=[p.id for p in participants[index * 4:(index + 1) * 4]],
+        )
+        for index in range(count)
+    ]
+
+
+async def load_matches(session) -> list[GroupMatch]:
+    return (await session.execute(select(GroupMatch).order_by(GroupMatch.id))).scalars().all()
+
+
+async def test_creates_round_robin_without_schedule(session, participants, query_budget):
+    # 2 группы, 8 участников, 12 матчей. SQLite пишет строки по одной
+    # (в Postgres insertmanyvalues даёт по INSERT на таблицу), но без SELECT
+    # и каждая таблица одним куском — один flush на всё
+    with query_budget(22, "create groups") as query_log:
+        groups = await create_groups_with_matches(groups_of_four(participants, 2), session, tournament_id=1)
+
+    runs = [table for table, _ in groupby(q.statement.split()[2] for q in query_log.queries)]
+    assert runs[0] == GroupStage.__tablename__
+    assert sorted(runs) == sorted([GroupStage.__tablename__, GroupParticipant.__tablename__, GroupMatch.__tablename__])
+    assert all(q.statement.startswith("INSERT") for q in query_log.queries)
+
+    assert [group.number for group in groups] == [1, 2]
+    members = (await session.execute(select(GroupParticipant))).scalars().all()
+    assert len(members) == 8
+    matches = await load_matches(session)
+    # Круговая система в группе из четырёх — 6 матчей
+    assert Counter(match.group_id for match in matches) == {groups[0].id: 6, groups[1].id: 6}
+    assert all(match.scheduled_at is None and match.court is None for match in matches)
+
+
+async def test_schedule_respects_courts_and_rest(session, participants):
+    start_at = datetime.datetime(2026, 5, 1, 10, 0)
+    schedule = GroupScheduleParams(start_at=start_at, courts=2, slot_minutes=30, rest_slots=1)
+    await create_groups_with_matches(groups_of_four(participants, 4), session, tournament_id=1, schedule=schedule)
+
+    matches = await load_matches(session)
+    assert len(matches) == 24
+
+    by_time = defaultdict(list)
+    for match in matches:
+        assert match.court in (1, 2)
+        offset = match.scheduled_at - start_at
+        assert offset % datetime.timedelta(minutes=30) == datetime.timedelta(0)
+        by_time[match.scheduled_at].append(match)
+
+    slot_length = datetime.timedelta(minutes=30)
+    last_played = {}
+    for scheduled_at in sorted(by_time):
+        slot_matches = by_time[scheduled_at]
+        assert sorted(match.court for match in slot_matches) == list(range(1, len(slot_matches) + 1))
+        for match in slot_matches:
+            for participant_id in (match.participant1_id, match.participant2_id):
+                previous = last_played.get(participant_id)
+                # rest_slots=1: между матчами участника хотя бы один свободный слот
+                assert previous is None or scheduled_at - previous >= 2 * slot_length
+                last_played[participant_id] = scheduled_at
+
+
+@pytest.mark.parametrize(
+    "start_at",
+    [
+        "2026-05-01T10:00:00+03:00",
+        "2026-05-01T07:00:00Z",
+        "2026-05-01T07:00:00",
+    ],
+)
+async def test_schedule_stores_naive_utc_start(session, participants, start_at):
+    schedule = GroupScheduleParams.model_validate({"start_at": start_at, "courts": 2})
+    await create_groups_with_matches(groups_of_four(participants, 1), session, tournament_id=1, schedule=schedule)
+
+    matches = await load_matches(session)
+    assert all(match.scheduled_at.tzinfo is None for match in matches)
+    assert min(match.scheduled_at for match in matches) == datetime.datetime(2026, 5, 1, 7, 0)
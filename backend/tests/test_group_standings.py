@@ -0,0 +1,105 @@
+import anyio
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlmodel import select
+
+from backend.app.crud import group_standing as crud_group_standing
+from backend.app.crud.group_stage import create_groups_with_matches
+from backend.app.utils import group_standings
+from common.db.models.group import GroupMatch, GroupStageCreate
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def group(session, participants):
+    groups_in = [GroupStageCreate(name="A", number=1, participants_ids=[p.id for p in participants[:4]])]
+    (created,) = await create_groups_with_matches(groups_in, session, tournament_id=1)
+    return created
+
+
+async def play(session, match_id: int, score1: int, score2: int) -> None:
+    match = await session.get(GroupMatch, match_id)
+    match.score1, match.score2, match.played = score1, score2, True
+    await session.commit()
+    await group_standings.invalidate_standings(1)
+
+
+def points(tables) -> dict[int, int]:
+    return {row.participant_id: row.points for row in tables[0].standings}
+
+
+async def test_result_change_is_counted_once(redis, session, group):
+    match = (await session.execute(select(GroupMatch).order_by(GroupMatch.id))).scalars().first()
+
+    await group_standings.get_standings(1, session)
+    await play(session, match.id, 6, 3)
+    await group_standings.get_standings(1, session)
+    # Исправление счёта: победа переходит ко второму участнику
+    await play(session, match.id, 2, 6)
+
+    cached = await group_standings.get_standings(1, session)
+    assert points(cached)[match.participant1_id] == 0
+    assert points(cached)[match.participant2_id] == 3
+    assert cached == await group_standings.get_standings(1, session)
+
+
+async def test_rebuild_started_before_change_is_not_cached(redis, session, group, monkeypatch):
+    match = (await session.execute(select(GroupMatch).order_by(GroupMatch.id))).scalars().first()
+    read_standings = crud_group_standing.get_standings_by_tournament
+
+    async def read_then_result_arrives(tournament_id, session):
+        snapshot = await read_standings(tournament_id, session)
+        # Результат записан, пока пересчёт держит старый снимок
+        await play(session, match.id, 6, 0)
+        return snapshot
+
+    monkeypatch.setattr(crud_group_standing, "get_standings_by_tournament", read_then_result_arrives)
+    stale = await group_standings.refresh_standings(1, session)
+    monkeypatch.setattr(crud_group_standing, "get_standings_by_tournament", read_standings)
+
+    assert set(points(stale).values()) == {0}
+    assert await redis.exists("group_standings:1:tables") == 0
+    fresh = await group_standings.get_standings(1, session)
+    assert points(fresh)[match.participant1_id] == 3
+
+
+async def test_concurrent_misses_rebuild_once(redis, session, group, monkeypatch):
+    read_standings = crud_group_standing.get_standings_by_tournament
+    rebuilds = []
+
+    async def slow_read(tournament_id, session):
+        rebuilds.append(tournament_id)
+        await anyio.sleep(0.2)
+        return await read_standings(tournament_id, session)
+
+    monkeypatch.setattr(crud_group_standing, "get_standings_by_tournament", slow_read)
+    results = []
+
+    async def read():
+        results.append(await group_standings.get_standings(1, session))
+
+    async with anyio.create_task_group() as tg:
+        for _ in range(5):
+            tg.start_soon(read)
+
+    assert rebuilds == [1]
+    assert all(result == results[0] for result in results)
+    assert not await redis.exists("group_standings:1:lock")
+
+
+class DownRedis:
+    def __getattr__(self, name):
+        raise RedisConnectionError("Redis is down")
+
+
+async def test_redis_outage_falls_back_to_sql(session, group, monkeypatch):
+    monkeypatch.setattr(group_standings, "redis", DownRedis())
+    match = (await session.execute(select(GroupMatch).order_by(GroupMatch.id))).scalars().first()
+
+    # Результат уже записан в базу: сбой кэша не должен превращать запрос в ошибку
+    await play(session, match.id, 6, 1)
+
+    tables = await group_standings.get_standings(1, session)
+    assert points(tables)[match.participant1_id] == 3
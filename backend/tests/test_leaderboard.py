@@ -0,0 +1,179 @@
+import datetime
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend.app.api.deps import get_db
+from backend.app.api.routes import users
+from backend.app.utils import leaderboard, reference_cache
+from common.db.models.region import Region
+from common.db.models.user import User
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def fresh_categories():
+    # Кэш справочника живёт в модуле, а база у каждого теста своя
+    reference_cache.categories.invalidate()
+
+
+async def new_user(session, email: str, score: int, region_id: int = 1) -> User:
+    user = User(
+        name="New",
+        surname="User",
+        email=email,
+        score=score,
+        region_id=region_id,
+        sex_id=1,
+        birth_date=datetime.date(2000, 1, 1),
+    )
+    session.add(user)
+    await session.commit()
+    return user
+
+
+async def test_page_size_is_bounded(redis, session, participants):
+    page, count = await leaderboard.get_page(session, limit=0)
+    assert (page, count) == ([], 16)
+
+    page, _ = await leaderboard.get_page(session, skip=-5, limit=3)
+    assert [score for _, score in page] == [15, 14, 13]
+
+    page, _ = await leaderboard.get_page(session, limit=10_000)
+    assert len(page) == 16
+
+
+async def test_empty_ranking_is_cached(redis, session, query_budget, participants):
+    session.add(Region(name="Empty"))
+    await session.commit()
+
+    with query_budget(1, "empty ranking build"):
+        assert await leaderboard.get_page(session, region_id=2) == ([], 0)
+    with query_budget(0, "empty ranking hit"):
+        assert await leaderboard.get_page(session, region_id=2) == ([], 0)
+
+
+async def test_new_user_joins_built_rankings_only(redis, session, participants):
+    session.add(Region(name="Empty"))
+    await session.commit()
+    await leaderboard.get_page(session)
+    await leaderboard.get_page(session, region_id=2)
+
+    user = await new_user(session, "new@example.com", score=100, region_id=2)
+    await leaderboard.add_user(session, user)
+
+    page, count = await leaderboard.get_page(session, limit=1)
+    assert (page, count) == ([(user.id, 100)], 17)
+    assert await leaderboard.get_page(session, region_id=2) == ([(user.id, 100)], 1)
+    assert await redis.ttl("leaderboard:*:2:*") > 0
+    # Рейтинги, которых не было, не создаются неполными
+    assert not await redis.exists("leaderboard:*:2:1")
+
+
+async def test_removed_user_leaves_rankings(redis, session, participants):
+    await leaderboard.get_page(session)
+    top = await session.get(User, 16)
+
+    await leaderboard.remove_user(session, top)
+
+    page, count = await leaderboard.get_page(session, limit=1)
+    assert count == 15
+    assert page[0][0] != top.id
+
+
+async def test_profile_edit_keeps_rankings_unless_rank_fields_change(redis, session, participants):
+    await leaderboard.get_page(session)
+    user = await session.get(User, 3)
+    version = await redis.get(leaderboard.LEADERBOARD_VERSION)
+
+    before = leaderboard.rank_fields(user)
+    user.name = "Renamed"
+    await leaderboard.user_changed(session, before, user)
+    assert await redis.get(leaderboard.LEADERBOARD_VERSION) == version
+
+    session.add(Region(name="Other"))
+    await session.commit()
+    await leaderboard.get_page(session, region_id=1)
+    before = leaderboard.rank_fields(user)
+    user.region_id = 2
+    await session.commit()
+    await leaderboard.user_changed(session, before, user)
+
+    assert (await leaderboard.get_page(session, region_id=1))[1] == 15
+    assert (await leaderboard.get_page(session, region_id=2))[1] == 1
+    assert (await leaderboard.get_page(session))[1] == 16
+
+
+async def test_rebuild_overlapping_update_is_not_cached(redis, session, participants, monkeypatch):
+    load_scores = leaderboard._load_scores
+    arrived = []
+
+    async def load_then_user_signs_up(*args):
+        scores = await load_scores(*args)
+        if not arrived:
+            user = await new_user(session, "late@example.com", score=100)
+            await leaderboard.add_user(session, user)
+            arrived.append(user)
+        return scores
+
+    monkeypatch.setattr(leaderboard, "_load_scores", load_then_user_signs_up)
+    page, count = await leaderboard.get_page(session, limit=1)
+
+    assert (page, count) == ([(arrived[0].id, 100)], 17)
+
+
+async def test_rating_page_query_uses_leaderboard(redis, session, participants, monkeypatch):
+    admin = await session.get(User, 16)
+    organizer = await session.get(User, 15)
+    admin.admin, organizer.organizer = True, True
+    await session.commit()
+
+    pages = []
+    get_page = leaderboard.get_page
+
+    async def recording_get_page(*args, **kwargs):
+        pages.append(args)
+        return await get_page(*args, **kwargs)
+
+    monkeypatch.setattr(leaderboard, "get_page", recording_get_page)
+    app = FastAPI()
+    app.include_router(users.router)
+
+    async def get_test_db():
+        yield session
+
+    app.dependency_overrides[get_db] = get_test_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # Запрос страницы рейтинга (frontend/src/pages/Rating/Rating.tsx)
+        response = await client.get(
+            "/?region_id=1&skip=0&limit=3&is_admin=false&is_organizer=false&score_order=desc"
+        )
+
+    assert response.status_code == 200
+    assert len(pages) == 1
+    body = response.json()
+    assert body["count"] == 14
+    assert [user["score"] for user in body["data"]] == [13, 12, 11]
+
+
+async def test_role_change_moves_user_out_of_rankings(redis, session, participants):
+    await leaderboard.get_page(session)
+    user = await session.get(User, 16)
+
+    before = leaderboard.rank_fields(user)
+    user.organizer = True
+    await session.commit()
+    await leaderboard.user_changed(session, before, user)
+    page, count = await leaderboard.get_page(session, limit=1)
+    assert count == 15
+    assert page[0][0] != user.id
+
+    before = leaderboard.rank_fields(user)
+    user.organizer = False
+    await session.commit()
+    await leaderboard.user_changed(session, before, user)
+    assert await leaderboard.get_page(session, limit=1) == ([(user.id, 15)], 16)
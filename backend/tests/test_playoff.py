@@ -0,0 +1,237 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.api.routes import playoff as playoff_routes
+from backend.app.api.routes.playoff import MatchResultInput, build_stage_schema, enter_match_result
+from backend.app.crud.playoff import get_stage_tree
+from backend.app.utils.bracket import build_bracket_layout, compute_places
+from common.db.models.category import Category
+from common.db.models.playoff import BracketType, PlayoffBracket, PlayoffMatch, PlayoffRound, PlayoffStage
+from common.db.models.user import User
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_stage(session, participants, rounds: int) -> int:
+    stage = PlayoffStage(tournament_id=1)
+    session.add(stage)
+    await session.flush()
+    for bracket_type in (BracketType.MAIN, BracketType.ADDITIONAL):
+        bracket = PlayoffBracket(stage_id=stage.id, type=bracket_type)
+        session.add(bracket)
+        await session.flush()
+        for number in range(1, rounds + 1):
+            round_obj = PlayoffRound(bracket_id=bracket.id, number=number)
+            session.add(round_obj)
+            await session.flush()
+            for i in range(2 ** (rounds - number)):
+                session.add(PlayoffMatch(
+                    round_id=round_obj.id,
+                    participant1_id=participants[2 * i].id if number == 1 else None,
+                    participant2_id=participants[2 * i + 1].id if number == 1 else None,
+                ))
+    await session.commit()
+    return stage.id
+
+
+@pytest.mark.parametrize("rounds", [2, 3])
+async def test_stage_tree_query_count_does_not_grow_with_bracket(engine, query_budget, participants, session, rounds):
+    stage_id = await create_stage(session, participants, rounds)
+
+    async with AsyncSession(engine) as fresh:
+        # Стадия и по одному selectin на сетки, раунды и матчи
+        with query_budget(4, "stage tree"):
+            stage = await get_stage_tree(fresh, stage_id=stage_id)
+            schema = build_stage_schema(stage)
+
+    assert [bracket.type for bracket in schema.brackets] == [BracketType.MAIN, BracketType.ADDITIONAL]
+    for bracket in schema.brackets:
+        assert [round_schema.number for round_schema in bracket.rounds] == list(range(1, rounds + 1))
+        assert [len(r.matches) for r in bracket.rounds] == [2 ** (rounds - n) for n in range(1, rounds + 1)]
+    first_round = schema.brackets[0].rounds[0].matches
+    assert [(m.participant1_id, m.participant2_id) for m in first_round[:2]] == [
+        (participants[0].id, participants[1].id),
+        (participants[2].id, participants[3].id),
+    ]
+
+
+async def test_stage_tree_by_tournament(engine, participants, session):
+    stage_id = await create_stage(session, participants, rounds=2)
+
+    async with AsyncSession(engine) as fresh:
+        stage = await get_stage_tree(fresh, tournament_id=1)
+        assert stage.id == stage_id
+        assert await get_stage_tree(fresh, tournament_id=2) is None
+
+
+@pytest.fixture
+def sequences(monkeypatch):
+    """reserve_ids без sequence Postgres: id по порядку после уже существующих."""
+    issued = {}
+
+    async def reserve_ids(session, model, count):
+        if model not in issued:
+            issued[model] = (await session.execute(select(func.max(model.id)))).scalar() or 0
+        start = issued[model]
+        issued[model] += count
+        return list(range(start + 1, start + count + 1))
+
+    monkeypatch.setattr(playoff_routes, "reserve_ids", reserve_ids)
+
+
+async def create_bracket(session, participant_ids: list[int]) -> int:
+    """Стадия турнира 1 с основной сеткой; возвращает stage_id."""
+    stage = PlayoffStage(tournament_id=1)
+    session.add(stage)
+    await session.flush()
+    await playoff_routes.generate_brackets(session, stage.id, [(BracketType.MAIN, participant_ids)])
+    await session.commit()
+    return stage.id
+
+
+async def scores(session, participants) -> dict[int, int]:
+    """Очки пользователей участников: {participant_id: score}."""
+    rows = await session.execute(select(User.id, User.score))
+    by_user = dict(rows.all())
+    return {p.id: by_user[p.user_id] for p in participants}
+
+
+def match_at(stage, round_number: int, index: int) -> PlayoffMatch:
+    return stage.brackets[0].rounds[round_number - 1].matches[index]
+
+
+def test_compute_places_orders_by_elimination_round():
+    def match(p1, p2, winner):
+        return SimpleNamespace(participant1_id=p1, participant2_id=p2, winner_id=winner)
+
+    rounds = [
+        SimpleNamespace(matches=[match(1, 2, 1), match(3, 4, 4), match(5, 6, 6), match(7, 8, 7)]),
+        SimpleNamespace(matches=[match(1, 4, 4), match(6, 7, 6)]),
+        SimpleNamespace(matches=[match(4, 6, 6)]),
+    ]
+
+    assert compute_places(rounds) == [6, 4, 1, 7, 2, 3, 5, 8]
+    assert compute_places([]) == []
+
+
+@pytest.fixture
+async def awarded_final(redis, session, participants, sequences):
+    """Сетка на 4 участника категории с очками: полуфиналы сыграны."""
+    category = await session.get(Category, 1)
+    category.name = "Зеленый мяч"
+    await session.commit()
+    field = participants[:4]
+    stage_id = await create_bracket(session, [p.id for p in field])
+    stage = await get_stage_tree(session, stage_id=stage_id)
+    semis = [match_at(stage, 1, 0).id, match_at(stage, 1, 1).id]
+    await enter_match_result(semis[0], MatchResultInput(score1=6, score2=0), session)
+    await enter_match_result(semis[1], MatchResultInput(score1=0, score2=6), session)
+    return field, semis, match_at(stage, 2, 0).id
+
+
+async def test_final_awards_points_once(session, awarded_final):
+    field, _, final_id = awarded_final
+    before = await scores(session, field)
+
+    for _ in range(2):
+        await enter_match_result(final_id, MatchResultInput(score1=6, score2=3), session)
+        gained = {pid: score - before[pid] for pid, score in (await scores(session, field)).items()}
+        # Победитель, финалист и двое проигравших в полуфинале
+        assert gained == {field[0].id: 75, field[3].id: 60, field[1].id: 45, field[2].id: 45}
+
+
+async def test_corrected_final_moves_points(session, awarded_final):
+    field, semis, final_id = awarded_final
+    before = await scores(session, field)
+    await enter_match_result(final_id, MatchResultInput(score1=6, score2=3), session)
+
+    await enter_match_result(final_id, MatchResultInput(score1=3, score2=6), session)
+
+    gained = {pid: score - before[pid] for pid, score in (await scores(session, field)).items()}
+    assert gained == {field[3].id: 75, field[0].id: 60, field[1].id: 45, field[2].id: 45}
+    bracket = (await session.execute(select(PlayoffBracket))).scalars().one()
+    assert bracket.points_awarded
+
+    with pytest.raises(HTTPException) as error:
+        await enter_match_result(semis[0], MatchResultInput(score1=0, score2=6), session)
+    assert error.value.status_code == 409
+
+
+@pytest.mark.parametrize("size", [2, 5, 6, 8, 13])
+def test_layout_wires_every_match_into_next_round(size):
+    ids = list(range(101, 101 + size))
+
+    rounds = build_bracket_layout(ids)
+
+    assert len(rounds[-1]) == 1
+    assert all(len(current) == 2 * len(following) for current, following in zip(rounds, rounds[1:]))
+    assert sorted(
+        pid for m in rounds[0] for pid in (m.participant1_id, m.participant2_id) if pid
+    ) == ids
+    for current, following in zip(rounds, rounds[1:]):
+        targets = [(m.next_index, m.next_slot) for m in current]
+        # Каждый слот следующего раунда кормит ровно один матч
+        assert sorted(targets) == [(i, slot) for i in range(len(following)) for slot in (1, 2)]
+    assert rounds[-1][0].next_index is None
+
+
+@pytest.mark.parametrize("size, byes", [(5, 3), (6, 2), (13, 3)])
+def test_byes_advance_to_second_round(size, byes):
+    rounds = build_bracket_layout(list(range(1, size + 1)))
+
+    bye_matches = [m for m in rounds[0] if m.is_bye]
+    assert len(bye_matches) == byes
+    for match in bye_matches:
+        assert match.participant2_id is None
+        target = rounds[1][match.next_index]
+        slot = target.participant1_id if match.next_slot == 1 else target.participant2_id
+        assert slot == match.winner_id == match.participant1_id
+    # Кроме победителей автовинов второй раунд пуст
+    placed = [pid for m in rounds[1] for pid in (m.participant1_id, m.participant2_id) if pid]
+    assert sorted(placed) == sorted(m.winner_id for m in bye_matches)
+
+
+def test_layout_needs_two_participants():
+    assert build_bracket_layout([]) == []
+    assert build_bracket_layout([1]) == []
+
+
+@pytest.mark.parametrize("size", [5, 13])
+async def test_generate_brackets_inserts_each_table_once(engine, query_budget, participants, session, sequences, size):
+    stage = PlayoffStage(tournament_id=1)
+    session.add(stage)
+    await session.flush()
+
+    # По запросу на резерв id каждой таблицы и по INSERT на таблицу
+    with query_budget(6, "generate brackets") as query_log:
+        await playoff_routes.generate_brackets(
+            session,
+            stage.id,
+            [
+                (BracketType.MAIN, [p.id for p in participants[:size]]),
+                (BracketType.ADDITIONAL, [p.id for p in participants[size:]]),
+            ],
+        )
+    await session.commit()
+
+    inserts = [q.statement.split()[2] for q in query_log.queries if q.statement.startswith("INSERT")]
+    assert inserts == ["playoff_brackets", "playoff_rounds", "playoff_matches"]
+
+    async with AsyncSession(engine) as fresh:
+        tree = await get_stage_tree(fresh, stage_id=stage.id)
+        for bracket in tree.brackets:
+            for current, following in zip(bracket.rounds, bracket.rounds[1:]):
+                next_ids = {m.id for m in following.matches}
+                assert {m.next_match_id for m in current.matches} == next_ids
+                for match in current.matches:
+                    if match.winner_id is not None:
+                        assert match.played
+                        target = next(m for m in following.matches if m.id == match.next_match_id)
+                        slots = {1: target.participant1_id, 2: target.participant2_id}
+                        assert slots[match.next_slot] == match.winner_id
+            assert [m.next_match_id for m in bracket.rounds[-1].matches] == [None]
@@ -0,0 +1,33 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.utils.reference_cache import ReferenceCache
+from common.db.models.region import Region
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_row_created_elsewhere_is_found_before_ttl(engine, session, query_budget):
+    cache = ReferenceCache(Region)
+    session.add(Region(name="First"))
+    await session.commit()
+    assert (await cache.get(session, 1)).name == "First"
+
+    # Строка создана через другой воркер: этот процесс invalidate() не получал
+    async with AsyncSession(engine) as other:
+        other.add(Region(name="Second"))
+        await other.commit()
+
+    with query_budget(1, "cache miss"):
+        assert (await cache.get(session, 2)).name == "Second"
+    # Дочитанная строка остаётся в кэше
+    with query_budget(0, "cache hit"):
+        assert (await cache.get(session, 2)).name == "Second"
+
+
+async def test_unknown_id_is_none(session):
+    cache = ReferenceCache(Region)
+
+    assert await cache.get(session, 42) is None
+    assert await cache.get(session, None) is None
@@ -0,0 +1,50 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend.app.utils.response_cache import cache_response, invalidate_tags
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def catalog(redis):
+    app = FastAPI()
+    items = ["first"]
+
+    @app.get("/items")
+    @cache_response(list[str], ttl=3600, tags=("items",))
+    async def read_items():
+        return list(items)
+
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test"), items
+
+
+async def test_clients_revalidate_instead_of_caching(catalog):
+    client, _ = catalog
+    async with client:
+        response = await client.get("/items")
+        assert response.json() == ["first"]
+        assert response.headers["cache-control"] == "no-cache"
+
+        etag = response.headers["etag"]
+        revalidated = await client.get("/items", headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
+
+
+async def test_invalidated_response_changes_etag(catalog):
+    client, items = catalog
+    async with client:
+        etag = (await client.get("/items")).headers["etag"]
+        items.append("second")
+        # До инвалидации отдаётся запись из Redis
+        assert (await client.get("/items", headers={"If-None-Match": etag})).status_code == 304
+
+        await invalidate_tags("items")
+        response = await client.get("/items", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json() == ["first", "second"]
+        assert response.headers["etag"] != etag
@@ -0,0 +1,53 @@
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlmodel import select
+
+from backend.app.utils import sql_profiler
+from common.db.models.user import User
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def load_one_by_one(session, user_ids: list[int]) -> None:
+    for user_id in user_ids:
+        await session.execute(select(User).where(User.id == user_id))
+
+
+async def test_repeated_statement_is_flagged(session, participants, query_budget):
+    with query_budget(10, "users one by one") as query_log:
+        await load_one_by_one(session, [1, 2, 3])
+        await session.execute(select(User).where(User.id.in_([1, 2, 3])))
+
+    ((statement, records),) = query_log.repeated(threshold=3)
+    assert len(records) == 3
+    assert len({record.parameters for record in records}) == 3
+    assert "N+1: 3x (3 distinct params)" in query_log.report(threshold=3)
+
+
+async def test_budget_overrun_fails_with_report(session, participants, query_budget):
+    with pytest.raises(AssertionError, match="Query budget exceeded: 6 > 5"):
+        with query_budget(5, "users one by one"):
+            await load_one_by_one(session, list(range(1, 7)))
+
+
+async def test_middleware_logs_n_plus_one(engine, session, participants, caplog):
+    sql_profiler.install(engine)
+    app = FastAPI()
+    app.add_middleware(sql_profiler.SqlProfilerMiddleware)
+
+    @app.get("/users")
+    async def read_users():
+        await load_one_by_one(session, list(range(1, 7)))
+        return []
+
+    transport = httpx.ASGITransport(app=app)
+    with caplog.at_level(logging.WARNING, logger=sql_profiler.__name__):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/users")
+
+    assert "GET /users: 6 queries" in caplog.text
+    assert "N+1: 6x" in caplog.text
@@ -2,7 +2,10 @@ from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 
 from settings import settings
+from bot.utils.send_scheduler import RateLimitMiddleware, scheduler
 
 bot = Bot(token=settings.bot_token, default=DefaultBotProperties(parse_mode='HTML'))
+# Все отправки сообщений идут через общий планировщик с лимитами Telegram
+bot.session.middleware(RateLimitMiddleware(scheduler, max_retries=settings.TELEGRAM_MAX_RETRIES))
 
 dp = Dispatcher() 
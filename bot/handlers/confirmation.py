@@ -1,13 +1,11 @@
 import json
 from aiogram.types import InlineKeyboardMarkup, CallbackQuery, Message
 from bot.messaging.producer import send_confirmation
-from bot.utils.utils import calculate_payment, find_participant_by_id, get_tournament_data, try_double_json_loads
+from bot.utils.utils import calculate_payment, forget_participant, get_tournament_data
 from dispatcher import bot, dp
 from aiogram import F
 import logging
 
-from bot.utils.redis import redis
-
 from .markups import (
     prepare_confirm_payment_markup,
     thank_you_for_payment_text
@@ -15,53 +13,65 @@ from .markups import (
 
 logger = logging.getLogger(__name__)
 
+outdated_request_text = "Запрос на оплату устарел. Попросите организатора отправить его заново."
+
+
+def parse_money_request_ids(callback_data: str) -> tuple[int, int] | None:
+    """(tournament_id, participant_id) из "paid:..."/"confirm_payment:..."; None для старых кнопок."""
+    parts = callback_data.split(":")
+    if len(parts) != 3:
+        return None
+    return int(parts[1]), int(parts[2])
+
 
 @dp.callback_query(lambda callback: callback.data.startswith("paid:"))
 async def send_check_payment_handler(callback: CallbackQuery):
+    ids = parse_money_request_ids(callback.data)
+    if ids is None:
+        await callback.answer(outdated_request_text, show_alert=True)
+        return
+    tournament_id, participant_id = ids
+
     await callback.answer()
     await callback.message.delete_reply_markup()
 
-    participant_id = int(callback.data.split(":")[1])
-
-    tournament_id, redis_data = await get_tournament_data(participant_id)
-    if not redis_data:
-        logger.error(f"No data found in Redis for tournament {tournament_id}")
+    data = await get_tournament_data(tournament_id, participant_id)
+    if data is None:
+        logger.error(f"No data found in Redis for participant {participant_id} in tournament {tournament_id}")
         return
-
-    redis_data = await try_double_json_loads(redis_data)
-
-    participant = await find_participant_by_id(redis_data, participant_id)
+    tournament, organizer, participant = data
 
     await callback.message.answer(
         text=thank_you_for_payment_text,
     )
 
     await bot.send_message(
-        chat_id=redis_data["organizer"]["telegram_id"],
-        text=f"Участник {participant["fio"]} должен(-на) был(-а) перевести {await calculate_payment(redis_data['tournament'])}₽ за участие в турнире {redis_data['tournament']['name']}",
-        reply_markup=await prepare_confirm_payment_markup(participant_id)
+        chat_id=organizer["telegram_id"],
+        text=f"Участник {participant["fio"]} должен(-на) был(-а) перевести {await calculate_payment(tournament)}₽ за участие в турнире {tournament['name']}",
+        reply_markup=await prepare_confirm_payment_markup(tournament_id, participant_id)
     )
 
 
 @dp.callback_query(lambda callback: callback.data.startswith("confirm_payment:"))
 async def confirm_payment_handler(callback: CallbackQuery):
+    ids = parse_money_request_ids(callback.data)
+    if ids is None:
+        await callback.answer(outdated_request_text, show_alert=True)
+        return
+    tournament_id, participant_id = ids
+
     await callback.answer()
     await callback.message.delete_reply_markup()
 
-    participant_id = int(callback.data.split(":")[1])
-
-    tournament_id, redis_data = await get_tournament_data(participant_id)
-    if not redis_data:
-        logger.error(f"No data found in Redis for tournament {tournament_id}")
+    data = await get_tournament_data(tournament_id, participant_id)
+    if data is None:
+        logger.error(f"No data found in Redis for participant {participant_id} in tournament {tournament_id}")
         return
-
-    redis_data = await try_double_json_loads(redis_data)
-
-    participant = await find_participant_by_id(redis_data, participant_id)
+    tournament, organizer, participant = data
 
     await bot.send_message(
-        chat_id=redis_data["organizer"]["telegram_id"],
-        text=f"Вы подтвердили оплату {participant['fio']} за участие в турнире {redis_data['tournament']['name']}"
+        chat_id=organizer["telegram_id"],
+        text=f"Вы подтвердили оплату {participant['fio']} за участие в турнире {tournament['name']}"
     )
 
     await bot.send_message(
@@ -69,8 +79,8 @@ async def confirm_payment_handler(callback: CallbackQuery):
         text="Ваше участие было подтверждено организатором!"
     )
 
-    await redis.delete(f"participant:{participant_id}")
-    await redis.delete(f"tournament:{tournament_id}")
+    # Удаляем только этого участника: остальные ещё могут подтвердить оплату
+    await forget_participant(tournament_id, participant_id)
 
     await send_confirmation(tournament_id, participant_id)
 
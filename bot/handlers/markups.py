@@ -10,27 +10,27 @@ async def generate_start_text(message):
     return f"Привет, {message.from_user.full_name}! Я - бот. Для того, чтобы узнать свой ID - введите команду /id"
 
 
-async def prepare_paid_markup(participant_id: int) -> InlineKeyboardMarkup:
+async def prepare_paid_markup(tournament_id: int, participant_id: int) -> InlineKeyboardMarkup:
     """Подготавливает клавиатуру для отправки уведомления участникам."""
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
                 InlineKeyboardButton(
                     text="Подтвердить",
-                    callback_data=f"paid:{participant_id}"
+                    callback_data=f"paid:{tournament_id}:{participant_id}"
                 )
             ]
         ]
     )
 
-async def prepare_confirm_payment_markup(participant_id: int) -> InlineKeyboardMarkup:
+async def prepare_confirm_payment_markup(tournament_id: int, participant_id: int) -> InlineKeyboardMarkup:
     """Подготавливает клавиатуру для подтверждения оплаты участником"""
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
                 InlineKeyboardButton(
                     text="Подтвердить оплату",
-                    callback_data=f"confirm_payment:{participant_id}"
+                    callback_data=f"confirm_payment:{tournament_id}:{participant_id}"
                 )
             ]
         ]
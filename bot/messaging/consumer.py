@@ -5,75 +5,114 @@ import asyncio
 import json
 import logging
 
-from aio_pika import Message, ExchangeType
+from aio_pika import ExchangeType
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter, TelegramServerError
 from bot.handlers.markups import prepare_paid_markup
 from bot.settings import settings
+from bot.utils import send_scheduler
 from bot.utils.rabbitmq import _connect_to_rabbitmq
-from bot.utils.redis import redis
 from bot.dispatcher import bot
-from bot.utils.utils import calculate_payment, try_double_json_loads
+from bot.utils.utils import calculate_payment
 
 logger = logging.getLogger(__name__)
 
+# Должны совпадать с TOPOLOGY backend'а (backend/app/messaging/publisher.py)
+TOURNAMENT_EXCHANGE = "tournament"
+DEAD_LETTER_EXCHANGE = "tournament.dlx"
+MONEY_NOTIFY_ROUTING_KEY = "tournament_money_notify"
+MONEY_NOTIFY_QUEUE = "tournament_money_notify_queue"
+MONEY_NOTIFY_DLQ = "tournament_money_notify_dlq"
+
 
 async def start_consumer() -> None:
     """Запускает consumer для обработки сообщений из RabbitMQ."""
     connection = await _connect_to_rabbitmq()
     async with connection:
         channel = await connection.channel()
-        exchange = await _setup_tournament_exchange(channel)
-        queue = await _setup_tournament_queue(channel, exchange)
+        # Сообщения в пределах prefetch обрабатываются параллельно
+        await channel.set_qos(prefetch_count=settings.MONEY_REQUEST_PREFETCH)
+        queue = await _setup_money_request_queue(channel)
         await queue.consume(_process_message)
         logger.info("Bot consumer started, waiting for messages...")
         await asyncio.Future()
 
 
-async def _setup_tournament_exchange(channel: aio_pika.Channel) -> aio_pika.Exchange:
-    """Настраивает exchange для получения сообщений о турнирах."""
-    exchange = await channel.declare_exchange("tournament", ExchangeType.DIRECT)
-    logger.info("Exchange 'tournament' set up")
-    return exchange
-
-
-async def _setup_tournament_queue(channel: aio_pika.Channel, exchange: aio_pika.Exchange) -> aio_pika.Queue:
-    """Настраивает очередь для получения сообщений о турнирах."""
-    queue = await channel.declare_queue("tournament_money_queue", durable=True)
-    await queue.bind(exchange, "tournament_money_request")
-    logger.info("Queue 'tournament_money_queue' set up and bound")
+async def _setup_money_request_queue(channel: aio_pika.Channel) -> aio_pika.Queue:
+    """Настраивает очередь уведомлений об оплате и её DLQ."""
+    exchange = await channel.declare_exchange(TOURNAMENT_EXCHANGE, ExchangeType.DIRECT)
+    dead_letter_exchange = await channel.declare_exchange(DEAD_LETTER_EXCHANGE, ExchangeType.DIRECT)
+    dead_letter_queue = await channel.declare_queue(MONEY_NOTIFY_DLQ, durable=True)
+    await dead_letter_queue.bind(dead_letter_exchange, MONEY_NOTIFY_ROUTING_KEY)
+
+    queue = await channel.declare_queue(
+        MONEY_NOTIFY_QUEUE,
+        durable=True,
+        arguments={"x-dead-letter-exchange": DEAD_LETTER_EXCHANGE},
+    )
+    await queue.bind(exchange, MONEY_NOTIFY_ROUTING_KEY)
+    logger.info(f"Queue '{MONEY_NOTIFY_QUEUE}' set up and bound")
     return queue
 
 
 async def _process_message(message: aio_pika.IncomingMessage) -> None:
-    """Обрабатывает входящее сообщение от producer'а."""
-    async with message.process():
-        decoded_message_body = message.body.decode()
-        data = await try_double_json_loads(decoded_message_body)
-
-        tournament_id = data["tournament"]["id"]
-
-        redis_key = f"tournament:{tournament_id}"
-        redis_data_json = await redis.get(redis_key)
-        if not redis_data_json:
-            logger.error(
-                f"No data found in Redis for tournament {tournament_id}")
+    """
+    Отправляет уведомление об оплате одному участнику.
+    Временные ошибки Telegram повторяются, после исчерпания попыток или при
+    постоянной ошибке (бот заблокирован, чат не найден) сообщение уходит в DLQ.
+    """
+    # Битое или старого формата сообщение не повторится удачно: сразу в DLQ,
+    # иначе оно без ack заняло бы слот prefetch до закрытия канала
+    try:
+        data = json.loads(message.body)
+        tournament = data["tournament"]
+        organizer = data["organizer"]
+        participant = data["participant"]
+        tournament["id"], participant["id"], participant["telegram_id"]
+    except (ValueError, KeyError, TypeError):
+        logger.exception("Malformed money request message, moving to DLQ")
+        await message.reject(requeue=False)
+        return
+
+    if not participant["telegram_id"]:
+        logger.warning(f"Participant {participant['id']} has no telegram_id, skipping")
+        await message.ack()
+        return
+
+    try:
+        await _send_with_retry(
+            chat_id=participant["telegram_id"],
+            text=await _prepare_text_message(tournament, organizer),
+            reply_markup=await prepare_paid_markup(
+                tournament_id=tournament["id"], participant_id=participant["id"]
+            ),
+        )
+    except Exception:
+        logger.exception(
+            f"Failed to send money request to participant {participant['id']} "
+            f"of tournament {tournament['id']}, moving to DLQ"
+        )
+        await message.reject(requeue=False)
+        return
+
+    await message.ack()
+    logger.info(f"Money request sent to participant {participant['id']} of tournament {tournament['id']}")
+
+
+async def _send_with_retry(**kwargs) -> None:
+    # retry_after обрабатывает планировщик отправки; сюда 429 доходит, только если он сдался
+    for attempt in range(1, settings.MONEY_REQUEST_MAX_ATTEMPTS + 1):
+        try:
+            with send_scheduler.bulk():
+                await bot.send_message(**kwargs)
             return
-
-        redis_data = await try_double_json_loads(redis_data_json)
-        tournament = redis_data["tournament"]
-        organizer = redis_data["organizer"]
-        participants = redis_data["participants"]
-
-        logger.info(f"Received message for tournament {tournament_id}")
-
-        text_message = await _prepare_text_message(tournament, organizer)
-        for participant in participants:
-            markup = await prepare_paid_markup(participant_id=participant["id"])
-            await bot.send_message(
-                chat_id=participant["telegram_id"],
-                text=text_message,
-                reply_markup=markup
-            )
-    logger.info(msg=f"Exited process_message for tournament {tournament_id}")
+        except (TelegramRetryAfter, TelegramNetworkError, TelegramServerError) as error:
+            if attempt == settings.MONEY_REQUEST_MAX_ATTEMPTS:
+                raise
+            delay = 2 ** attempt
+            if isinstance(error, TelegramRetryAfter):
+                # Раньше retry_after Telegram снова ответит 429
+                delay = max(error.retry_after, delay)
+            await asyncio.sleep(delay)
 
 
 async def _prepare_text_message(tournament: dict, organizer: dict) -> str:
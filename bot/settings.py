@@ -24,6 +24,19 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_PASSWORD: str
+
+    # Сколько уведомлений об оплате бот рассылает одновременно
+    MONEY_REQUEST_PREFETCH: int = 20
+    # Попыток отправки одному участнику до переноса сообщения в DLQ
+    MONEY_REQUEST_MAX_ATTEMPTS: int = 3
+
+    # Лимиты отправки Telegram (сообщений в секунду): ~30 на бота, 1 в личный чат,
+    # 20 в минуту в группу; общий берём с запасом
+    TELEGRAM_GLOBAL_RATE: float = 25
+    TELEGRAM_CHAT_RATE: float = 1
+    TELEGRAM_GROUP_CHAT_RATE: float = 20 / 60
+    # Повторов после 429 (retry_after) на одно сообщение
+    TELEGRAM_MAX_RETRIES: int = 3
     
     @computed_field
     @property
@@ -0,0 +1,172 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from bot.settings import settings
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BULK = 1
+
+# Чистим бакеты неактивных чатов, когда их становится больше
+MAX_IDLE_CHAT_BUCKETS = 10_000
+
+_priority: ContextVar[int] = ContextVar("send_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def bulk():
+    """Отправки внутри блока идут в низкоприоритетную очередь (рассылки)."""
+    token = _priority.set(BULK)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> float:
+        """Берёт токен; если его нет — возвращает, сколько секунд ждать."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def pause(self, seconds: float) -> None:
+        # Отрицательный баланс — следующий токен появится не раньше чем через seconds
+        self._refill()
+        self.tokens = min(self.tokens, 1 - self.rate * seconds)
+
+    @property
+    def idle(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+
+class SendScheduler:
+    """
+    Планировщик исходящих сообщений: общий лимит бота и лимит на чат
+    (token bucket). Когда общий лимит исчерпан, ожидающие интерактивные
+    ответы получают токены раньше рассылок.
+    """
+
+    def __init__(self, global_rate: float, chat_rate: float, group_chat_rate: float):
+        # Без запаса на всплеск: ровный поток не упирается в лимит Telegram на старте
+        self.global_bucket = TokenBucket(global_rate, capacity=1)
+        self.chat_rate = chat_rate
+        self.group_chat_rate = group_chat_rate
+        self._chat_buckets: dict[int | str, TokenBucket] = {}
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: asyncio.Task | None = None
+
+    def _chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) > MAX_IDLE_CHAT_BUCKETS:
+                self._chat_buckets = {
+                    key: b for key, b in self._chat_buckets.items() if not b.idle
+                }
+            # Отрицательный chat_id — группа, там лимит Telegram строже
+            is_group = isinstance(chat_id, int) and chat_id < 0
+            rate = self.group_chat_rate if is_group else self.chat_rate
+            bucket = self._chat_buckets[chat_id] = TokenBucket(rate, capacity=1)
+        return bucket
+
+    async def acquire(self, chat_id: int | str) -> None:
+        bucket = self._chat_bucket(chat_id)
+        while delay := bucket.take():
+            await asyncio.sleep(delay)
+        await self._acquire_global(_priority.get())
+
+    async def _acquire_global(self, priority: int) -> None:
+        if not self._waiters and not self.global_bucket.take():
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        self._wakeup.set()
+        await future
+
+    async def _dispatch(self) -> None:
+        while True:
+            if not self._waiters:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            delay = self.global_bucket.take()
+            if delay:
+                await asyncio.sleep(delay)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+
+    def pause(self, chat_id: int | str, seconds: float) -> None:
+        """Telegram вернул 429: ни этот чат, ни бот в целом не шлют seconds секунд."""
+        self._chat_bucket(chat_id).pause(seconds)
+        self.global_bucket.pause(seconds)
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Пропускает отправку сообщений через SendScheduler и повторяет запрос
+    после retry_after, если Telegram всё же ответил 429.
+    """
+
+    def __init__(self, scheduler: SendScheduler, max_retries: int):
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        # Лимиты касаются отправки сообщений, а не ответов на callback и правок
+        if chat_id is None or not type(method).__name__.startswith(("Send", "Copy", "Forward")):
+            return await make_request(bot, method)
+
+        for attempt in range(self.max_retries + 1):
+            await self.scheduler.acquire(chat_id)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Flood control for chat {chat_id}, retrying in {e.retry_after}s")
+                self.scheduler.pause(chat_id, e.retry_after)
+
+
+scheduler = SendScheduler(
+    global_rate=settings.TELEGRAM_GLOBAL_RATE,
+    chat_rate=settings.TELEGRAM_CHAT_RATE,
+    group_chat_rate=settings.TELEGRAM_GROUP_CHAT_RATE,
+)
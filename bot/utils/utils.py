@@ -3,11 +3,8 @@ import json
 from bot.utils.redis import redis
 
 
-async def try_double_json_loads(data: str) -> dict:
-    loads = json.loads(data)
-    if isinstance(loads, str):
-        return json.loads(loads)
-    return loads
+# Hash запроса на оплату, его пишет backend (backend/app/messaging/producer.py)
+MONEY_REQUEST_PREFIX = "money_request:"
 
 
 async def calculate_payment(tournament: dict) -> int:
@@ -22,19 +19,20 @@ async def calculate_payment(tournament: dict) -> int:
     return price * multiplier
 
 
-
-async def get_tournament_data(participant_id: int) -> tuple:
-    """Получает данные турнира из Redis по ID участника."""
-    redis_key = f"participant:{participant_id}"
-    tournament_id = await redis.get(redis_key)
-
-    redis_data = await redis.get(f"tournament:{tournament_id}")
-    return tournament_id, redis_data
-
-async def find_participant_by_id(data: dict, participant_id: int | str) -> dict | None:
+async def get_tournament_data(tournament_id: int, participant_id: int) -> tuple[dict, dict, dict] | None:
     """
-    Находит участника по participant_id в объекте.
-    Возвращает словарь с данными участника или None, если не найдено.
+    Данные запроса на оплату из Redis одним HMGET:
+    (турнир, организатор, участник) или None, если запрос истёк или уже подтверждён.
     """
-    participants = data.get("participants", [])
-    return next((p for p in participants if p["id"] == participant_id), None)
+    meta, participant = await redis.hmget(
+        f"{MONEY_REQUEST_PREFIX}{tournament_id}", "meta", f"participant:{participant_id}"
+    )
+    if meta is None or participant is None:
+        return None
+    meta = json.loads(meta)
+    return meta["tournament"], meta["organizer"], json.loads(participant)
+
+
+async def forget_participant(tournament_id: int, participant_id: int) -> None:
+    """Убирает подтверждённого участника из запроса на оплату."""
+    await redis.hdel(f"{MONEY_REQUEST_PREFIX}{tournament_id}", f"participant:{participant_id}")
@@ -1,8 +1,11 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
 import os
+import threading
+import time
 
 import dotenv
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 dotenv.load_dotenv()
 
@@ -13,11 +16,89 @@ POSTGRES_SERVER = os.getenv('POSTGRES_SERVER')
 POSTGRES_PORT = os.getenv('POSTGRES_PORT')
 POSTGRES_DB = os.getenv('POSTGRES_DB')
 
+# Размер пула на процесс: при нескольких воркерах uvicorn к Postgres открывается
+# до workers * (POOL_SIZE + MAX_OVERFLOW) соединений — это должно влезать в max_connections
+POSTGRES_POOL_SIZE = int(os.getenv('POSTGRES_POOL_SIZE', 10))
+POSTGRES_MAX_OVERFLOW = int(os.getenv('POSTGRES_MAX_OVERFLOW', 10))
+POSTGRES_POOL_TIMEOUT = float(os.getenv('POSTGRES_POOL_TIMEOUT', 30))
+POSTGRES_POOL_RECYCLE = int(os.getenv('POSTGRES_POOL_RECYCLE', 30 * 60))
+# Кэш подготовленных выражений asyncpg на соединение (0 — выключить, нужно за pgbouncer)
+POSTGRES_STATEMENT_CACHE_SIZE = int(os.getenv('POSTGRES_STATEMENT_CACHE_SIZE', 500))
+
 
 async_db = f'postgresql+asyncpg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}'
 sync_db = f'postgresql+psycopg2://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}:{POSTGRES_PORT}/{POSTGRES_DB}'
 
-async_engine = create_async_engine(async_db)
-Session = async_sessionmaker(async_engine)
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Пул, который считает выдачи соединений и суммарное время ожидания свободного."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+def create_engine(
+    url: str = async_db,
+    pool_size: int = POSTGRES_POOL_SIZE,
+    max_overflow: int = POSTGRES_MAX_OVERFLOW,
+    pool_timeout: float = POSTGRES_POOL_TIMEOUT,
+    pool_recycle: int = POSTGRES_POOL_RECYCLE,
+    statement_cache_size: int = POSTGRES_STATEMENT_CACHE_SIZE,
+) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+        pool_recycle=pool_recycle,
+        # Отбрасывает соединения, закрытые Postgres или сетью, до выдачи в сессию
+        pool_pre_ping=True,
+        connect_args={
+            # Кэш выражений самого asyncpg и кэш подготовленных выражений диалекта SQLAlchemy
+            "statement_cache_size": statement_cache_size,
+            "prepared_statement_cache_size": statement_cache_size,
+        },
+    )
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    """Состояние пула: размер, занятые и свободные соединения, overflow, ожидание."""
+    pool = engine.pool
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool ведёт overflow от -pool_size, сверх пула открыто max(overflow, 0)
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+    }
+    if isinstance(pool, TimedQueuePool):
+        stats.update(
+            checkouts=pool.checkouts,
+            wait_seconds_total=round(pool.wait_seconds_total, 6),
+            wait_seconds_max=round(pool.wait_seconds_max, 6),
+        )
+    return stats
+
+
+async_engine = create_engine()
+# Объекты остаются доступными после commit без повторного SELECT (refresh)
+Session = async_sessionmaker(async_engine, expire_on_commit=False)
 
 Base = declarative_base()
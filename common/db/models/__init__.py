@@ -1,6 +1,7 @@
 from .user import (
     User, UserBase, UserCreate, UserRegister, UserUpdate, UserUpdateMe,
-    UpdatePassword, UserPublic, UserFio, UsersPublic
+    UpdatePassword, UserPublic, UserFio, UserFioSearchResult, UserRankPublic,
+    UsersPublic
 )
 from .tournament import (
     Tournament, TournamentBase, TournamentCreate, TournamentUpdate, TournamentPublic,
@@ -43,6 +44,8 @@ __all__ = [
     "UpdatePassword",
     "UserPublic",
     "UserFio",
+    "UserFioSearchResult",
+    "UserRankPublic",
     "UsersPublic",
     "Tournament",
     "TournamentBase",
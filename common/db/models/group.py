@@ -125,6 +125,7 @@ class GroupMatch(GroupMatchBase, table=True):
     )
     
     scheduled_at: Optional[datetime.datetime] = Field(default=None)
+    court: Optional[int] = Field(default=None)
     created_at: datetime.datetime = Field(
         default_factory=datetime.datetime.now,
     )
@@ -159,11 +160,20 @@ class GroupMatchUpdate(SQLModel):
     )
 
 
+class GroupMatchScore(SQLModel):
+    match_id: int
+    score1: int = Field(ge=0)
+    score2: int = Field(ge=0)
+    played: bool = True
+
+
 class GroupMatchPublic(GroupMatchBase):
     id: int
     group_id: int
     participant1_id: int
     participant2_id: int
+    scheduled_at: Optional[datetime.datetime] = None
+    court: Optional[int] = None
 
 
 class GroupMatchesPublic(SQLModel):
@@ -172,4 +182,33 @@ class GroupMatchesPublic(SQLModel):
 
 
 class GroupPreviewRequest(SQLModel):
-    group_size: int
+    group_size: int = Field(ge=2)
+    separate_regions: bool = False
+
+
+class GroupScheduleParams(SQLModel):
+    # без start_at матчи создаются в порядке туров, но без времени и корта
+    start_at: Optional[datetime.datetime] = None
+    courts: int = Field(default=1, ge=1)
+    slot_minutes: int = Field(default=30, ge=1)
+    rest_slots: int = Field(default=1, ge=0)
+
+
+class GroupStandingPublic(SQLModel):
+    participant_id: int
+    place: int
+    played: int
+    wins: int
+    draws: int
+    losses: int
+    scored: int
+    conceded: int
+    score_diff: int
+    points: int
+
+
+class GroupStandingsPublic(SQLModel):
+    group_id: int
+    name: str
+    number: int
+    standings: List[GroupStandingPublic]
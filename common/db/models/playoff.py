@@ -40,6 +40,8 @@ class PlayoffBracket(PlayoffBracketBase, table=True):
         foreign_key="playoff_stages.id",
         ondelete="CASCADE",
     )
+    # Очки за места по этой сетке уже начислены
+    points_awarded: bool = Field(default=False)
 
     stage: PlayoffStage = Relationship(back_populates="brackets")
     rounds: list["PlayoffRound"] = Relationship(
@@ -98,4 +100,12 @@ class PlayoffMatch(PlayoffMatchBase, table=True):
         default=None,
     )
 
+    # Куда уходит победитель: матч следующего раунда и слот (1 или 2)
+    next_match_id: int | None = Field(
+        foreign_key="playoff_matches.id",
+        ondelete="SET NULL",
+        default=None,
+    )
+    next_slot: int | None = None
+
     round: PlayoffRound = Relationship(back_populates="matches")
@@ -79,7 +79,8 @@ class TournamentPublic(TournamentBase):
 
 class TournamentsPublic(SQLModel):
     data: List[TournamentPublic]
-    count: int
+    count: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class TournamentCountResponse(SQLModel):
@@ -135,6 +135,18 @@ class UserFio(SQLModel):
     patronymic: str
 
 
+class UserFioSearchResult(SQLModel):
+    id: int
+    fio: str
+
+
+class UserRankPublic(SQLModel):
+    user_id: int
+    rank: int
+    score: int
+    total: int
+
+
 class User(UserBase, table=True):
     __tablename__ = 'users'
     id: Optional[int] = Field(primary_key=True, default=None)